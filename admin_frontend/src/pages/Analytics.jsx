@@ -1,14 +1,46 @@
 import { useEffect, useState } from 'react';
 import api from '../api';
 
+// drill-down order: category -> month -> employee
+const LEVELS = ['category', 'month', 'employee'];
+const LEVEL_TITLES = { category: 'Категория', month: 'Месяц', employee: 'Сотрудник' };
+
 export default function Analytics() {
   const [data, setData] = useState(null);
+  const [path, setPath] = useState([]);
+  const [cube, setCube] = useState([]);
+
+  async function loadCube(selected = path) {
+    const params = new URLSearchParams();
+    selected.forEach((value, i) => params.append(LEVELS[i], value));
+    params.append('group_by', LEVELS[Math.min(selected.length, LEVELS.length - 1)]);
+    try {
+      const res = await api.get(`analytics/cube?${params.toString()}`);
+      setCube(res.data.rows);
+    } catch (err) {
+      console.error(err);
+    }
+  }
+
+  function drill(value) {
+    if (path.length >= LEVELS.length - 1) return;
+    const next = [...path, value];
+    setPath(next);
+    loadCube(next);
+  }
+
+  function goTo(depth) {
+    const next = path.slice(0, depth);
+    setPath(next);
+    loadCube(next);
+  }
 
   async function load(refresh = false) {
     try {
       const url = refresh ? 'analytics/sales/refresh' : 'analytics/sales';
       const res = await api.get(url);
       setData(res.data);
+      loadCube();
     } catch (err) {
       console.error(err);
     }
@@ -46,6 +78,43 @@ export default function Analytics() {
           </div>
         </div>
       )}
+      <div className="bg-white p-4 rounded shadow space-y-3">
+        <div className="flex flex-wrap gap-2 text-sm">
+          <button className="text-blue-600" onClick={() => goTo(0)}>Все категории</button>
+          {path.map((value, i) => (
+            <button key={value} className="text-blue-600" onClick={() => goTo(i + 1)}>
+              / {value}
+            </button>
+          ))}
+        </div>
+        <table className="w-full text-sm">
+          <thead>
+            <tr className="text-left text-gray-500">
+              <th>{LEVEL_TITLES[LEVELS[Math.min(path.length, LEVELS.length - 1)]]}</th>
+              <th>Сумма</th>
+              <th>Кол-во</th>
+              <th>Среднее</th>
+              <th>Медиана</th>
+              <th>90%</th>
+            </tr>
+          </thead>
+          <tbody>
+            {cube.map((row) => {
+              const key = row[LEVELS[Math.min(path.length, LEVELS.length - 1)]];
+              return (
+                <tr key={key} className="border-t hover:bg-gray-50 cursor-pointer" onClick={() => drill(key)}>
+                  <td className="py-1">{key}</td>
+                  <td>{row.sum} ₽</td>
+                  <td>{row.count}</td>
+                  <td>{row.mean} ₽</td>
+                  <td>{row.p50} ₽</td>
+                  <td>{row.p90} ₽</td>
+                </tr>
+              );
+            })}
+          </tbody>
+        </table>
+      </div>
     </div>
   );
 }
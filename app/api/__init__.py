@@ -1,11 +1,21 @@
+import asyncio
+
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from telegram import Update
 from pathlib import Path
 
 from ..config import TOKEN
 from ..core.application import create_application
+from ..data.json_storage import flush_all
+from ..services.excel_writer import excel_writer
+from ..services.render_executor import (
+    RenderQueueFull,
+    RenderTimeout,
+    render_executor,
+)
+from ..services.workbook_watcher import WorkbookWatcher
 from .employees import create_employee_router
 from .salary import create_salary_router
 from .schedule import create_schedule_router
@@ -47,6 +57,20 @@ def create_app() -> FastAPI:
     async def ping():
         return {"status": "ok"}
 
+    @app.get("/api/render/stats")
+    async def render_stats():
+        """Queue depth and latency of the image and PDF render workers."""
+        return render_executor.stats()
+
+    @app.exception_handler(RenderQueueFull)
+    async def render_busy(request: Request, exc: RenderQueueFull):
+        return JSONResponse({"detail": "Render queue is full"},
+                            status_code=503)
+
+    @app.exception_handler(RenderTimeout)
+    async def render_timeout(request: Request, exc: RenderTimeout):
+        return JSONResponse({"detail": str(exc)}, status_code=504)
+
     if telegram_app is not None:
         @app.on_event("startup")
         async def startup():
@@ -58,6 +82,13 @@ def create_app() -> FastAPI:
             await telegram_app.stop()
             await telegram_app.shutdown()
 
+    # registered after the bot shutdown so its last writes are included
+    @app.on_event("shutdown")
+    async def flush_storage():
+        await asyncio.to_thread(flush_all)
+        await asyncio.to_thread(excel_writer.flush)
+        render_executor.shutdown(wait=False)
+
     employee_service = EmployeeService()
     employee_api = EmployeeAPIService(employee_service)
     app.include_router(create_employee_router(employee_api), prefix="/api")
@@ -92,6 +123,17 @@ def create_app() -> FastAPI:
     analytics_service = AnalyticsService()
     app.include_router(create_analytics_router(analytics_service), prefix="/api")
 
+    watcher = WorkbookWatcher()
+    watcher.on_change(analytics_service.get_sales)
+
+    @app.on_event("startup")
+    async def start_watcher():
+        watcher.start()
+
+    @app.on_event("shutdown")
+    async def stop_watcher():
+        await watcher.stop()
+
     app.include_router(
         create_telegram_router(
             employee_service._repo),
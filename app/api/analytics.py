@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
 
 from app.services.analytics import AnalyticsService
+from app.services.analytics_cube import DIMENSIONS
 
 
 def create_analytics_router(service: AnalyticsService) -> APIRouter:
@@ -14,4 +17,16 @@ def create_analytics_router(service: AnalyticsService) -> APIRouter:
     async def refresh_sales():
         return await service.refresh_sales()
 
+    @router.get("/cube")
+    async def get_cube(
+        employee: Optional[List[str]] = Query(None),
+        month: Optional[List[str]] = Query(None),
+        category: Optional[List[str]] = Query(None),
+        group_by: List[str] = Query(list(DIMENSIONS)),
+    ):
+        try:
+            return await service.get_cube(employee, month, category, group_by)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
     return router
@@ -2,9 +2,8 @@ from fastapi import APIRouter, UploadFile, File, Response
 
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeOut
 from app.services.employee_service import EmployeeAPIService
-from app.services.pdf_profile import generate_employee_pdf
-from app.data.payout_repository import PayoutRepository
-from app.data.vacation_repository import VacationRepository
+from app.services.pdf_profile import render_employee_pdf
+from app.data.registry import get_payout_repository, get_vacation_repository
 
 
 def create_employee_router(service: EmployeeAPIService) -> APIRouter:
@@ -32,11 +31,11 @@ def create_employee_router(service: EmployeeAPIService) -> APIRouter:
 
     @router.get("/{user_id}/profile.pdf", response_class=Response)
     async def get_employee_profile_pdf(user_id: int):
-        pdf_bytes = generate_employee_pdf(
+        pdf_bytes = await render_employee_pdf(
             user_id,
             employee_repo=service.service._repo,
-            payout_repo=PayoutRepository(),
-            vacation_repo=VacationRepository(),
+            payout_repo=get_payout_repository(),
+            vacation_repo=get_vacation_repository(),
         )
         headers = {"Content-Disposition": "inline; filename=profile.pdf"}
         return Response(content=pdf_bytes,
@@ -1,9 +1,11 @@
+from datetime import datetime
+from typing import Literal, Optional
+
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from pathlib import Path
-from typing import Optional
+from fastapi.responses import StreamingResponse
 
 from app.schemas.payout import Payout, PayoutCreate, PayoutUpdate
+from app.services.payout_export import MEDIA_TYPES
 from app.services.payout_service import PayoutService
 
 
@@ -18,8 +20,12 @@ def create_payout_router(service: PayoutService) -> APIRouter:
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ):
-        return await service.list_payouts(employee_id, payout_type, status, method, from_date, to_date)
+        return await service.list_payouts(
+            employee_id, payout_type, status, method, from_date, to_date,
+            limit=limit, offset=offset)
 
     @router.post("/", response_model=Payout)
     async def create_payout(data: PayoutCreate):
@@ -69,8 +75,9 @@ def create_payout_router(service: PayoutService) -> APIRouter:
         await service.delete_payouts(id_list)
         return {"ok": True}
 
-    @router.get("/export.pdf")
-    async def export_pdf(
+    @router.get("/export.{fmt}")
+    async def export(
+        fmt: Literal["pdf", "csv", "xlsx"],
         employee_id: Optional[str] = None,
         payout_type: Optional[str] = None,
         status: Optional[str] = None,
@@ -78,11 +85,18 @@ def create_payout_router(service: PayoutService) -> APIRouter:
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
     ):
-        path = await service.export_to_pdf(
-            employee_id, payout_type, status, method, from_date, to_date
-        )
-        if path:
-            return FileResponse(Path(path), filename=Path(path).name)
-        raise HTTPException(status_code=404, detail="No data")
+        """Stream the filtered payouts as a PDF, CSV or XLSX download."""
+        try:
+            chunks = await service.export(
+                fmt, employee_id, payout_type, status, method,
+                from_date, to_date)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        if chunks is None:
+            raise HTTPException(status_code=404, detail="No data")
+        filename = f"payouts_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+        headers = {"Content-Disposition": f"attachment; filename={filename}"}
+        return StreamingResponse(chunks, media_type=MEDIA_TYPES[fmt],
+                                 headers=headers)
 
     return router
@@ -1,8 +1,8 @@
-from typing import Optional, List
+from typing import Literal, Optional, List, Union
 
 from fastapi import APIRouter, Query, Response
 
-from app.schemas.salary import SalaryRow
+from app.schemas.salary import SalaryRow, SalarySeries
 from app.services.salary_service import SalaryService
 
 
@@ -16,6 +16,19 @@ def create_salary_router(service: SalaryService) -> APIRouter:
     ):
         return await service.get_salary(month=month, employee_id=employee_id)
 
+    @router.get(
+        "/year",
+        response_model=Union[List[SalaryRow], List[SalarySeries]],
+    )
+    async def salary_year(
+        employee_id: Optional[str] = Query(None),
+        layout: Literal["table", "series"] = Query("table"),
+    ):
+        """All month sheets in one workbook pass, as rows or per employee."""
+        if layout == "series":
+            return await service.get_year_series(employee_id=employee_id)
+        return await service.get_year(employee_id=employee_id)
+
     @router.get("/months", response_model=List[str])
     async def list_months():
         return await service.list_months()
@@ -23,9 +36,10 @@ def create_salary_router(service: SalaryService) -> APIRouter:
     @router.get("/report", response_class=Response)
     async def salary_report(month: str = Query(...)):
         rows = await service.get_salary(month=month)
+        from app.services.render_executor import render_executor
         from app.services.salary_report import generate_salary_pdf
 
-        pdf_bytes = generate_salary_pdf(rows, month)
+        pdf_bytes = await render_executor.run(generate_salary_pdf, rows, month)
         headers = {"Content-Disposition": "inline; filename=salary_report.pdf"}
         return Response(content=pdf_bytes,
                         media_type="application/pdf",
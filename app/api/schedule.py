@@ -1,8 +1,9 @@
-from typing import List
+from datetime import date as date_type
+from typing import List, Optional
 
 from fastapi import APIRouter, Query
 
-from app.schemas.schedule import SchedulePointOut
+from app.schemas.schedule import ScheduleAssignmentOut, SchedulePointOut
 from app.services.schedule_service import ScheduleService
 
 
@@ -13,4 +14,22 @@ def create_schedule_router(service: ScheduleService) -> APIRouter:
     async def schedule_by_day(date: str = Query(...)):
         return await service.get_schedule_by_day(date)
 
+    @router.get("/by_employee", response_model=List[ScheduleAssignmentOut])
+    async def schedule_by_employee(
+        name: str = Query(...),
+        month: Optional[int] = Query(None, ge=1, le=12),
+        year: Optional[int] = Query(None),
+    ):
+        today = date_type.today()
+        return await service.get_employee_schedule(
+            name, year or today.year, month or today.month)
+
+    @router.get("/by_point", response_model=List[ScheduleAssignmentOut])
+    async def schedule_by_point(
+        point: str = Query(...),
+        start: str = Query(...),
+        days: int = Query(7, ge=1, le=62),
+    ):
+        return await service.get_point_schedule(point, start, days)
+
     return router
@@ -2,10 +2,22 @@ from .settings import settings
 
 TOKEN = settings.telegram_bot_token
 EXCEL_FILE = settings.excel_file
+SALARY_YEAR_WORKERS = settings.salary_year_workers
+SHEET_STORE = settings.sheet_store
+SHEET_STORE_DIR = settings.sheet_store_dir
+WORKBOOK_WATCH_INTERVAL = settings.workbook_watch_interval
+WORKBOOK_PREWARM_TIMEOUT = settings.workbook_prewarm_timeout
+RENDER_WORKERS = settings.render_workers
+RENDER_QUEUE_SIZE = settings.render_queue_size
+RENDER_TIMEOUT = settings.render_timeout
 USERS_FILE = settings.users_file
 ADVANCE_REQUESTS_FILE = settings.advance_requests_file
+PAYOUTS_JOURNAL = settings.payouts_journal
 VACATIONS_FILE = settings.vacations_file
 ADJUSTMENTS_FILE = settings.adjustments_file
+MESSAGES_FILE = settings.messages_file
+STORAGE_BACKEND = settings.storage_backend
+DATABASE_FILE = settings.database_file
 ADMIN_ID = settings.admin_id
 ADMIN_CHAT_ID = settings.admin_chat_id
 ADMIN_LOGIN = settings.admin_login
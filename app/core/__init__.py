@@ -1,13 +1,22 @@
-from .application import create_application
-from .conversations import (
-    build_payout_conversation,
-    build_admin_conversation,
-    build_manual_payout_conversation,
-)
-
-__all__ = [
-    "create_application",
-    "build_payout_conversation",
-    "build_admin_conversation",
-    "build_manual_payout_conversation",
-]
+"""Bot application wiring.
+
+The exports are imported on first use: services and repositories import
+:mod:`app.core.constants` and :mod:`app.core.types`, which must not load
+the handlers and the application along with them.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "create_application": ".application",
+    "build_payout_conversation": ".conversations",
+    "build_admin_conversation": ".conversations",
+    "build_manual_payout_conversation": ".conversations",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
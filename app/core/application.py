@@ -8,6 +8,10 @@ from telegram.ext import (
 
 from ..config import TOKEN, ADMIN_ID
 from ..utils.logger import log
+from ..data.json_storage import flush_all
+from ..services.excel_writer import excel_writer
+from ..services.render_executor import render_executor
+from ..services.workbook_watcher import WorkbookWatcher
 from .conversations import (
     build_payout_conversation,
     build_admin_conversation,
@@ -59,8 +63,29 @@ from ..handlers.admin import (
 import datetime
 
 
+async def _flush_storage(app) -> None:
+    flush_all()
+    excel_writer.flush()
+
+
 def create_application():
-    app = ApplicationBuilder().token(TOKEN).build()
+    watcher = WorkbookWatcher()
+
+    async def _start_watcher(app) -> None:
+        watcher.start()
+
+    async def _shutdown(app) -> None:
+        await watcher.stop()
+        await _flush_storage(app)
+        render_executor.shutdown(wait=False)
+
+    app = (
+        ApplicationBuilder()
+        .token(TOKEN)
+        .post_init(_start_watcher)
+        .post_shutdown(_shutdown)
+        .build()
+    )
     register_handlers(app)
 
     async def _birthday_job(ctx):
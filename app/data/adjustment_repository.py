@@ -1,13 +1,16 @@
 import json
 import os
+import threading
 from typing import List, Dict, Any, Optional
 
 from app.config import ADJUSTMENTS_FILE
 from app.utils.logger import log
+from app.data.async_repository import synchronized, writer
 
 
 class AdjustmentRepository:
     def __init__(self, file_path: Optional[str] = None) -> None:
+        self._lock = threading.RLock()
         self._file = file_path or ADJUSTMENTS_FILE
         self._data: List[Dict[str, Any]] = self._load()
         if not self._data:
@@ -58,9 +61,11 @@ class AdjustmentRepository:
         self._counter += 1
         return self._counter
 
+    @synchronized
     def list(self) -> List[Dict[str, Any]]:
         return list(self._data)
 
+    @writer
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if 'id' not in data or any(str(it.get('id')) == str(
                 data['id']) for it in self._data):
@@ -69,6 +74,7 @@ class AdjustmentRepository:
         self._save()
         return data
 
+    @writer
     def update(self, adj_id: str,
                updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         for item in self._data:
@@ -79,6 +85,7 @@ class AdjustmentRepository:
                 return item
         return None
 
+    @writer
     def delete(self, adj_id: str) -> None:
         self._data = [
             it for it in self._data if str(
@@ -0,0 +1,57 @@
+"""Awaitable access to the JSON repositories."""
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, Callable, Generic, TypeVar
+
+R = TypeVar("R")
+
+
+def synchronized(method: Callable) -> Callable:
+    """Run a repository method under the repository's ``_lock``."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def writer(method: Callable) -> Callable:
+    """Like :func:`synchronized`, and mark the method as mutating."""
+    wrapped = synchronized(method)
+    wrapped.writes = True
+    return wrapped
+
+
+class AsyncRepository(Generic[R]):
+    """Expose a synchronous repository through coroutines.
+
+    Every call runs in a worker thread, so file I/O never blocks the event
+    loop. Methods marked with :func:`writer` are additionally serialized by
+    an ``asyncio.Lock`` so concurrent requests apply their changes one at a
+    time. The wrapped repository stays usable from synchronous code; its
+    own thread lock keeps both paths consistent.
+    """
+
+    def __init__(self, repo: R) -> None:
+        self.repo = repo
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.repo, name)
+        if not callable(attr):
+            return attr
+
+        if getattr(attr, "writes", False):
+            async def call(*args, **kwargs):
+                async with self._lock:
+                    return await asyncio.to_thread(attr, *args, **kwargs)
+        else:
+            async def call(*args, **kwargs):
+                return await asyncio.to_thread(attr, *args, **kwargs)
+
+        functools.update_wrapper(call, attr)
+        return call
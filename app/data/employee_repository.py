@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import asdict, is_dataclass
 from enum import Enum
 from datetime import date, datetime
-from typing import List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from app.core.types import Employee, EmployeeStatus
 from app.utils.config import DATA_FILE
 from app.utils.logger import log
+from .async_repository import synchronized, writer
 from .json_storage import JsonStorage
 
 
@@ -23,86 +25,179 @@ def _serialize(obj):
     return obj
 
 
+def _parse_date(value) -> date | None:
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value))
+    except Exception:
+        return None
+
+
+def _parse_datetime(value) -> datetime | None:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except Exception:
+        return None
+
+
+def employee_from_record(uid, data: dict) -> Employee:
+    """Build an :class:`Employee` from a stored ``user.json`` record."""
+    return Employee(
+        id=str(uid),
+        name=data.get("name", ""),
+        full_name=data.get("full_name", ""),
+        phone=data.get("phone", ""),
+        position=data.get("position", ""),
+        is_admin=data.get("is_admin", False),
+        card_number=data.get("card_number", ""),
+        bank=data.get("bank", ""),
+        birthdate=_parse_date(data.get("birthdate")),
+        note=data.get("note", ""),
+        photo_url=data.get("photo_url", ""),
+        status=EmployeeStatus(data.get("status", "active")),
+        created_at=_parse_datetime(data.get("created_at"))
+        or datetime.utcnow(),
+    )
+
+
+def employee_to_record(employee: Employee) -> dict:
+    """Serialize an :class:`Employee` to a record without its id."""
+    data = _serialize(employee)
+    data.pop("id", None)
+    return data
+
+
 class EmployeeRepository:
-    """Repository for employees."""
+    """Repository for employees.
+
+    Parsed :class:`Employee` objects are cached per data version and only
+    rebuilt after a mutation. The cached objects are shared between
+    callers: change them through :meth:`update_employee` with a copy
+    (``dataclasses.replace``) instead of editing them in place.
+    """
 
     def __init__(self, storage: JsonStorage | None = None) -> None:
+        self._lock = threading.RLock()
         self._storage = storage or JsonStorage(DATA_FILE)
         log(f"📂 Loading employees from {self._storage.path}")
         self._data: dict[str, dict] = self._storage.load() or {}
         log(f"✅ Loaded employees: {len(self._data)}")
         if not self._data:
             log("⚠️ EmployeeRepository loaded no employees")
+        self._version = 0
+        self._cache: Optional[
+            Tuple[int, List[Employee], Dict[str, Employee], Dict[str, Employee]]
+        ] = None
 
     def _save(self) -> None:
+        self._version += 1
         self._storage.save(self._data)
 
-    @staticmethod
-    def _parse_date(value) -> date | None:
-        if not value:
-            return None
-        if isinstance(value, date):
-            return value
-        try:
-            return date.fromisoformat(str(value))
-        except Exception:
-            return None
+    def _employees(
+        self,
+    ) -> Tuple[List[Employee], Dict[str, Employee], Dict[str, Employee]]:
+        cache = self._cache
+        if cache is None or cache[0] != self._version:
+            employees = [
+                employee_from_record(uid, data)
+                for uid, data in self._data.items()
+                if isinstance(data, dict)
+            ]
+            cache = (
+                self._version,
+                employees,
+                {emp.id: emp for emp in employees},
+                # a shared name resolves to the last employee, as it always has
+                {emp.name: emp for emp in employees},
+            )
+            self._cache = cache
+        return cache[1], cache[2], cache[3]
 
-    @staticmethod
-    def _parse_datetime(value) -> datetime | None:
-        if not value:
-            return None
-        if isinstance(value, datetime):
-            return value
-        try:
-            return datetime.fromisoformat(str(value))
-        except Exception:
-            return None
+    @property
+    def version(self) -> int:
+        """Counter bumped on every mutation, usable as a cache stamp."""
+        return self._version
+
+    @property
+    def location(self) -> str:
+        return str(self._storage.path)
 
+    @synchronized
     def list_employees(self) -> List[Employee]:
-        employees: List[Employee] = []
-        for uid, data in self._data.items():
-            if not isinstance(data, dict):
-                continue
-            record = {
-                "id": str(uid),
-                "name": data.get("name", ""),
-                "full_name": data.get("full_name", ""),
-                "phone": data.get("phone", ""),
-                "position": data.get("position", ""),
-                "is_admin": data.get("is_admin", False),
-                "card_number": data.get("card_number", ""),
-                "bank": data.get("bank", ""),
-                "birthdate": self._parse_date(data.get("birthdate")),
-                "note": data.get("note", ""),
-                "photo_url": data.get("photo_url", ""),
-                "status": EmployeeStatus(data.get("status", "active")),
-                "created_at": self._parse_datetime(data.get("created_at"))
-                or datetime.utcnow(),
-            }
-            employees.append(Employee(**record))
-        return employees
+        return list(self._employees()[0])
+
+    @synchronized
+    def get_by_id(self, employee_id) -> Optional[Employee]:
+        return self._employees()[1].get(str(employee_id))
+
+    @synchronized
+    def get_by_name(self, name: str) -> Optional[Employee]:
+        return self._employees()[2].get(name)
+
+    @synchronized
+    def get_record(self, employee_id) -> Optional[dict]:
+        """Return a copy of the stored record for ``employee_id``."""
+        data = self._data.get(str(employee_id))
+        return dict(data) if isinstance(data, dict) else None
+
+    @synchronized
+    def records(self) -> Dict[str, dict]:
+        """Return copies of all stored records keyed by employee id."""
+        return {
+            str(uid): dict(data)
+            for uid, data in self._data.items()
+            if isinstance(data, dict)
+        }
+
+    @writer
+    def patch_record(self, employee_id, fields: dict,
+                     remove: Iterable[str] = ()) -> Optional[dict]:
+        """Merge ``fields`` into one record and drop the ``remove`` keys."""
+        data = self._data.get(str(employee_id))
+        if not isinstance(data, dict):
+            return None
+        data.update({k: _serialize(v) for k, v in fields.items() if k != "id"})
+        for key in remove:
+            data.pop(key, None)
+        self._save()
+        return dict(data)
+
+    @writer
+    def replace_all(self, records: Dict[str, dict]) -> int:
+        """Replace every record, keeping keys the dataclass does not know."""
+        self._data = {
+            str(uid): {k: _serialize(v) for k, v in data.items() if k != "id"}
+            for uid, data in records.items()
+            if isinstance(data, dict)
+        }
+        self._save()
+        return len(self._data)
 
+    @writer
     def add_employee(self, employee: Employee) -> None:
-        data = _serialize(employee)
-        data.pop("id", None)
-        self._data[employee.id] = data
+        self._data[employee.id] = employee_to_record(employee)
         self._save()
 
+    @writer
     def update_employee(self, employee: Employee) -> None:
         if employee.id in self._data:
-            data = _serialize(employee)
-            data.pop("id", None)
-            self._data[employee.id].update(data)
+            self._data[employee.id].update(employee_to_record(employee))
             self._save()
 
+    @writer
     def delete_employee_by_id(self, employee_id: str) -> None:
         if employee_id in self._data:
             self._data.pop(employee_id)
             self._save()
 
+    @writer
     def save_employees(self, employees: List[Employee]) -> None:
-        self._data = {e.id: _serialize(e) | {"id": e.id} for e in employees}
-        for v in self._data.values():
-            v.pop("id", None)
+        self._data = {e.id: employee_to_record(e) for e in employees}
         self._save()
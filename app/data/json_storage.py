@@ -1,18 +1,51 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import tempfile
+import threading
+import weakref
 from pathlib import Path
 from typing import Any
 
 from app.utils.logger import log
 
+# seconds during which consecutive saves are coalesced into one write
+SAVE_DELAY = 0.5
+
+_instances: "weakref.WeakSet[JsonStorage]" = weakref.WeakSet()
+
+
+def flush_all() -> None:
+    """Write out every storage that still has a pending save."""
+    for storage in list(_instances):
+        storage.flush()
+
+
+atexit.register(flush_all)
+
 
 class JsonStorage:
-    """Simple JSON file storage."""
+    """JSON file storage with atomic, debounced writes.
 
-    def __init__(self, path: str | Path) -> None:
+    ``save`` only records the latest data and arms a timer; all saves made
+    within ``delay`` seconds are written once by a background thread. Every
+    write goes to a temporary file that is fsynced and renamed over the
+    target, so a crash never leaves a truncated file behind. Call
+    :meth:`flush` (or :func:`flush_all` on shutdown) to write immediately.
+    """
+
+    def __init__(self, path: str | Path, delay: float = SAVE_DELAY) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._io_lock = threading.RLock()
+        self._pending: Any = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+        _instances.add(self)
 
     def load(self) -> dict[str, Any]:
         """Load data from the JSON file, falling back to an example copy."""
@@ -30,7 +63,7 @@ class JsonStorage:
                     log(f"⚠️ Using example file {example}")
                     with example.open("r", encoding="utf-8") as f:
                         data = json.load(f)
-                    self.save(data)
+                    self._write(data)
             log(f"✅ Records loaded: {len(data or {})}")
             return data or {}
 
@@ -40,13 +73,87 @@ class JsonStorage:
             with example.open('r', encoding='utf-8') as f:
                 data = json.load(f)
             # seed real file so future writes persist
-            with self.path.open('w', encoding='utf-8') as fw:
-                json.dump(data, fw, ensure_ascii=False, indent=2)
+            self._write(data)
             log(f"✅ Records loaded: {len(data)}")
             return data
         log(f"❌ {self.path} missing and no example file")
         return {}
 
     def save(self, data: dict[str, Any]) -> None:
-        with self.path.open('w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """Schedule ``data`` to be written after the debounce delay."""
+        with self._lock:
+            self._pending = data
+            self._dirty = True
+            immediate = self._delay <= 0
+            if not immediate and self._timer is None:
+                self._timer = threading.Timer(self._delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending data now, if there is any."""
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                data = self._pending
+                self._dirty = False
+                self._pending = None
+            try:
+                self._write(data)
+            except RuntimeError as exc:
+                # data was mutated while being serialized; retry later
+                log(f"⚠️ Retrying save of {self.path}: {exc}")
+                self.save(data)
+            except Exception as exc:
+                log(f"❌ Failed writing {self.path}: {exc}")
+                with self._lock:
+                    if not self._dirty:
+                        self._pending = data
+                        self._dirty = True
+                raise
+
+    def _write(self, data: Any) -> None:
+        payload = json.dumps(data, ensure_ascii=False, indent=2)
+        fd, tmp = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates 0600 files, keep the mode of the file we replace
+            os.chmod(tmp, self._mode())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._fsync_dir()
+
+    def _mode(self) -> int:
+        try:
+            return os.stat(self.path).st_mode & 0o777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def _fsync_dir(self) -> None:
+        """Make the rename itself durable where the platform allows it."""
+        try:
+            fd = os.open(self.path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -1,15 +1,19 @@
 import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 
+from app.config import MESSAGES_FILE
 from app.utils.logger import log
+from app.data.async_repository import synchronized, writer
 
 
 class MessageRepository:
-    def __init__(self, path: str | Path = "messages.json") -> None:
-        self._file = Path(path)
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._lock = threading.RLock()
+        self._file = Path(path or MESSAGES_FILE)
         self._data: List[Dict[str, Any]] = self._load()
         if not self._data:
             log("⚠️ MessageRepository loaded no messages")
@@ -67,6 +71,7 @@ class MessageRepository:
         self._counter += 1
         return str(self._counter)
 
+    @synchronized
     def list(self) -> List[Dict[str, Any]]:
         return sorted(
             self._data,
@@ -75,6 +80,7 @@ class MessageRepository:
                 ""),
             reverse=True)
 
+    @writer
     def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
         if "id" not in record:
             record["id"] = self._generate_id()
@@ -82,6 +88,7 @@ class MessageRepository:
         self._save()
         return record
 
+    @writer
     def accept(self, msg_id: str) -> Optional[Dict[str, Any]]:
         for m in self._data:
             if str(m.get("id")) == str(msg_id):
@@ -92,6 +99,7 @@ class MessageRepository:
                 return m
         return None
 
+    @writer
     def accept_by_details(self, user_id: str,
                           message_id: int) -> Optional[Dict[str, Any]]:
         for m in self._data:
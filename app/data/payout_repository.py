@@ -1,32 +1,129 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
-from app.config import ADVANCE_REQUESTS_FILE
+from app.config import ADVANCE_REQUESTS_FILE, PAYOUTS_JOURNAL
 from app.utils.logger import log
+from app.data.async_repository import synchronized, writer
+
+# number of journal entries after which the log is folded into the snapshot
+COMPACT_EVERY = 500
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# legacy status values and their current names
+LEGACY_STATUSES = {"В ожидании": "Ожидает", "Разрешено": "Одобрено"}
 
 
 class PayoutRepository:
-    def __init__(self, file_path: Optional[str] = None) -> None:
+    """Payout storage backed by a JSON snapshot and an append-only journal.
+
+    In journal mode every mutation is appended as one JSON line to
+    ``<file>.wal`` instead of rewriting the whole snapshot. The journal is
+    replayed on startup and folded into the snapshot every
+    ``compact_every`` entries.
+
+    Records are kept in an id map with secondary indexes by user, status,
+    (payout_type, method) and a sorted timestamp index, all maintained on
+    create/update/delete so lookups do not scan the whole history.
+    """
+
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        journal: Optional[bool] = None,
+        compact_every: int = COMPACT_EVERY,
+    ) -> None:
+        self._lock = threading.RLock()
         self._file = file_path or ADVANCE_REQUESTS_FILE
+        self._journal = PAYOUTS_JOURNAL if journal is None else journal
+        self._journal_file = f"{self._file}.wal"
+        self._compact_every = compact_every
+        self._journal_size = 0
         log(f"📂 Loading payouts from {self._file}")
-        self._data: List[Dict[str, Any]] = self._load()
-        log(f"✅ Loaded payouts: {len(self._data)}")
-        if not self._data:
-            log("⚠️ PayoutRepository loaded no payout records")
+        data = self._load()
         self._counter = 0
         changed = False
-        for item in self._data:
+        seen: set[str] = set()
+        for item in data:
             raw_id = item.get("id")
-            if raw_id is None or not str(raw_id).isdigit():
-                self._counter += 1
-                item["id"] = str(self._counter)
+            if (raw_id is None or not str(raw_id).isdigit()
+                    or str(raw_id) in seen):
+                item["id"] = None
                 changed = True
             else:
+                item["id"] = str(raw_id)
+                seen.add(item["id"])
                 self._counter = max(self._counter, int(raw_id))
-        if changed:
-            self._save()
+        for item in data:
+            if item["id"] is None:
+                item["id"] = self._generate_id()
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_user: Dict[str, set[str]] = defaultdict(set)
+        self._by_status: Dict[Any, set[str]] = defaultdict(set)
+        self._by_kind: Dict[tuple, set[str]] = defaultdict(set)
+        self._timeline: List[Tuple[datetime, str]] = []
+        self._undated: set[str] = set()
+        self._ts: Dict[str, Optional[datetime]] = {}
+        for item in data:
+            self._by_id[item["id"]] = item
+            self._index(item)
+        replayed, damaged = self._replay_journal()
+        log(f"✅ Loaded payouts: {len(self._by_id)}")
+        if not self._by_id:
+            log("⚠️ PayoutRepository loaded no payout records")
+        # a damaged journal is rewritten so new entries are not appended
+        # after the torn line
+        if changed or replayed or damaged:
+            self.compact()
+
+    @staticmethod
+    def _parse_ts(value: Any) -> Optional[datetime]:
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.strptime(str(value), TIMESTAMP_FORMAT)
+        except Exception:
+            return None
+
+    def _index(self, item: Dict[str, Any]) -> None:
+        pid = item["id"]
+        self._by_user[str(item.get("user_id"))].add(pid)
+        self._by_status[item.get("status")].add(pid)
+        self._by_kind[(item.get("payout_type"), item.get("method"))].add(pid)
+        created = self._parse_ts(item.get("timestamp"))
+        self._ts[pid] = created
+        if created is None:
+            self._undated.add(pid)
+        else:
+            insort(self._timeline, (created, pid))
+
+    def _unindex(self, item: Dict[str, Any]) -> None:
+        pid = item["id"]
+        self._discard(self._by_user, str(item.get("user_id")), pid)
+        self._discard(self._by_status, item.get("status"), pid)
+        self._discard(
+            self._by_kind, (item.get("payout_type"), item.get("method")), pid)
+        created = self._ts.pop(pid, None)
+        if created is None:
+            self._undated.discard(pid)
+        else:
+            pos = bisect_left(self._timeline, (created, pid))
+            if pos < len(self._timeline) and self._timeline[pos] == (created, pid):
+                self._timeline.pop(pos)
+
+    @staticmethod
+    def _discard(index: Dict[Any, set[str]], key: Any, pid: str) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(pid)
+        if not ids:
+            del index[key]
 
     def _load(self) -> List[Dict[str, Any]]:
         if not os.path.exists(self._file):
@@ -63,12 +160,9 @@ class PayoutRepository:
                     log(f"❌ Failed reading example {example}: {e}")
                     data = []
         # normalize legacy status values
-        status_map = {"В ожидании": "Ожидает", "Разрешено": "Одобрено"}
         changed = False
         for item in data:
-            if item.get("status") in status_map:
-                item["status"] = status_map[item["status"]]
-                changed = True
+            changed |= self._normalize_status(item)
         if changed:
             try:
                 with open(self._file, "w", encoding="utf-8") as f:
@@ -78,17 +172,145 @@ class PayoutRepository:
         return data
 
     def _save(self) -> None:
-        with open(self._file, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        tmp = f"{self._file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self._by_id.values()), f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file)
+
+    @staticmethod
+    def _normalize_status(item: Dict[str, Any]) -> bool:
+        if item.get("status") in LEGACY_STATUSES:
+            item["status"] = LEGACY_STATUSES[item["status"]]
+            return True
+        return False
+
+    def _replay_journal(self) -> Tuple[int, bool]:
+        """Apply journal entries left over from the previous run.
+
+        Returns the number of entries applied and whether a damaged entry
+        was found. Appends always start on a new line, so the entries after
+        a torn one are intact and still applied.
+        """
+        if not os.path.exists(self._journal_file):
+            return 0, False
+        applied = 0
+        damaged = False
+        with open(self._journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    # a crash mid-append leaves a torn last line
+                    log(f"⚠️ Skipping damaged journal entry in {self._journal_file}")
+                    damaged = True
+                    continue
+                self._apply(entry)
+                applied += 1
+        if applied:
+            log(f"🔁 Replayed payout journal entries: {applied}")
+        return applied, damaged
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply one journal entry to the in-memory data.
+
+        Entries are idempotent so a journal that was already folded into
+        the snapshot can be replayed again safely.
+        """
+        op = entry.get("op")
+        if op == "create":
+            record = entry["record"]
+            pid = str(record.get("id"))
+            record["id"] = pid
+            # same normalization as the snapshot gets in _load
+            self._normalize_status(record)
+            self._remove(pid)
+            self._by_id[pid] = record
+            self._index(record)
+            if pid.isdigit():
+                self._counter = max(self._counter, int(pid))
+        elif op == "update":
+            item = self._by_id.get(str(entry["id"]))
+            if item is not None:
+                self._unindex(item)
+                item.update(entry["fields"])
+                self._normalize_status(item)
+                self._index(item)
+        elif op == "delete":
+            for pid in entry["ids"]:
+                self._remove(str(pid))
+
+    def _remove(self, payout_id: str) -> bool:
+        item = self._by_id.pop(payout_id, None)
+        if item is None:
+            return False
+        self._unindex(item)
+        return True
+
+    def _commit(self, entry: Dict[str, Any]) -> None:
+        """Persist a mutation that was already applied in memory."""
+        if not self._journal:
+            self._save()
+            return
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self._journal_file, "ab+") as f:
+            # never continue a line torn by a crash mid-append
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_size += 1
+        if self._journal_size >= self._compact_every:
+            self.compact()
+
+    @writer
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and start a fresh log."""
+        self._save()
+        if os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+        self._journal_size = 0
 
     def _generate_id(self) -> str:
         self._counter += 1
         return str(self._counter)
 
+    @property
+    def location(self) -> str:
+        return self._file
+
+    @synchronized
     def load_all(self) -> List[Dict[str, Any]]:
         """Return raw payout list without filtering."""
-        return list(self._data)
+        return list(self._by_id.values())
+
+    @synchronized
+    def get(self, payout_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(str(payout_id))
 
+    @synchronized
+    def timestamp_of(self, record: Dict[str, Any]) -> Optional[datetime]:
+        """Return the creation time parsed when the record was indexed."""
+        pid = str(record.get("id"))
+        if pid in self._ts:
+            return self._ts[pid]
+        return self._parse_ts(record.get("timestamp"))
+
+    @synchronized
+    def list_with_timestamps(
+        self, *args: Any, **kwargs: Any
+    ) -> List[Tuple[Dict[str, Any], Optional[datetime]]]:
+        """Same as :meth:`list` but pairs each record with its datetime."""
+        return [(r, self._ts.get(r["id"])) for r in self.list(*args, **kwargs)]
+
+    @synchronized
     def list(
         self,
         employee_id: Optional[str] = None,
@@ -97,62 +319,132 @@ class PayoutRepository:
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
-        result = []
+        """Return payouts matching the filters, newest first.
+
+        Equality filters are answered from the secondary indexes and the
+        date range is cut out of the sorted timestamp index with bisect.
+        Records without a parseable timestamp always pass the date filter
+        and are returned last. ``limit``/``offset`` select one page of the
+        result.
+        """
+        return [self._by_id[pid] for pid in self.list_ids(
+            employee_id, payout_type, status, method, from_date, to_date,
+            limit, offset)]
+
+    @synchronized
+    def list_ids(
+        self,
+        employee_id: Optional[str] = None,
+        payout_type: Optional[str] = None,
+        status: Optional[str] = None,
+        method: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[str]:
+        """Ids of the records :meth:`list` returns, in the same order."""
         from_dt = datetime.fromisoformat(from_date) if from_date else None
         to_dt = datetime.fromisoformat(to_date) if to_date else None
-        for item in self._data:
-            if employee_id and str(item.get("user_id")) != str(employee_id):
-                continue
-            if payout_type and item.get("payout_type") != payout_type:
-                continue
-            if status and item.get("status") != status:
-                continue
-            if method and item.get("method") != method:
-                continue
-            ts_str = item.get("timestamp")
-            created = None
-            if ts_str:
-                try:
-                    created = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    pass
-            if from_dt and created and created < from_dt:
-                continue
-            if to_dt and created and created > to_dt:
-                continue
-            result.append(item)
-        result.sort(key=lambda i: i.get("timestamp", ""), reverse=True)
-        return result
 
+        candidates: Optional[set[str]] = None
+        filters = []
+        if employee_id:
+            filters.append(self._by_user.get(str(employee_id), set()))
+        if status:
+            filters.append(self._by_status.get(status, set()))
+        if payout_type or method:
+            filters.append({
+                pid
+                for (kind, how), ids in self._by_kind.items()
+                if (not payout_type or kind == payout_type)
+                and (not method or how == method)
+                for pid in ids
+            })
+        if filters:
+            filters.sort(key=len)
+            candidates = set(filters[0])
+            for ids in filters[1:]:
+                candidates &= ids
+
+        lo = 0
+        hi = len(self._timeline)
+        if from_dt:
+            lo = bisect_left(self._timeline, (from_dt,))
+        if to_dt:
+            hi = bisect_right(self._timeline, (to_dt, "\uffff"))
+
+        if candidates is not None and len(candidates) < hi - lo:
+            dated = sorted(
+                (
+                    (self._ts[pid], pid)
+                    for pid in candidates
+                    if self._ts[pid] is not None
+                    and (not from_dt or self._ts[pid] >= from_dt)
+                    and (not to_dt or self._ts[pid] <= to_dt)
+                ),
+                reverse=True,
+            )
+            ordered = [pid for _, pid in dated]
+            undated = [pid for pid in candidates if pid in self._undated]
+        else:
+            ordered = [
+                pid
+                for _, pid in reversed(self._timeline[lo:hi])
+                if candidates is None or pid in candidates
+            ]
+            undated = [
+                pid
+                for pid in self._undated
+                if candidates is None or pid in candidates
+            ]
+        undated.sort(key=lambda pid: (len(pid), pid), reverse=True)
+        page = (ordered + undated)[offset:]
+        if limit is not None:
+            page = page[:limit]
+        return page
+
+    @synchronized
+    def get_many(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Records of ``ids`` in that order; deleted ids are skipped."""
+        return [self._by_id[pid] for pid in map(str, ids) if pid in self._by_id]
+
+    @writer
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        if "id" not in data or any(
-                p.get("id") == data["id"] for p in self._data):
+        if "id" not in data or str(data["id"]) in self._by_id:
             data["id"] = self._generate_id()
-        self._data.append(data)
-        self._save()
+        data["id"] = str(data["id"])
+        self._by_id[data["id"]] = data
+        self._index(data)
+        self._commit({"op": "create", "record": data})
         return data
 
+    @writer
     def update(self, payout_id: str,
                updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        for item in self._data:
-            if str(item.get("id")) == str(payout_id):
-                item.update(
-                    {k: v for k, v in updates.items() if v is not None})
-                self._save()
-                return item
-        return None
+        item = self._by_id.get(str(payout_id))
+        if item is None:
+            return None
+        fields = {
+            k: v for k, v in updates.items() if v is not None and k != "id"}
+        self._unindex(item)
+        item.update(fields)
+        self._index(item)
+        self._commit({"op": "update", "id": str(payout_id), "fields": fields})
+        return item
 
+    @writer
     def delete_many(self, ids: List[str]) -> None:
-        self._data = [p for p in self._data if str(p.get("id")) not in ids]
-        self._save()
+        for pid in ids:
+            self._remove(str(pid))
+        self._commit({"op": "delete", "ids": [str(i) for i in ids]})
 
+    @writer
     def delete(self, payout_id: str) -> bool:
-        before = len(self._data)
-        self._data = [
-            p for p in self._data if str(
-                p.get("id")) != str(payout_id)]
-        if len(self._data) != before:
-            self._save()
+        if self._remove(str(payout_id)):
+            self._commit({"op": "delete", "ids": [str(payout_id)]})
             return True
         return False
@@ -0,0 +1,94 @@
+"""Process-wide repository instances.
+
+Each store is loaded once and shared by the bot handlers, the API services
+and the module-level helpers, so reads are served from one in-memory copy
+and a single writer owns each file.
+
+``STORAGE_BACKEND`` picks the implementation: the JSON files (default) or
+the SQLite database, which is filled from the JSON files on first use.
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Any
+
+from app.config import STORAGE_BACKEND
+from .adjustment_repository import AdjustmentRepository
+from .async_repository import AsyncRepository
+from .employee_repository import EmployeeRepository
+from .message_repository import MessageRepository
+from .payout_repository import PayoutRepository
+from .vacation_repository import VacationRepository
+
+_facades: dict[int, AsyncRepository] = {}
+_facades_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_engine():
+    """Return the SQLite engine with the JSON data imported."""
+    from app.db.migrate import migrate_json
+    from app.db.session import get_engine as create_engine
+
+    engine = create_engine()
+    migrate_json(engine)
+    return engine
+
+
+def _use_sqlite() -> bool:
+    return STORAGE_BACKEND == "sqlite"
+
+
+@lru_cache(maxsize=None)
+def get_employee_repository() -> EmployeeRepository:
+    if _use_sqlite():
+        from .sql_repository import SqlEmployeeRepository
+        return SqlEmployeeRepository(get_engine())
+    return EmployeeRepository()
+
+
+@lru_cache(maxsize=None)
+def get_payout_repository() -> PayoutRepository:
+    if _use_sqlite():
+        from .sql_repository import SqlPayoutRepository
+        return SqlPayoutRepository(get_engine())
+    return PayoutRepository()
+
+
+@lru_cache(maxsize=None)
+def get_vacation_repository() -> VacationRepository:
+    if _use_sqlite():
+        from .sql_repository import SqlVacationRepository
+        return SqlVacationRepository(get_engine())
+    return VacationRepository()
+
+
+@lru_cache(maxsize=None)
+def get_adjustment_repository() -> AdjustmentRepository:
+    if _use_sqlite():
+        from .sql_repository import SqlAdjustmentRepository
+        return SqlAdjustmentRepository(get_engine())
+    return AdjustmentRepository()
+
+
+@lru_cache(maxsize=None)
+def get_message_repository() -> MessageRepository:
+    if _use_sqlite():
+        from .sql_repository import SqlMessageRepository
+        return SqlMessageRepository(get_engine())
+    return MessageRepository()
+
+
+def get_async(repo: Any) -> AsyncRepository:
+    """Return the shared async facade for ``repo``.
+
+    Sharing the facade shares its write lock, so writers coming from
+    different services are serialized against each other.
+    """
+    with _facades_lock:
+        facade = _facades.get(id(repo))
+        if facade is None or facade.repo is not repo:
+            facade = AsyncRepository(repo)
+            _facades[id(repo)] = facade
+        return facade
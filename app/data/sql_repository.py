@@ -0,0 +1,430 @@
+"""Repositories backed by the SQLite database.
+
+They expose the same methods as the JSON repositories, so services work
+with either backend. Every row keeps the full record in its JSON ``data``
+column; the indexed columns next to it are derived from the record on
+each write and are what filtering, ordering and paging run on.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, literal_column, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.types import Employee
+from app.db.session import get_engine
+from app.models import (
+    AdjustmentRecord,
+    Employee as EmployeeRow,
+    MessageRecord,
+    PayoutRecord,
+    VacationRecord,
+)
+from .async_repository import synchronized, writer
+from .employee_repository import (
+    _serialize,
+    employee_from_record,
+    employee_to_record,
+)
+from .payout_repository import PayoutRepository
+
+
+class SqlRepository:
+    """Common CRUD for list-shaped stores (vacations, adjustments, ...)."""
+
+    model: Any = None
+    # type of the ``id`` key in the JSON records of this store
+    id_type: Callable[[Any], Any] = int
+
+    def __init__(self, engine: Optional[Engine] = None) -> None:
+        self._lock = threading.RLock()
+        self._engine = engine or get_engine()
+
+    @property
+    def location(self) -> str:
+        return str(self._engine.url.database)
+
+    def _session(self) -> Session:
+        return Session(self._engine, expire_on_commit=False)
+
+    def _columns(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Indexed column values derived from ``record``."""
+        return {}
+
+    def _record(self, row: Any) -> Dict[str, Any]:
+        record = dict(row.data)
+        record["id"] = self.id_type(row.id)
+        return record
+
+    @staticmethod
+    def _key(record_id: Any) -> Optional[int]:
+        return int(record_id) if str(record_id).isdigit() else None
+
+    def _get_row(self, session: Session, record_id: Any) -> Any:
+        key = self._key(record_id)
+        return session.get(self.model, key) if key is not None else None
+
+    def _apply(self, row: Any, record: Dict[str, Any]) -> None:
+        row.data = {k: v for k, v in record.items() if k != "id"}
+        for column, value in self._columns(record).items():
+            setattr(row, column, value)
+
+    def _order(self) -> Tuple[Any, ...]:
+        return (self.model.id,)
+
+    @synchronized
+    def list(self) -> List[Dict[str, Any]]:
+        with self._session() as session:
+            rows = session.scalars(select(self.model).order_by(*self._order()))
+            return [self._record(row) for row in rows]
+
+    @writer
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._session() as session, session.begin():
+            key = self._key(data.get("id"))
+            if key is not None and session.get(self.model, key) is not None:
+                key = None
+            row = self.model(id=key)
+            self._apply(row, data)
+            session.add(row)
+            session.flush()
+            data["id"] = self.id_type(row.id)
+        return data
+
+    @writer
+    def update(self, record_id: str,
+               updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._session() as session, session.begin():
+            row = self._get_row(session, record_id)
+            if row is None:
+                return None
+            record = self._record(row)
+            record.update(
+                {k: v for k, v in updates.items() if v is not None and k != "id"})
+            self._apply(row, record)
+            return record
+
+    @writer
+    def delete(self, record_id: str) -> bool:
+        key = self._key(record_id)
+        if key is None:
+            return False
+        with self._session() as session, session.begin():
+            result = session.execute(
+                delete(self.model).where(self.model.id == key))
+            return result.rowcount > 0
+
+    @writer
+    def replace_all(self, records: List[Dict[str, Any]]) -> int:
+        """Replace the whole table with ``records`` in one transaction."""
+        with self._session() as session, session.begin():
+            session.execute(delete(self.model))
+            for record in records:
+                row = self.model(id=self._key(record.get("id")))
+                self._apply(row, record)
+                session.add(row)
+        return len(records)
+
+
+class SqlVacationRepository(SqlRepository):
+    model = VacationRecord
+
+    def _columns(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "user_id": str(record.get("employee_id") or "") or None,
+            "start_date": record.get("start_date"),
+        }
+
+
+class SqlAdjustmentRepository(SqlRepository):
+    model = AdjustmentRecord
+
+    def _columns(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "user_id": str(record.get("employee_id") or "") or None,
+            "status": record.get("status"),
+            "date": record.get("date"),
+        }
+
+
+class SqlMessageRepository(SqlRepository):
+    model = MessageRecord
+    id_type = str
+
+    def _columns(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        message_id = record.get("message_id")
+        return {
+            "user_id": str(record.get("user_id") or "") or None,
+            "message_id": message_id if isinstance(message_id, int) else None,
+            "status": record.get("status"),
+            "timestamp": record.get("timestamp"),
+        }
+
+    def _order(self) -> Tuple[Any, ...]:
+        return (self.model.timestamp.desc(), self.model.id)
+
+    def _accept(self, row: Any) -> Dict[str, Any]:
+        record = self._record(row)
+        record["status"] = "Принято"
+        record["accepted"] = True
+        record["timestamp_accept"] = datetime.utcnow().isoformat()
+        self._apply(row, record)
+        return record
+
+    @writer
+    def accept(self, msg_id: str) -> Optional[Dict[str, Any]]:
+        with self._session() as session, session.begin():
+            row = self._get_row(session, msg_id)
+            return self._accept(row) if row is not None else None
+
+    @writer
+    def accept_by_details(self, user_id: str,
+                          message_id: int) -> Optional[Dict[str, Any]]:
+        with self._session() as session, session.begin():
+            row = session.scalars(
+                select(MessageRecord)
+                .where(MessageRecord.user_id == str(user_id),
+                       MessageRecord.message_id == message_id)
+                .order_by(MessageRecord.id)
+                .limit(1)
+            ).first()
+            return self._accept(row) if row is not None else None
+
+
+class SqlPayoutRepository(SqlRepository):
+    """SQL counterpart of :class:`PayoutRepository`."""
+
+    model = PayoutRecord
+    id_type = str
+
+    def _columns(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "user_id": str(record.get("user_id")),
+            "status": record.get("status"),
+            "payout_type": record.get("payout_type"),
+            "method": record.get("method"),
+            "timestamp": PayoutRepository._parse_ts(record.get("timestamp")),
+        }
+
+    def _query(
+        self,
+        employee_id: Optional[str] = None,
+        payout_type: Optional[str] = None,
+        status: Optional[str] = None,
+        method: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ):
+        query = select(PayoutRecord)
+        if employee_id:
+            query = query.where(PayoutRecord.user_id == str(employee_id))
+        if status:
+            query = query.where(PayoutRecord.status == status)
+        if payout_type:
+            query = query.where(PayoutRecord.payout_type == payout_type)
+        if method:
+            query = query.where(PayoutRecord.method == method)
+        # undated records always pass the date filter, like in JSON mode
+        dated = []
+        if from_date:
+            dated.append(
+                PayoutRecord.timestamp >= datetime.fromisoformat(from_date))
+        if to_date:
+            dated.append(
+                PayoutRecord.timestamp <= datetime.fromisoformat(to_date))
+        if dated:
+            query = query.where(
+                or_(PayoutRecord.timestamp.is_(None), and_(*dated)))
+        query = query.order_by(
+            PayoutRecord.timestamp.is_(None),
+            PayoutRecord.timestamp.desc(),
+            PayoutRecord.id.desc(),
+        )
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    @synchronized
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Return raw payout list without filtering."""
+        with self._session() as session:
+            rows = session.scalars(select(PayoutRecord).order_by(PayoutRecord.id))
+            return [self._record(row) for row in rows]
+
+    @synchronized
+    def get(self, payout_id: str) -> Optional[Dict[str, Any]]:
+        with self._session() as session:
+            row = self._get_row(session, payout_id)
+            return self._record(row) if row is not None else None
+
+    def timestamp_of(self, record: Dict[str, Any]) -> Optional[datetime]:
+        return PayoutRepository._parse_ts(record.get("timestamp"))
+
+    @synchronized
+    def list(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        with self._session() as session:
+            rows = session.scalars(self._query(*args, **kwargs))
+            return [self._record(row) for row in rows]
+
+    @synchronized
+    def list_with_timestamps(
+        self, *args: Any, **kwargs: Any
+    ) -> List[Tuple[Dict[str, Any], Optional[datetime]]]:
+        with self._session() as session:
+            rows = session.scalars(self._query(*args, **kwargs))
+            return [(self._record(row), row.timestamp) for row in rows]
+
+    @synchronized
+    def list_ids(self, *args: Any, **kwargs: Any) -> List[str]:
+        query = self._query(*args, **kwargs).with_only_columns(PayoutRecord.id)
+        with self._session() as session:
+            return [str(key) for key in session.scalars(query)]
+
+    @synchronized
+    def get_many(self, ids: List[str]) -> List[Dict[str, Any]]:
+        keys = [k for k in (self._key(i) for i in ids) if k is not None]
+        if not keys:
+            return []
+        with self._session() as session:
+            rows = session.scalars(
+                select(PayoutRecord).where(PayoutRecord.id.in_(keys)))
+            found = {str(row.id): self._record(row) for row in rows}
+        return [found[str(i)] for i in ids if str(i) in found]
+
+    @writer
+    def delete_many(self, ids: List[str]) -> None:
+        keys = [k for k in (self._key(i) for i in ids) if k is not None]
+        if not keys:
+            return
+        with self._session() as session, session.begin():
+            session.execute(delete(PayoutRecord).where(PayoutRecord.id.in_(keys)))
+
+
+class SqlEmployeeRepository:
+    """SQL counterpart of :class:`EmployeeRepository`."""
+
+    def __init__(self, engine: Optional[Engine] = None) -> None:
+        self._lock = threading.RLock()
+        self._engine = engine or get_engine()
+
+    @property
+    def location(self) -> str:
+        return str(self._engine.url.database)
+
+    def _session(self) -> Session:
+        return Session(self._engine, expire_on_commit=False)
+
+    @staticmethod
+    def _apply(row: EmployeeRow, record: Dict[str, Any]) -> None:
+        employee = employee_from_record(row.id, record)
+        row.data = dict(record)
+        row.name = employee.name
+        row.full_name = employee.full_name
+        row.phone = employee.phone
+        row.position = employee.position
+        row.is_admin = bool(employee.is_admin)
+        row.card_number = employee.card_number
+        row.bank = employee.bank
+        row.birthdate = employee.birthdate
+        row.note = employee.note
+        row.photo_url = employee.photo_url
+        row.status = employee.status.value
+        row.created_at = employee.created_at
+
+    def _put(self, session: Session, uid: str, record: Dict[str, Any]) -> None:
+        row = session.get(EmployeeRow, uid) or EmployeeRow(id=uid)
+        self._apply(row, record)
+        session.add(row)
+
+    @synchronized
+    def list_employees(self) -> List[Employee]:
+        with self._session() as session:
+            rows = session.scalars(
+                select(EmployeeRow).order_by(literal_column("rowid")))
+            return [employee_from_record(row.id, row.data) for row in rows]
+
+    @synchronized
+    def get_by_id(self, employee_id) -> Optional[Employee]:
+        with self._session() as session:
+            row = session.get(EmployeeRow, str(employee_id))
+            return employee_from_record(row.id, row.data) if row else None
+
+    @synchronized
+    def get_by_name(self, name: str) -> Optional[Employee]:
+        with self._session() as session:
+            row = session.scalars(
+                select(EmployeeRow)
+                .where(EmployeeRow.name == name)
+                .order_by(literal_column("rowid").desc())
+                .limit(1)
+            ).first()
+            return employee_from_record(row.id, row.data) if row else None
+
+    @synchronized
+    def get_record(self, employee_id) -> Optional[Dict[str, Any]]:
+        with self._session() as session:
+            row = session.get(EmployeeRow, str(employee_id))
+            return dict(row.data) if row else None
+
+    @synchronized
+    def records(self) -> Dict[str, Dict[str, Any]]:
+        with self._session() as session:
+            rows = session.scalars(
+                select(EmployeeRow).order_by(literal_column("rowid")))
+            return {row.id: dict(row.data) for row in rows}
+
+    @writer
+    def patch_record(self, employee_id, fields: Dict[str, Any],
+                     remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        with self._session() as session, session.begin():
+            row = session.get(EmployeeRow, str(employee_id))
+            if row is None:
+                return None
+            record = dict(row.data)
+            record.update(
+                {k: _serialize(v) for k, v in fields.items() if k != "id"})
+            for key in remove:
+                record.pop(key, None)
+            self._apply(row, record)
+            return record
+
+    @writer
+    def add_employee(self, employee: Employee) -> None:
+        with self._session() as session, session.begin():
+            self._put(session, employee.id, employee_to_record(employee))
+
+    @writer
+    def update_employee(self, employee: Employee) -> None:
+        with self._session() as session, session.begin():
+            row = session.get(EmployeeRow, employee.id)
+            if row is not None:
+                self._apply(row, dict(row.data) | employee_to_record(employee))
+
+    @writer
+    def delete_employee_by_id(self, employee_id: str) -> None:
+        with self._session() as session, session.begin():
+            session.execute(
+                delete(EmployeeRow).where(EmployeeRow.id == employee_id))
+
+    @writer
+    def save_employees(self, employees: List[Employee]) -> None:
+        self.replace_all({e.id: employee_to_record(e) for e in employees})
+
+    @writer
+    def replace_all(self, records: Dict[str, Dict[str, Any]]) -> int:
+        """Replace every employee with ``records`` keyed by user id."""
+        with self._session() as session, session.begin():
+            session.execute(delete(EmployeeRow))
+            for uid, record in records.items():
+                if isinstance(record, dict):
+                    self._put(session, str(uid), {
+                        k: _serialize(v) for k, v in record.items() if k != "id"})
+        return len(records)
@@ -1,13 +1,16 @@
 import json
 import os
+import threading
 from typing import List, Dict, Any, Optional
 
 from app.config import VACATIONS_FILE
 from app.utils.logger import log
+from app.data.async_repository import synchronized, writer
 
 
 class VacationRepository:
     def __init__(self, file_path: Optional[str] = None) -> None:
+        self._lock = threading.RLock()
         self._file = file_path or VACATIONS_FILE
         log(f"📂 Loading vacations from {self._file}")
         self._data: List[Dict[str, Any]] = self._load()
@@ -66,9 +69,11 @@ class VacationRepository:
         self._counter += 1
         return self._counter
 
+    @synchronized
     def list(self) -> List[Dict[str, Any]]:
         return list(self._data)
 
+    @writer
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if "id" not in data or any(
                 str(v.get("id")) == str(data["id"]) for v in self._data):
@@ -77,6 +82,7 @@ class VacationRepository:
         self._save()
         return data
 
+    @writer
     def update(self, vac_id: str,
                updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         for item in self._data:
@@ -87,6 +93,7 @@ class VacationRepository:
                 return item
         return None
 
+    @writer
     def delete(self, vac_id: str) -> None:
         self._data = [v for v in self._data if str(v.get("id")) != str(vac_id)]
         self._save()
@@ -0,0 +1,101 @@
+"""One-shot import of the JSON stores into the SQLite database.
+
+The import runs automatically the first time the ``sqlite`` backend is
+used and is recorded in ``storage_meta`` so it never runs twice. It can
+also be started by hand, e.g. to re-import after editing the JSON files::
+
+    python -m app.db.migrate --force
+"""
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import (
+    ADJUSTMENTS_FILE,
+    ADVANCE_REQUESTS_FILE,
+    MESSAGES_FILE,
+    VACATIONS_FILE,
+)
+from app.models import StorageMeta
+from app.utils.config import DATA_FILE
+from app.utils.logger import log
+
+MIGRATION_KEY = "json_import"
+
+
+def is_migrated(engine: Engine) -> bool:
+    with Session(engine) as session:
+        return session.get(StorageMeta, MIGRATION_KEY) is not None
+
+
+def migrate_json(
+    engine: Engine,
+    *,
+    users_file: Optional[str] = None,
+    payouts_file: Optional[str] = None,
+    vacations_file: Optional[str] = None,
+    adjustments_file: Optional[str] = None,
+    messages_file: Optional[str] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """Copy every JSON store into the database.
+
+    The JSON files are read through their repositories, so the payout
+    journal is replayed and legacy statuses are normalized on the way.
+    Each table is replaced in its own transaction and the migration is
+    marked done only after all of them succeeded, so an interrupted run
+    is simply repeated on the next start.
+    """
+    from app.data.adjustment_repository import AdjustmentRepository
+    from app.data.json_storage import JsonStorage
+    from app.data.message_repository import MessageRepository
+    from app.data.payout_repository import PayoutRepository
+    from app.data.sql_repository import (
+        SqlAdjustmentRepository,
+        SqlEmployeeRepository,
+        SqlMessageRepository,
+        SqlPayoutRepository,
+        SqlVacationRepository,
+    )
+    from app.data.vacation_repository import VacationRepository
+
+    if not force and is_migrated(engine):
+        return {}
+
+    log("📦 Importing JSON data into SQLite")
+    users = JsonStorage(users_file or DATA_FILE, delay=0).load() or {}
+    counts = {
+        "employees": SqlEmployeeRepository(engine).replace_all(users),
+        "payouts": SqlPayoutRepository(engine).replace_all(
+            PayoutRepository(payouts_file or ADVANCE_REQUESTS_FILE).load_all()),
+        "vacations": SqlVacationRepository(engine).replace_all(
+            VacationRepository(vacations_file or VACATIONS_FILE).list()),
+        "adjustments": SqlAdjustmentRepository(engine).replace_all(
+            AdjustmentRepository(adjustments_file or ADJUSTMENTS_FILE).list()),
+        "messages": SqlMessageRepository(engine).replace_all(
+            MessageRepository(messages_file or MESSAGES_FILE).list()),
+    }
+    with Session(engine) as session, session.begin():
+        session.merge(
+            StorageMeta(key=MIGRATION_KEY, value=datetime.now().isoformat()))
+    log(f"✅ Imported into SQLite: {counts}")
+    return counts
+
+
+def main(argv: list[str]) -> None:
+    from .session import get_engine
+
+    counts = migrate_json(get_engine(), force="--force" in argv)
+    if not counts:
+        print("Already migrated, use --force to import again")
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+"""SQLite engine for the ``sqlite`` storage backend."""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from app.config import DATABASE_FILE
+from .base_class import Base
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def create_sqlite_engine(path: str | Path) -> Engine:
+    """Create an engine for ``path`` and make sure the schema exists.
+
+    Every connection runs in WAL mode so the bot and the admin API can
+    read while one of them writes.
+    """
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        json_serializer=_dumps,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    import app.models  # noqa: F401  registers the tables on Base
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Return the process-wide engine for ``DATABASE_FILE``."""
+    return create_sqlite_engine(DATABASE_FILE)
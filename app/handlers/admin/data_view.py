@@ -1,12 +1,12 @@
-import os
-import pandas as pd
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from ...constants import UserStates
 from ...config import EXCEL_FILE
 from ...services.users import load_users_map
 from ...keyboards.reply_admin import get_admin_menu, get_month_keyboard, get_home_button
-from ...services.excel import load_data
+from ...services.excel import load_data, load_raw_sheet
+from ...services.render_cache import render_cache
+from ...services.render_executor import render_executor
 from ...services.report import generate_employee_report
 from ...utils.image import create_combined_table_image, create_schedule_image
 from ...utils.logger import log
@@ -102,6 +102,13 @@ async def handle_salary_admin(
     log(
         f"📌 [handle_salary_admin] Пользователь {user_id} запросил зарплату для '{employee_name}' за {month}"
     )
+    cache_key = render_cache.key("salary", employee_name, month)
+    if await render_cache.reply(update.message, cache_key):
+        log(f"✅ [handle_salary_admin] Отчёт отправлен из кэша: {employee_name}")
+        await update.message.reply_text(
+            "🏠 Возврат в главное меню...", reply_markup=get_admin_menu()
+        )
+        return ConversationHandler.END
     loading_message = await update.message.reply_text(
         "⏳ Загружаю данные о зарплате..."
     )
@@ -160,19 +167,19 @@ async def handle_salary_admin(
         log(f"❌ [handle_salary_admin] Ошибка генерации отчёта: {e}")
         await loading_message.edit_text(f"❌ Ошибка генерации отчёта: {e}")
         return
-    filename = create_combined_table_image(
-        report_tables, f"salary_report_admin_{user_id}.png"
-    )
-    if not filename or not os.path.exists(filename):
-        log(f"❌ [handle_salary_admin] Файл изображения не создан: {filename}")
+    image = await render_executor.try_run(
+        create_combined_table_image, report_tables)
+    if image is None:
+        log("❌ [handle_salary_admin] Изображение не создано")
         await loading_message.edit_text(
             "❌ Не удалось создать изображение отчёта."
         )
         return
-    log(f"✅ [handle_salary_admin] Файл изображения создан: {filename}")
+    log(
+        f"✅ [handle_salary_admin] Изображение создано: {
+            len(image)} байт")
     try:
-        with open(filename, "rb") as photo:
-            await update.message.reply_photo(photo=photo)
+        await render_cache.send(update.message, cache_key, image)
         log(
             f"✅ [handle_salary_admin] Изображение отправлено пользоателю {user_id}")
         try:
@@ -206,7 +213,7 @@ async def handle_schedule_admin(
         chat_id=update.message.chat_id, action="typing"
     )
     try:
-        data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+        data = load_raw_sheet(month)
         if data.shape[0] < 2 or data.shape[1] < 3:
             log(
                 f"❌ [handle_schedule_admin] Неверная структура данных для {month}: {
@@ -244,28 +251,25 @@ async def handle_schedule_admin(
         )
         return
     log(f"✅ [handle_schedule_admin] Сотрудник '{employee_name}' найден.")
-    filename = create_schedule_image(
-        data, employee_name, month, weekdays_row[2:33]
+    image = await render_executor.try_run(
+        create_schedule_image,
+        employee_data, employee_name, month, weekdays_row[2:33],
     )
-    log(
-        f"DEBUG [handle_schedule_admin] Результат create_schedule_image: {filename}"
-    )
-    if not filename or not os.path.exists(filename):
-        log(
-            f"❌ [handle_schedule_admin] Файл изображения не создан: {filename}"
-        )
+    if image is None:
+        log("❌ [handle_schedule_admin] Изображение не создано")
         await loading_message.edit_text(
             "❌ Не удалось создать изображение расписания."
         )
         return UserStates.SELECT_DATA_TYPE
-    log(f"✅ [handle_schedule_admin] Файл изображения создан: {filename}")
+    log(
+        f"✅ [handle_schedule_admin] Изображение создано: {
+            len(image)} байт")
     try:
-        with open(filename, "rb") as photo:
-            await update.message.reply_photo(
-                photo=photo,
-                caption="Расписание отправлено. Что дальше?",
-                reply_markup=get_home_button(),
-            )
+        await update.message.reply_photo(
+            photo=image,
+            caption="Расписание отправлено. Что дальше?",
+            reply_markup=get_home_button(),
+        )
         log(
             f"✅ [handle_schedule_admin] Расписание отправлено пользователю {user_id}")
         await loading_message.delete()
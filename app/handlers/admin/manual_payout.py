@@ -9,7 +9,7 @@ from telegram import (
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.error import BadRequest
 
-from ...services.users import load_users_map
+from ...services.users import get_user, load_users_map
 from ...keyboards.reply_admin import get_admin_menu
 from ...services.advance_requests import log_new_request
 from ...constants import ManualPayoutStates
@@ -90,8 +90,7 @@ async def manual_payout_method(
     method = update.message.text
     context.user_data["manual_payout"]["method"] = method
     data = context.user_data["manual_payout"]
-    users = load_users_map()
-    user = users.get(data["user_id"], {})
+    user = get_user(data["user_id"]) or {}
     data["phone"] = user.get("phone", "—")
     data["bank"] = user.get("bank", "—")
 
@@ -9,7 +9,7 @@ from ...config import (
     USERS_FILE,
     MAX_ADVANCE_AMOUNT_PER_MONTH,
 )
-from ...services.users import load_users_map, save_users, add_user, update_user, delete_user
+from ...services.users import get_user, update_user
 from ...services.advance_requests import load_advance_requests
 from ...keyboards.reply_user import get_cabinet_menu, get_main_menu
 from ...utils.logger import log
@@ -19,8 +19,7 @@ async def personal_cabinet(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = str(update.effective_user.id)
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await update.message.reply_text(
             "❌ Ваши данные не найдены. Обратитесь к администратору.",
@@ -39,8 +38,7 @@ async def view_user_info(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = str(update.effective_user.id)
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await update.message.reply_text(
             "❌ Ваши данные не найдены.", reply_markup=get_main_menu()
@@ -162,8 +160,8 @@ async def handle_edit_confirmation(
     if data.startswith("confirm_"):
         _, field, new_value = data.split("_", 2)
         user_id = str(query.from_user.id)
-        users = load_users_map()
-        if user_id not in users:
+        user = get_user(user_id)
+        if not user:
             await query.edit_message_text("❌ Ваши данные не найдены.", reply_markup=None)
             context.user_data.clear()
             await context.bot.send_message(
@@ -172,13 +170,12 @@ async def handle_edit_confirmation(
                 reply_markup=get_main_menu(),
             )
             return
-        users[user_id]["pending_change"] = {"field": field, "value": new_value}
-        save_users(users)
+        update_user(user_id, {"pending_change": {"field": field, "value": new_value}})
         log(
             f"DEBUG [handle_edit_confirmation] Сохранено изменение для {user_id}: {field} → {new_value}"
         )
         admin_message = (
-            f"🔔 Пользователь {users[user_id]['name']} хочет обновить данные:\n"
+            f"🔔 Пользователь {user['name']} хочет обновить данные:\n"
             f"Поле: {field}\n"
             f"Новое значение: {new_value}"
         )
@@ -212,25 +209,23 @@ async def handle_admin_change_response(
     data = query.data
     if data.startswith("approve_change_"):
         user_id = data.split("_")[-1]
-        users = load_users_map()
-        if user_id not in users:
+        user = get_user(user_id)
+        if not user:
             await query.edit_message_text("❌ Пользователь не найден.")
             return
-        pending_change = users[user_id].get("pending_change", {})
+        pending_change = user.get("pending_change", {})
         field = pending_change.get("field")
         new_value = pending_change.get("value")
         if not field or not new_value:
             await query.edit_message_text("❌ Данные для изменения не найдены.")
             return
-        old_value = users[user_id].get(field, "Не указано")
-        users[user_id][field] = new_value
-        del users[user_id]["pending_change"]
-        save_users(users)
+        old_value = user.get(field, "Не указано")
+        update_user(user_id, {field: new_value}, remove=("pending_change",))
         log(
             f"✅ [admin_change] Пользователь {user_id} обновил {field}: {old_value} → {new_value}"
         )
         await query.edit_message_text(
-            f"✅ Изменение {field} для {users[user_id]['name']} одобрено: {new_value}"
+            f"✅ Изменение {field} для {user['name']} одобрено: {new_value}"
         )
         await context.bot.send_message(
             chat_id=user_id,
@@ -239,20 +234,19 @@ async def handle_admin_change_response(
         )
     elif data.startswith("reject_change_"):
         user_id = data.split("_")[-1]
-        users = load_users_map()
-        if user_id not in users:
+        user = get_user(user_id)
+        if not user:
             await query.edit_message_text("❌ Пользователь не найден.")
             return
-        pending_change = users[user_id].get("pending_change", {})
+        pending_change = user.get("pending_change", {})
         field = pending_change.get("field")
         new_value = pending_change.get("value")
-        if "pending_change" in users[user_id]:
-            del users[user_id]["pending_change"]
-            save_users(users)
+        if "pending_change" in user:
+            update_user(user_id, {}, remove=("pending_change",))
         log(
             f"❌ [admin_change] Изменение {field} для {user_id} отклонено: {new_value}")
         await query.edit_message_text(
-            f"❌ Изменение {field} для {users[user_id]['name']} отклонено."
+            f"❌ Изменение {field} для {user['name']} отклонено."
         )
         await context.bot.send_message(
             chat_id=user_id,
@@ -1,7 +1,7 @@
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 from ...utils.logger import log
-from ...services.users import load_users_map
+from ...services.users import get_user
 from ...keyboards.reply_user import get_main_menu
 
 
@@ -9,8 +9,7 @@ async def get_user_info_user(update: Update,
                              context: ContextTypes.DEFAULT_TYPE) -> None:
     """Выводит главное меню сотрудника."""
     user_id = str(update.effective_user.id)
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         if update.message:
             await update.message.reply_text(
@@ -1,13 +1,12 @@
-import os
-import pandas as pd
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
-from ...config import EXCEL_FILE
-from ...services.users import load_users_map
+from ...services.render_cache import render_cache
+from ...services.render_executor import render_executor
+from ...services.users import get_user
 from ...keyboards.reply_user import get_month_keyboard_user, get_main_menu
 from ...utils.image import create_schedule_image, create_combined_table_image
-from ...services.excel import load_data
+from ...services.excel import load_data, load_raw_sheet
 from ...services.report import generate_employee_report
 from ...utils.logger import log
 
@@ -71,8 +70,7 @@ async def handle_selected_month_user(
     loading_message = await update.message.reply_text("⏳ Загружаю данные...")
     await context.bot.send_chat_action(chat_id=update.message.chat_id, action="typing")
 
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await loading_message.edit_text(
             "❌ Информация о пользователе не найдена. Обратитесь к администратору.",
@@ -84,6 +82,19 @@ async def handle_selected_month_user(
 
     requested_data = context.user_data.get("requested_data", "")
     if requested_data == "salary":
+        cache_key = render_cache.key("salary", user_name, month)
+        if await render_cache.reply(
+            update.message,
+            cache_key,
+            caption="Ваш отчет о зарплате",
+            reply_markup=get_main_menu(),
+        ):
+            try:
+                await loading_message.delete()
+            except Exception as e:
+                log(
+                    f"⚠️ [handle_selected_month_user] Ошибка удаления сообщения: {e}")
+            return
         try:
             data = load_data(sheet_name=month)
             if data is None or "ИМЯ" not in data.columns:
@@ -114,20 +125,21 @@ async def handle_selected_month_user(
         row_index = employee_data.index[0]
         report_tables = generate_employee_report(
             user_name, month, data, row_index)
-        filename = create_combined_table_image(
-            report_tables, f"salary_report_{user_id}.png")
-        if filename and os.path.exists(filename):
+        image = await render_executor.try_run(
+            create_combined_table_image, report_tables)
+        if image is not None:
             try:
                 await loading_message.delete()
             except Exception as e:
                 log(
                     f"⚠️ [handle_selected_month_user] Ошибка удаления сообщения: {e}")
-            with open(filename, "rb") as photo:
-                await update.message.reply_photo(
-                    photo=photo,
-                    caption="Ваш отчет о зарплате",
-                    reply_markup=get_main_menu(),
-                )
+            await render_cache.send(
+                update.message,
+                cache_key,
+                image,
+                caption="Ваш отчет о зарплате",
+                reply_markup=get_main_menu(),
+            )
         else:
             await loading_message.edit_text(
                 "❌ Не удалось создать изображение отчёта.",
@@ -135,7 +147,7 @@ async def handle_selected_month_user(
             )
     elif requested_data == "schedule":
         try:
-            raw_data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+            raw_data = load_raw_sheet(month)
             if raw_data.shape[0] < 2 or raw_data.shape[1] < 3:
                 await loading_message.edit_text(
                     f"❌ Неверная структура данных в Excel для {month}.",
@@ -161,20 +173,20 @@ async def handle_selected_month_user(
                 reply_markup=get_main_menu(),
             )
             return
-        filename = create_schedule_image(
-            raw_data, user_name, month, weekdays_row[2:33])
-        if filename and os.path.exists(filename):
+        image = await render_executor.try_run(
+            create_schedule_image,
+            employee_data, user_name, month, weekdays_row[2:33])
+        if image is not None:
             try:
                 await loading_message.delete()
             except Exception as e:
                 log(
                     f"⚠️ [handle_selected_month_user] Ошибка удаления сообщения: {e}")
-            with open(filename, "rb") as photo:
-                await update.message.reply_photo(
-                    photo=photo,
-                    caption="Ваше расписание",
-                    reply_markup=get_main_menu(),
-                )
+            await update.message.reply_photo(
+                photo=image,
+                caption="Ваше расписание",
+                reply_markup=get_main_menu(),
+            )
         else:
             await loading_message.edit_text(
                 "❌ Не удалось создать изображение расписания.",
@@ -192,8 +204,7 @@ async def handle_schedule_request(
         context: ContextTypes.DEFAULT_TYPE):
     """Отправляет расписание на текущий выбранный месяц."""
     user_id = update.effective_user.id
-    users = load_users_map()
-    user_info = users.get(str(user_id))
+    user_info = get_user(user_id)
     if not user_info or not user_info.get("name"):
         await update.message.reply_text(
             "❌ Ваши данные не найдены. Обратитесь к администратору."
@@ -207,7 +218,7 @@ async def handle_schedule_request(
     loading_message = await update.message.reply_text("⏳ Загружаю расписание...")
     await context.bot.send_chat_action(chat_id=update.message.chat_id, action="typing")
     try:
-        data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+        data = load_raw_sheet(month)
         if data.shape[0] < 2 or data.shape[1] < 3:
             await loading_message.edit_text("❌ Неверная структура данных в Excel.")
             return
@@ -227,14 +238,14 @@ async def handle_schedule_request(
     if employee_data.empty:
         await loading_message.edit_text("❌ Нет данных для сотрудника. Проверьте совпадение имени.")
         return
-    filename = create_schedule_image(
-        data, original_employee_name, month, weekdays_row[2:33])
-    if not filename or not os.path.exists(filename):
+    image = await render_executor.try_run(
+        create_schedule_image,
+        employee_data, original_employee_name, month, weekdays_row[2:33])
+    if image is None:
         await loading_message.edit_text("❌ Не удалось создать изображение расписания.")
         return
     try:
-        with open(filename, "rb") as photo:
-            await update.message.reply_photo(photo=photo)
+        await update.message.reply_photo(photo=image)
         await loading_message.delete()
     except Exception as e:
         log(f"❌ [handle_schedule_request] Ошибка отправки изображения: {e}")
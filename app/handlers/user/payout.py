@@ -6,7 +6,7 @@ from ...config import (
     MAX_ADVANCE_AMOUNT_PER_MONTH,
     CARD_DISPATCH_CHAT_ID,
 )
-from ...services.users import load_users_map, save_users
+from ...services.users import get_user, update_user
 from ...services.advance_requests import (
     log_new_request,
     check_pending_request,
@@ -22,8 +22,7 @@ async def request_payout_user(update: Update,
                               context: ContextTypes.DEFAULT_TYPE) -> int:
     user_id = str(update.effective_user.id)
     log(f"DEBUG [request_payout_user] Запрос выплаты от user_id: {user_id}")
-    users = load_users_map()
-    if user_id not in users:
+    if get_user(user_id) is None:
         if update.message:
             await update.message.reply_text(
                 "❌ Вы не зарегистрированы.", reply_markup=get_main_menu()
@@ -132,8 +131,7 @@ async def payout_method_user(update: Update,
     log(
         f"DEBUG [payout_method_user] Выбран метод: {method} для user_id: {user_id}")
     if method == "💳 На карту":
-        users = load_users_map()
-        user_info = users.get(str(user_id), {})
+        user_info = get_user(user_id) or {}
         name = user_info.get("name", "—")
         phone = user_info.get("phone", "—")
         bank = user_info.get("bank", "—")
@@ -176,8 +174,7 @@ async def handle_card_confirmation(
         return ConversationHandler.END
     card_info = context.user_data.get("card_temp")
     if not card_info:
-        users = load_users_map()
-        user_info = users.get(user_id, {})
+        user_info = get_user(user_id) or {}
         card_info = {
             "name": user_info.get("name", "—"),
             "phone": user_info.get("phone", "—"),
@@ -186,12 +183,7 @@ async def handle_card_confirmation(
     name = card_info.get("name")
     phone = card_info.get("phone")
     bank = card_info.get("bank")
-    users = load_users_map()
-    if user_id in users:
-        users[user_id]["name"] = name
-        users[user_id]["phone"] = phone
-        users[user_id]["bank"] = bank
-        save_users(users)
+    update_user(user_id, {"name": name, "phone": phone, "bank": bank})
     try:
         log(f"DEBUG [handle_card_confirmation] Логируем запрос для {user_id}")
         log_new_request(
@@ -279,8 +271,7 @@ async def confirm_payout_user(update: Update,
         )
         context.user_data.clear()
         return ConversationHandler.END
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         log(f"❌ [confirm_payout_user] Пользователь {user_id} не найден")
         await message.reply_text(
@@ -1,4 +1,3 @@
-import os
 import pandas as pd
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -6,7 +5,9 @@ from typing import Optional
 from ...utils.image import create_combined_table_image
 from ...services.report import generate_employee_report
 from ...services.excel import load_data
-from ...services.users import load_users_map
+from ...services.render_cache import render_cache
+from ...services.render_executor import render_executor
+from ...services.users import get_user
 from ...utils.logger import log
 
 
@@ -44,6 +45,21 @@ async def handle_salary_request(
         )
         return
 
+    user = get_user(user_id)
+    if not user:
+        await update.message.reply_text(
+            "❌ Информация о пользователе не найдена. Обратитесь к администратору."
+        )
+        return
+
+    user_name: str = user.get("name")
+    log(f"✅ [handle_salary_request] Пользователь найден: {user_name}")
+
+    # тот же отчёт по той же версии файла уже отправлялся
+    cache_key = render_cache.key("salary", user_name, month)
+    if await render_cache.reply(update.message, cache_key):
+        return
+
     loading_message = await update.message.reply_text(
         "⏳ Подождите, считаю денежки..."
     )
@@ -59,17 +75,6 @@ async def handle_salary_request(
         )
         return
 
-    users = load_users_map()
-    user = users.get(user_id)
-    if not user:
-        await loading_message.edit_text(
-            "❌ Информация о пользователе не найдена. Обратитесь к администратору."
-        )
-        return
-
-    user_name: str = user.get("name")
-    log(f"✅ [handle_salary_request] Пользователь найден: {user_name}")
-
     # Фильтрация данных по имени сотрудника
     data["ИМЯ"] = data["ИМЯ"].astype(str).str.strip()
     employee_data = data[data["ИМЯ"] == user_name]
@@ -86,17 +91,15 @@ async def handle_salary_request(
     report_tables = generate_employee_report(user_name, month, data, row_index)
 
     # Создание изображения отчёта
-    filename = create_combined_table_image(
-        report_tables, f"salary_report_{user_id}.png"
-    )
+    image = await render_executor.try_run(
+        create_combined_table_image, report_tables)
 
-    if filename and os.path.exists(filename):
+    if image is not None:
         try:
             await loading_message.delete()
         except Exception as e:
             log(f"⚠️ Ошибка удаления сообщения: {e}")
-        with open(filename, "rb") as photo:
-            await update.message.reply_photo(photo=photo)
+        await render_cache.send(update.message, cache_key, image)
     else:
         await loading_message.edit_text(
             "❌ Не удалось сгенерировать изображение отчёта."
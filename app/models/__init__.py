@@ -1,5 +1,19 @@
 from .employee import Employee
 from .user import User
 from .payout import PayoutRequest
+from .payout_record import PayoutRecord
+from .vacation import VacationRecord
+from .adjustment import AdjustmentRecord
+from .message import MessageRecord
+from .storage_meta import StorageMeta
 
-__all__ = ["User", "PayoutRequest", "Employee"]
+__all__ = [
+    "User",
+    "PayoutRequest",
+    "Employee",
+    "PayoutRecord",
+    "VacationRecord",
+    "AdjustmentRecord",
+    "MessageRecord",
+    "StorageMeta",
+]
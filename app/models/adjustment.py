@@ -0,0 +1,13 @@
+from sqlalchemy import JSON, Column, Integer, String
+
+from app.db.base_class import Base
+
+
+class AdjustmentRecord(Base):
+    __tablename__ = "adjustments"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=True, index=True)
+    status = Column(String, nullable=True, index=True)
+    date = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, String, Text
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
@@ -6,13 +6,19 @@ from app.db.base_class import Base
 class Employee(Base):
     __tablename__ = "employees"
 
-    id = Column(Integer, primary_key=True, index=True)
-    full_name = Column(String, nullable=False)
-    phone = Column(String, nullable=False)
-    card_number = Column(String, nullable=False)
-    bank = Column(String, nullable=False)
+    # Telegram user id, kept as text like the keys of user.json
+    id = Column(String, primary_key=True, index=True)
+    name = Column(String, nullable=False, default="", index=True)
+    full_name = Column(String, nullable=False, default="")
+    phone = Column(String, nullable=False, default="")
+    position = Column(String, nullable=False, default="")
+    is_admin = Column(Boolean, nullable=False, default=False)
+    card_number = Column(String, nullable=False, default="")
+    bank = Column(String, nullable=False, default="")
     birthdate = Column(Date, nullable=True)
     note = Column(Text, nullable=True)
     photo_url = Column(String, nullable=True)
-    status = Column(String, nullable=False, default="active")
+    status = Column(String, nullable=False, default="active", index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # full record as stored in user.json, including keys without a column
+    data = Column(JSON, nullable=False, default=dict)
@@ -0,0 +1,14 @@
+from sqlalchemy import JSON, Column, Integer, String
+
+from app.db.base_class import Base
+
+
+class MessageRecord(Base):
+    __tablename__ = "messages"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=True, index=True)
+    message_id = Column(Integer, nullable=True)
+    status = Column(String, nullable=True, index=True)
+    timestamp = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
@@ -0,0 +1,17 @@
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from app.db.base_class import Base
+
+
+class PayoutRecord(Base):
+    """Row of the payouts table used by the SQLite storage backend."""
+
+    __tablename__ = "payouts"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=True, index=True)
+    payout_type = Column(String, nullable=True)
+    method = Column(String, nullable=True)
+    timestamp = Column(DateTime, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
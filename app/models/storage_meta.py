@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String
+
+from app.db.base_class import Base
+
+
+class StorageMeta(Base):
+    """Key/value markers of the SQLite store, e.g. completed migrations."""
+
+    __tablename__ = "storage_meta"
+
+    key = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
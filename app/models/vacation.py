@@ -0,0 +1,12 @@
+from sqlalchemy import JSON, Column, Integer, String
+
+from app.db.base_class import Base
+
+
+class VacationRecord(Base):
+    __tablename__ = "vacations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String, nullable=True, index=True)
+    start_date = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
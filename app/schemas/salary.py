@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -24,3 +24,12 @@ class SalaryRow(BaseModel):
     advance: float = 0.0
     final_amount: float = 0.0
     comment: Optional[str] = None
+
+
+class SalarySeries(BaseModel):
+    """Salary rows of one employee across the months of the workbook."""
+
+    employee_id: str
+    name: str
+    rows: List[SalaryRow] = []
+    totals: Dict[str, float] = {}
@@ -8,3 +8,12 @@ class SchedulePointOut(BaseModel):
     point: str
     short: str
     employee: str
+
+
+class ScheduleAssignmentOut(BaseModel):
+    """Point an employee works at on a given date."""
+
+    date: str
+    point: str
+    short: str
+    employee: str
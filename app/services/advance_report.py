@@ -1,10 +1,10 @@
-from datetime import datetime
+from datetime import datetime, time
 from typing import Iterable, Optional
 
 import pandas as pd
 
 
-from .advance_requests import load_advance_requests
+from .advance_requests import list_requests_with_timestamps
 
 
 def dataframe_to_markdown(df: pd.DataFrame) -> str:
@@ -55,30 +55,26 @@ def generate_advance_report(
     statuses: Optional[Iterable[str]] = None,
 ) -> pd.DataFrame:
     """Возвращает DataFrame с запросами аванса за указанный период и статусы."""
-    requests = load_advance_requests()
+    requests = list_requests_with_timestamps(
+        payout_type="Аванс",
+        from_date=datetime.combine(start_date, time.min).isoformat(),
+        to_date=datetime.combine(end_date, time.max).isoformat(),
+    )
     rows = []
-    for req in requests:
-        if req.get("payout_type") != "Аванс":
-            continue
-        ts = req.get("timestamp")
-        if not ts:
+    for req, created in requests:
+        if created is None:
             continue
-        try:
-            dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").date()
-        except Exception:
+        if statuses and req.get("status") not in statuses:
             continue
-        if start_date <= dt <= end_date:
-            if statuses and req.get("status") not in statuses:
-                continue
-            rows.append(
-                {
-                    "Дата": dt.strftime("%Y-%m-%d"),
-                    "Сотрудник": req.get("name", "—"),
-                    "Сумма": req.get("amount", 0),
-                    "Метод": req.get("method", "—"),
-                    "Статус": req.get("status", "—"),
-                }
-            )
+        rows.append(
+            {
+                "Дата": created.strftime("%Y-%m-%d"),
+                "Сотрудник": req.get("name", "—"),
+                "Сумма": req.get("amount", 0),
+                "Метод": req.get("method", "—"),
+                "Статус": req.get("status", "—"),
+            }
+        )
     df = pd.DataFrame(
         rows, columns=["Дата", "Сотрудник", "Сумма", "Метод", "Статус"]
     )
@@ -1,12 +1,12 @@
 """Payout request helpers using the local repository."""
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 
-from app.data.payout_repository import PayoutRepository
+from app.data.registry import get_payout_repository
 from app.schemas.payout import Payout
 from ..utils.logger import log
 
-_repo = PayoutRepository()
+_repo = get_payout_repository()
 
 STATUS_TRANSLATIONS = {
     "approved": "Одобрено",
@@ -17,13 +17,24 @@ STATUS_TRANSLATIONS = {
 
 
 def load_advance_requests() -> List[Dict[str, Any]]:
-    path = _repo._file
+    path = _repo.location
     log(f"📂 Загрузка заявок из: {path}")
     data = _repo.load_all()
     log(f"✅ Загружено заявок: {len(data)}")
     return data
 
 
+def list_requests_with_timestamps(
+    **filters: Any,
+) -> List[Tuple[Dict[str, Any], Optional[datetime]]]:
+    """Return filtered requests paired with their pre-parsed timestamps."""
+    return _repo.list_with_timestamps(**filters)
+
+
+def request_timestamp(request: Dict[str, Any]) -> Optional[datetime]:
+    return _repo.timestamp_of(request)
+
+
 def save_advance_requests(_requests_list: List[Dict[str, Any]]) -> None:
     log("⚠️ save_advance_requests is deprecated when using repository")
 
@@ -1,73 +1,139 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
 from ..config import EXCEL_FILE
-from ..core.constants import MONTHS_RU
 from ..utils.logger import log
+from .analytics_cube import DIMENSIONS, MEASURES, dimensions, get_cube
+from .salary_snapshot import month_index
+from .workbook_cache import fingerprint, sheet_fingerprints, workbook_cache
+
+SALES_COLUMNS = {"repair": "Ремонт", "cosmetics": "Косметика"}
+
+
+def _empty_totals() -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for key in SALES_COLUMNS:
+        totals[f"{key}_sum"] = 0
+        totals[f"{key}_count"] = 0
+    return totals
+
+
+def aggregate_sheet(df: pd.DataFrame) -> Dict[str, float]:
+    """Return sums and non-zero counts of the sales columns of one sheet."""
+    totals = _empty_totals()
+    cols = {str(c).strip(): c for c in df.columns}
+    for key, title in SALES_COLUMNS.items():
+        if title not in cols:
+            continue
+        series = pd.to_numeric(df[cols[title]], errors="coerce").fillna(0)
+        totals[f"{key}_sum"] = float(series.sum())
+        totals[f"{key}_count"] = int((series != 0).sum())
+    return totals
 
 
 class AnalyticsService:
-    """Load sales analytics from the salary Excel workbook."""
+    """Load sales analytics from the salary Excel workbook.
+
+    Totals are kept per month sheet together with the sheet's content
+    fingerprint. When the workbook changes on disk only the sheets whose
+    fingerprint differs are read again; the others keep their totals.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path or EXCEL_FILE
+        self._lock = threading.Lock()
         self._data: Optional[dict] = None
         self._updated_at: Optional[datetime] = None
+        self._workbook: Optional[tuple] = None
+        self._sheets: Dict[str, Tuple[Any, Dict[str, float]]] = {}
+
+    def is_stale(self) -> bool:
+        """Whether the workbook changed since the totals were computed."""
+        return self._data is None or fingerprint(self._path) != self._workbook
 
     def _collect_sales(self) -> dict:
-        try:
-            xls = pd.ExcelFile(EXCEL_FILE)
-        except Exception as exc:
-            log(f"❌ Failed to read Excel: {exc}")
-            return {
-                "repair_sum": 0,
-                "repair_count": 0,
-                "cosmetics_sum": 0,
-                "cosmetics_count": 0,
-                "updated_at": datetime.utcnow().isoformat(),
-            }
+        with self._lock:
+            current = fingerprint(self._path)
+            if current is None:
+                log(f"❌ Failed to read Excel: {self._path} not found")
+                return {
+                    **_empty_totals(),
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+            if current == self._workbook and self._data is not None:
+                return self._data
 
-        repair_sum = repair_count = 0
-        cosmetics_sum = cosmetics_count = 0
-        months = [m.upper() for m in MONTHS_RU]
-        for sheet in xls.sheet_names:
-            name = sheet.split()[0].upper()
-            if name not in months:
-                continue
             try:
-                df = pd.read_excel(xls, sheet_name=sheet, header=1)
-            except Exception:
-                continue
-            cols = {str(c).strip(): c for c in df.columns}
-            if "Ремонт" in cols:
-                col = cols["Ремонт"]
-                series = pd.to_numeric(df[col], errors="coerce").fillna(0)
-                repair_sum += series.sum()
-                repair_count += (series != 0).sum()
-            if "Косметика" in cols:
-                col = cols["Косметика"]
-                series = pd.to_numeric(df[col], errors="coerce").fillna(0)
-                cosmetics_sum += series.sum()
-                cosmetics_count += (series != 0).sum()
-
-        self._updated_at = datetime.utcnow()
-        data = {
-            "repair_sum": int(repair_sum),
-            "repair_count": int(repair_count),
-            "cosmetics_sum": int(cosmetics_sum),
-            "cosmetics_count": int(cosmetics_count),
-            "updated_at": self._updated_at.isoformat(),
-        }
-        self._data = data
-        return data
+                sheets = workbook_cache.sheet_names(self._path) or []
+            except Exception as exc:
+                log(f"❌ Failed to read Excel: {exc}")
+                sheets = []
+            # without per-sheet fingerprints every sheet follows the file
+            hashes = sheet_fingerprints(self._path)
+            partials: Dict[str, Tuple[Any, Dict[str, float]]] = {}
+            changed = 0
+            for sheet in sheets:
+                if month_index(sheet) is None:
+                    continue
+                key = hashes.get(sheet, current)
+                cached = self._sheets.get(sheet)
+                if cached is not None and cached[0] == key:
+                    partials[sheet] = cached
+                    continue
+                try:
+                    df = workbook_cache.sheet(self._path, sheet, header=1)
+                except Exception:
+                    continue
+                partials[sheet] = (key, aggregate_sheet(df))
+                changed += 1
+            if changed:
+                log(f"📊 Sales re-aggregated for {changed}/{len(partials)} sheets")
+
+            totals = _empty_totals()
+            for _, part in partials.values():
+                for name, value in part.items():
+                    totals[name] += value
+            self._sheets = partials
+            self._workbook = current
+            self._updated_at = datetime.utcnow()
+            self._data = {
+                **{name: int(value) for name, value in totals.items()},
+                "updated_at": self._updated_at.isoformat(),
+            }
+            return self._data
 
     async def get_sales(self) -> dict:
-        if self._data is None:
-            return self._collect_sales()
+        if self.is_stale():
+            return await asyncio.to_thread(self._collect_sales)
         return self._data
 
     async def refresh_sales(self) -> dict:
-        return self._collect_sales()
+        with self._lock:
+            self._workbook = None
+        return await asyncio.to_thread(self._collect_sales)
+
+    async def get_cube(
+        self,
+        employee: Optional[List[str]] = None,
+        month: Optional[List[str]] = None,
+        category: Optional[List[str]] = None,
+        group_by: Sequence[str] = DIMENSIONS,
+    ) -> dict:
+        """Slice of the employee × month × category sales cube."""
+        keys = dimensions(group_by)
+        cube = await asyncio.to_thread(get_cube)
+        if cube is None:
+            return {"group_by": keys, "measures": list(MEASURES),
+                    "members": {}, "rows": []}
+        return {
+            "group_by": keys,
+            "measures": list(MEASURES),
+            "members": cube.members(),
+            "rows": cube.query(employee, month, category, keys),
+        }
@@ -0,0 +1,157 @@
+"""Employee × month × category aggregates of the salary workbook.
+
+The cube is built from the month snapshots (:mod:`salary_snapshot`) once
+per workbook version: every sales column of every month is stacked into a
+single long frame of non-zero amounts, and all measures are computed with
+one ``groupby``. Queries slice and roll up that frame in memory, so
+drilling down never touches the Excel file again.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import EXCEL_FILE, SALARY_YEAR_WORKERS
+from .salary_snapshot import SalarySnapshot, get_year_snapshots
+from .workbook_cache import workbook_cache
+
+# SalaryRow field -> category shown in the dashboard
+CATEGORIES: Dict[str, str] = {
+    "salary_repair": "Ремонт",
+    "salary_cosmetics": "Косметика",
+    "salary_shoes": "Обувь",
+    "salary_accessories": "Аксессуары",
+    "salary_keys": "Ключи",
+    "salary_slippers": "Тапки",
+    "salary_workshop": "Цех",
+    "salary_bonus": "Бонус",
+}
+DIMENSIONS = ("employee", "month", "category")
+PERCENTILES = (0.5, 0.9)
+MEASURES = ("sum", "count", "mean") + tuple(
+    f"p{int(q * 100)}" for q in PERCENTILES)
+
+
+def dimensions(group_by: Sequence[str]) -> List[str]:
+    """Return ``group_by`` in cube order, rejecting unknown dimensions."""
+    unknown = set(group_by) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+    return [d for d in DIMENSIONS if d in group_by]
+
+
+def _measures(facts: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """Aggregate ``facts`` by ``keys``; no keys gives a single grand total."""
+    if not keys:
+        values = facts["value"]
+        row = {"sum": values.sum(), "count": len(values),
+               "mean": values.mean() if len(values) else 0.0}
+        for q, name in zip(PERCENTILES, MEASURES[3:]):
+            row[name] = values.quantile(q) if len(values) else 0.0
+        return pd.DataFrame([row])
+    if facts.empty:
+        return pd.DataFrame(columns=list(keys) + list(MEASURES))
+    grouped = facts.groupby(list(keys), observed=True, sort=True)["value"]
+    result = grouped.agg(["sum", "count", "mean"])
+    quantiles = grouped.quantile(list(PERCENTILES)).unstack()
+    quantiles.columns = list(MEASURES[3:])
+    return result.join(quantiles).reset_index()
+
+
+@dataclass(frozen=True)
+class SalesCube:
+    """Non-zero sales amounts with measures precomputed per cube cell."""
+
+    facts: pd.DataFrame
+    cells: pd.DataFrame
+    months: Tuple[str, ...]
+    employees: Tuple[str, ...]
+
+    def members(self) -> Dict[str, List[str]]:
+        return {
+            "employee": list(self.employees),
+            "month": list(self.months),
+            "category": list(CATEGORIES.values()),
+        }
+
+    def query(
+        self,
+        employee: Optional[Iterable[str]] = None,
+        month: Optional[Iterable[str]] = None,
+        category: Optional[Iterable[str]] = None,
+        group_by: Sequence[str] = DIMENSIONS,
+    ) -> List[dict]:
+        """Return measures of the slice grouped by ``group_by``.
+
+        Filters take several values each; categories may be given by label
+        ("Ремонт") or by salary field ("salary_repair").
+        """
+        keys = dimensions(group_by)
+        filters = {
+            "employee": employee,
+            "month": [m.upper() for m in month] if month else None,
+            "category": [CATEGORIES.get(c, c) for c in category]
+            if category else None,
+        }
+        # full-detail queries are served from the precomputed cells
+        source = self.cells if len(keys) == len(DIMENSIONS) else self.facts
+        mask = np.ones(len(source), dtype=bool)
+        for dim, values in filters.items():
+            if values:
+                mask &= source[dim].isin(list(values)).to_numpy()
+        sliced = source[mask]
+        if source is not self.cells:
+            sliced = _measures(sliced, keys)
+        sliced = sliced.round({m: 2 for m in MEASURES if m != "count"})
+        rows = sliced[keys + list(MEASURES)].to_dict("records")
+        for row in rows:
+            for dim in keys:
+                row[dim] = str(row[dim])
+            row["count"] = int(row["count"])
+        return rows
+
+
+def build_cube(snapshots: Sequence[SalarySnapshot]) -> SalesCube:
+    """Stack the sales columns of ``snapshots`` and aggregate them."""
+    fields = list(CATEGORIES)
+    labels = np.array(list(CATEGORIES.values()), dtype=object)
+    parts = []
+    for snapshot in snapshots:
+        if not len(snapshot):
+            continue
+        values = np.column_stack([snapshot.columns[f] for f in fields])
+        parts.append(pd.DataFrame({
+            "employee": np.repeat(
+                np.array(snapshot.names, dtype=object), len(fields)),
+            "month": snapshot.month,
+            "category": np.tile(labels, len(snapshot)),
+            "value": values.ravel(),
+        }))
+    if parts:
+        facts = pd.concat(parts, ignore_index=True)
+    else:
+        facts = pd.DataFrame({"employee": [], "month": [], "category": [],
+                              "value": np.array([], dtype="float64")})
+    facts = facts[facts["value"] != 0].reset_index(drop=True)
+
+    months = tuple(dict.fromkeys(s.month for s in snapshots))
+    # categoricals keep calendar and column order when grouping
+    facts["month"] = pd.Categorical(facts["month"], categories=months)
+    facts["category"] = pd.Categorical(facts["category"], categories=labels)
+    facts["employee"] = facts["employee"].astype(str)
+    return SalesCube(
+        facts=facts,
+        cells=_measures(facts, DIMENSIONS),
+        months=months,
+        employees=tuple(sorted(facts["employee"].unique())),
+    )
+
+
+def get_cube() -> Optional[SalesCube]:
+    """Return the cube of the current workbook version."""
+    return workbook_cache.derived(
+        EXCEL_FILE, "analytics:cube",
+        lambda _path: build_cube(get_year_snapshots(SALARY_YEAR_WORKERS)))
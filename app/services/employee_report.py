@@ -33,109 +33,113 @@ class EmployeeReportService:
         self.payout_repo = payout_repo
         self.vacation_repo = vacation_repo
 
-    def _parse_ts(self, ts: str) -> datetime | None:
-        try:
-            return datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return None
-
-    def generate_profile_pdf(self, employee_id: str) -> bytes:
-        employees = self.employee_repo.list_employees()
-        employee = next((e for e in employees if str(e.id) == str(employee_id)), None)
+    def profile_data(self, employee_id: str) -> tuple:
+        """Employee, recent payouts and vacations shown in the profile."""
+        employee = self.employee_repo.get_by_id(str(employee_id))
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found")
 
         cutoff = datetime.now() - relativedelta(months=3)
+        # the repository filters on its pre-parsed timestamp index
         payouts = [
             p
-            for p in self.payout_repo.list(employee_id=str(employee_id))
-            if (self._parse_ts(p.get("timestamp")) or datetime.min) >= cutoff
+            for p in self.payout_repo.list(
+                employee_id=str(employee_id), from_date=cutoff.isoformat())
+            if self.payout_repo.timestamp_of(p) is not None
         ]
         vacations = [
             v
             for v in self.vacation_repo.list()
             if str(v.get("employee_id")) == str(employee_id)
         ]
+        return employee, payouts, vacations
 
-        status_counts: dict[str, int] = {}
-        for p in payouts:
-            status = p.get("status", "")
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=A4)
-
-        from app.config import FONT_PATH
-        font = FONT_PATH
-        bold_font = FONT_PATH.replace(".ttf", "-Bold.ttf")
-        if os.path.exists(font):
-            pdfmetrics.registerFont(TTFont("Arial", font))
-            if os.path.exists(bold_font):
-                pdfmetrics.registerFont(TTFont("Arial-Bold", bold_font))
-            font_name = "Arial"
-            bold_name = "Arial-Bold" if os.path.exists(bold_font) else "Arial"
-        else:
-            log(f"⚠️ Font not found: {font}. Using built-in Helvetica")
-            font_name = "Helvetica"
-            bold_name = "Helvetica-Bold"
-
-        y = 800
-        pdf.setFont(bold_name, 16)
-        pdf.drawString(40, y, "👤 PERSONAL DETAILS")
-        y -= 24
-        pdf.setFont(font_name, 12)
-        pdf.drawString(50, y, f"Full name: {employee.full_name}")
+    def generate_profile_pdf(self, employee_id: str) -> bytes:
+        return render_profile_pdf(*self.profile_data(employee_id))
+
+
+def render_profile_pdf(employee, payouts: List[dict],
+                       vacations: List[dict]) -> bytes:
+    """Draw the profile PDF; takes plain data so it can run in a worker."""
+    status_counts: dict[str, int] = {}
+    for p in payouts:
+        status = p.get("status", "")
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+
+    from app.config import FONT_PATH
+    font = FONT_PATH
+    bold_font = FONT_PATH.replace(".ttf", "-Bold.ttf")
+    if os.path.exists(font):
+        pdfmetrics.registerFont(TTFont("Arial", font))
+        if os.path.exists(bold_font):
+            pdfmetrics.registerFont(TTFont("Arial-Bold", bold_font))
+        font_name = "Arial"
+        bold_name = "Arial-Bold" if os.path.exists(bold_font) else "Arial"
+    else:
+        log(f"⚠️ Font not found: {font}. Using built-in Helvetica")
+        font_name = "Helvetica"
+        bold_name = "Helvetica-Bold"
+
+    y = 800
+    pdf.setFont(bold_name, 16)
+    pdf.drawString(40, y, "👤 PERSONAL DETAILS")
+    y -= 24
+    pdf.setFont(font_name, 12)
+    pdf.drawString(50, y, f"Full name: {employee.full_name}")
+    y -= 15
+    pdf.drawString(50, y, f"Telegram ID: {employee.id}")
+    y -= 15
+    if employee.birthdate:
+        pdf.drawString(50, y, f"Birthday: {employee.birthdate}")
+        y -= 15
+    pdf.drawString(50, y, f"Code: {employee.name}")
+    y -= 30
+
+    pdf.setFont(bold_name, 14)
+    pdf.drawString(40, y, "💸 PAYOUT HISTORY")
+    y -= 20
+    pdf.setFont(font_name, 12)
+    for p in payouts:
+        line = (
+            f"{p.get('timestamp','')} | {p.get('amount')} ₽ | "
+            f"{p.get('payout_type','')} | {p.get('method','')} | {p.get('status','')}"
+        )
+        pdf.drawString(50, y, line)
+        y -= 15
+        if y < 60:
+            pdf.showPage()
+            y = 800
+            pdf.setFont(font_name, 12)
+
+    pdf.setFont(bold_name, 14)
+    pdf.drawString(40, y, "📅 VACATION")
+    y -= 20
+    pdf.setFont(font_name, 12)
+    for v in vacations:
+        line = f"{v.get('start_date')} → {v.get('end_date')}"
+        pdf.drawString(50, y, line)
         y -= 15
-        pdf.drawString(50, y, f"Telegram ID: {employee.id}")
+        if y < 60:
+            pdf.showPage()
+            y = 800
+            pdf.setFont(font_name, 12)
+
+    pdf.setFont(bold_name, 14)
+    pdf.drawString(40, y, "📊 STATS")
+    y -= 20
+    pdf.setFont(font_name, 12)
+    for status, count in status_counts.items():
+        pdf.drawString(50, y, f"{status}: {count}")
         y -= 15
-        if employee.birthdate:
-            pdf.drawString(50, y, f"Birthday: {employee.birthdate}")
-            y -= 15
-        pdf.drawString(50, y, f"Code: {employee.name}")
-        y -= 30
-
-        pdf.setFont(bold_name, 14)
-        pdf.drawString(40, y, "💸 PAYOUT HISTORY")
-        y -= 20
-        pdf.setFont(font_name, 12)
-        for p in payouts:
-            line = (
-                f"{p.get('timestamp','')} | {p.get('amount')} ₽ | "
-                f"{p.get('payout_type','')} | {p.get('method','')} | {p.get('status','')}"
-            )
-            pdf.drawString(50, y, line)
-            y -= 15
-            if y < 60:
-                pdf.showPage()
-                y = 800
-                pdf.setFont(font_name, 12)
-
-        pdf.setFont(bold_name, 14)
-        pdf.drawString(40, y, "📅 VACATION")
-        y -= 20
-        pdf.setFont(font_name, 12)
-        for v in vacations:
-            line = f"{v.get('start_date')} → {v.get('end_date')}"
-            pdf.drawString(50, y, line)
-            y -= 15
-            if y < 60:
-                pdf.showPage()
-                y = 800
-                pdf.setFont(font_name, 12)
-
-        pdf.setFont(bold_name, 14)
-        pdf.drawString(40, y, "📊 STATS")
-        y -= 20
-        pdf.setFont(font_name, 12)
-        for status, count in status_counts.items():
-            pdf.drawString(50, y, f"{status}: {count}")
-            y -= 15
-            if y < 60:
-                pdf.showPage()
-                y = 800
-                pdf.setFont(font_name, 12)
-        pdf.drawString(50, y - 10, f"📆 Generated: {datetime.now().strftime('%Y-%m-%d')}")
-        pdf.showPage()
-        pdf.save()
-        buffer.seek(0)
-        return buffer.getvalue()
+        if y < 60:
+            pdf.showPage()
+            y = 800
+            pdf.setFont(font_name, 12)
+    pdf.drawString(50, y - 10, f"📆 Generated: {datetime.now().strftime('%Y-%m-%d')}")
+    pdf.showPage()
+    pdf.save()
+    buffer.seek(0)
+    return buffer.getvalue()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import shutil
+from dataclasses import replace
 from pathlib import Path
 from typing import List, Optional
 
@@ -9,6 +10,7 @@ from fastapi import HTTPException, UploadFile
 from app.core.enums import EmployeeStatus
 from app.core.types import Employee
 from app.data.employee_repository import EmployeeRepository
+from app.data.registry import get_employee_repository
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeOut
 
 
@@ -16,28 +18,24 @@ class EmployeeService:
     """Service to manage employee data."""
 
     def __init__(self, repo: EmployeeRepository | None = None) -> None:
-        self._repo = repo or EmployeeRepository()
-        self._employees: List[Employee] = self._repo.list_employees()
-        self._counter = max(
-            (int(
-                e.id) for e in self._employees if str(
-                e.id).isdigit()),
+        # the repository is shared with the bot, so it stays the only copy
+        self._repo = repo or get_employee_repository()
+
+    def _next_id(self) -> str:
+        counter = max(
+            (int(e.id) for e in self._repo.list_employees()
+             if str(e.id).isdigit()),
             default=0)
+        return str(counter + 1)
 
     def list_employees(self) -> List[Employee]:
-        return list(self._employees)
+        return self._repo.list_employees()
 
     def add_employee(self, employee: Employee) -> Employee:
         if not employee.id:
-            self._counter += 1
-            employee.id = str(self._counter)
-        else:
-            # keep counter in sync if numeric ids are provided
-            if str(employee.id).isdigit():
-                self._counter = max(self._counter, int(employee.id))
-        if any(e.id == str(employee.id) for e in self._employees):
+            employee.id = self._next_id()
+        if self.get_employee(str(employee.id)):
             raise ValueError("employee_exists")
-        self._employees.append(employee)
         self._repo.add_employee(employee)
         return employee
 
@@ -48,21 +46,19 @@ class EmployeeService:
         emp = self.get_employee(employee_id)
         if not emp:
             return None
-        for key, value in updates.items():
-            if hasattr(emp, key) and value is not None:
-                setattr(emp, key, value)
+        # cached employees are shared, so the update goes to a copy
+        emp = replace(emp, **{
+            key: value for key, value in updates.items()
+            if hasattr(emp, key) and value is not None
+        })
         self._repo.update_employee(emp)
         return emp
 
     def remove_employee(self, employee_id: str) -> None:
-        self._employees = [e for e in self._employees if e.id != employee_id]
         self._repo.delete_employee_by_id(employee_id)
 
     def get_employee(self, employee_id: str) -> Optional[Employee]:
-        for emp in self._employees:
-            if emp.id == employee_id:
-                return emp
-        return None
+        return self._repo.get_by_id(employee_id)
 
 
 class EmployeeAPIService:
@@ -1,13 +1,12 @@
-import os
-import pandas as pd
 import json
-from fpdf import FPDF
+import os
 from openpyxl import load_workbook
-from ..config import EXCEL_FILE, ADVANCE_REQUESTS_FILE
-from datetime import datetime
+from ..config import EXCEL_FILE
 from ..utils.logger import log
-import re
-import textwrap
+from . import sheet_store
+from .excel_writer import excel_writer
+from .workbook_cache import workbook_cache
+from typing import Dict, Optional, Tuple
 
 
 def unmerge_cells(sheet):
@@ -24,23 +23,94 @@ def unmerge_cells(sheet):
     return sheet
 
 
+CommentIndex = Dict[Tuple[str, int, str], str]
+
+
+def _build_comment_index(path: str) -> CommentIndex:
+    """Read every cell comment of the workbook in one pass."""
+    workbook = load_workbook(path, data_only=False)
+    index: CommentIndex = {}
+    try:
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows():
+                for cell in row:
+                    if cell.comment:
+                        index[(sheet.title, cell.row, cell.column_letter)] = (
+                            cell.comment.text.strip())
+    finally:
+        workbook.close()
+    log(f"💬 Индекс примечаний построен: {len(index)}")
+    return index
+
+
+def _save_comments(index: CommentIndex, directory) -> None:
+    rows = [[sheet, row, col, text] for (sheet, row, col), text in index.items()]
+    (directory / "comments.json").write_text(
+        json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+
+
+def _load_comments(directory) -> CommentIndex:
+    rows = json.loads((directory / "comments.json").read_text(encoding="utf-8"))
+    return {(sheet, row, col): text for sheet, row, col, text in rows}
+
+
+def _stored_comment_index(path: str) -> CommentIndex:
+    return sheet_store.cached(
+        path, "comments", None, lambda: _build_comment_index(path),
+        _save_comments, _load_comments)
+
+
+def get_workbook_comments() -> Optional[CommentIndex]:
+    """Return the {(sheet, row, column): text} index of all comments.
+
+    The index is built once per workbook version and shared, do not
+    modify it.
+    """
+    return workbook_cache.derived(
+        EXCEL_FILE, "comments", _stored_comment_index)
+
+
+def _group_comments(_path: str) -> Dict[str, Dict[int, Dict[str, str]]]:
+    grouped: Dict[str, Dict[int, Dict[str, str]]] = {}
+    for (sheet, row, col), text in (get_workbook_comments() or {}).items():
+        grouped.setdefault(sheet, {}).setdefault(row, {})[col] = text
+    return grouped
+
+
+def _comments_by_sheet() -> Dict[str, Dict[int, Dict[str, str]]]:
+    return workbook_cache.derived(
+        EXCEL_FILE, "comments_by_row", _group_comments) or {}
+
+
+def get_sheet_comments(sheet_name) -> Dict[int, Dict[str, str]]:
+    """Return comments of a sheet as {excel_row: {column_letter: text}}."""
+    return {
+        row: dict(cols)
+        for row, cols in _comments_by_sheet().get(sheet_name, {}).items()
+    }
+
+
+def get_row_comments(sheet_name, row_index) -> Dict[str, str]:
+    """Return comments of a data row as {column_letter: text}.
+
+    ``row_index`` is the DataFrame index returned by :func:`load_data`.
+    """
+    sheet = _comments_by_sheet().get(sheet_name, {})
+    return dict(sheet.get(row_index + 3, {}))
+
+
 def get_cell_comment(sheet_name, row_index, column_letter):
     """Получает примечание из указанной ячейки Excel."""
     if not os.path.exists(EXCEL_FILE):
         print(f"❌ Error: File {EXCEL_FILE} not found!")
         return "File error"
     try:
-        workbook = load_workbook(EXCEL_FILE, data_only=False)
-        if sheet_name not in workbook.sheetnames:
+        if sheet_name not in (workbook_cache.sheet_names(EXCEL_FILE) or []):
             print(f"❌ Error: Sheet {sheet_name} not found!")
             return "Sheet error"
-        sheet = workbook[sheet_name]
-        cell_ref = f"{column_letter}{row_index + 3}"
-        cell = sheet[cell_ref]
-        if cell.comment:
-            return cell.comment.text.strip()
-        else:
-            return "No comment"
+        index = get_workbook_comments() or {}
+        return index.get(
+            (sheet_name, row_index + 3, column_letter), "No comment")
     except Exception as e:
         print(
             f"❌ Error loading comment from {column_letter}{row_index + 1}: {e}"
@@ -59,39 +129,51 @@ def load_data(sheet_name=None):
         return None
 
     try:
-        xls = pd.ExcelFile(EXCEL_FILE)
+        # parsed sheets are cached until the file changes on disk
+        sheet_names = workbook_cache.sheet_names(EXCEL_FILE)
         log(
-            f"📂 Доступные листы в файле: {xls.sheet_names}"
+            f"📂 Доступные листы в файле: {sheet_names}"
         )  # ✅ Логируем все листы
 
         if sheet_name is None:
-            return xls.sheet_names  # Если `None`, возвращаем список листов
+            return sheet_names  # Если `None`, возвращаем список листов
 
-        if sheet_name not in xls.sheet_names:
+        if sheet_name not in sheet_names:
             log(
                 f"❌ Ошибка: Лист '{sheet_name}' не найден! Доступные листы: {
-                    xls.sheet_names}")
+                    sheet_names}")
             return None
 
-        return pd.read_excel(xls, sheet_name=sheet_name, header=1)
+        return workbook_cache.sheet(EXCEL_FILE, sheet_name, header=1)
     except Exception as e:
         log(f"❌ Ошибка при загрузке Excel: {e}")
         return None
 
 
+def load_raw_sheet(sheet_name):
+    """Return a sheet without header handling, as ``header=None`` reads it.
+
+    Served from the workbook cache; raises if the file or sheet is missing.
+    """
+    data = workbook_cache.sheet(EXCEL_FILE, sheet_name, header=None)
+    if data is None:
+        raise FileNotFoundError(EXCEL_FILE)
+    return data
+
+
 def update_cell(sheet_name, cell, value):
-    """Обновляет ячейку в Excel."""
-    try:
-        workbook = load_workbook(EXCEL_FILE)
-        sheet = workbook[sheet_name]
-        if cell not in sheet:
-            return False
-        sheet[cell] = value
-        workbook.save(EXCEL_FILE)
-        return True
-    except Exception as e:
-        print(f"Error updating cell: {e}")
-        return False
+    """Обновляет ячейку в Excel.
+
+    Одиночное обновление сохраняется сразу; пришедшее, пока другие ждут
+    в очереди или сохраняются, попадает в их общую запись файла (см.
+    :mod:`excel_writer`). Функция ждёт результата своей.
+    """
+    return excel_writer.submit(sheet_name, cell, value, eager=True).result()
+
+
+def update_cells(updates):
+    """Обновляет несколько ячеек ``(лист, ячейка, значение)`` за одно сохранение."""
+    return excel_writer.update_many(updates)
 
 
 def export_to_csv(sheet_name="ЯНВАРЬ"):
@@ -127,105 +209,3 @@ def export_to_pdf(sheet_name="ЯНВАРЬ"):
         print(f"Error exporting to PDF: {e}")
         return None
 
-
-def clean_line(text: str) -> str:
-    return re.sub(r"[^\x00-\x7Fа-яА-ЯёЁ0-9\s.,!?@\-:;()|₽💳🏠✅❌]+", "", text)
-
-
-def export_advances_to_pdf(
-    filter_type=None,
-    status=None,
-    name=None,
-    method=None,
-    after_date=None,
-    before_date=None,
-    filename="advance_report.pdf",
-):
-    try:
-        with open(ADVANCE_REQUESTS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"❌ Ошибка чтения файла: {e}")
-        return None
-
-    if not data:
-        print("⚠️ Нет данных для экспорта.")
-        return None
-
-    # Фильтрация по параметрам
-    def match_filters(entry):
-        if filter_type and entry.get("payout_type") != filter_type:
-            return False
-        if status and entry.get("status") != status:
-            return False
-        if name and name.lower() not in str(entry.get("name", "")).lower():
-            return False
-        if method and entry.get("method") != method:
-            return False
-        if after_date:
-            ts = entry.get("timestamp")
-            if ts:
-                try:
-                    dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-                    if dt < datetime.strptime(after_date, "%Y-%m-%d"):
-                        return False
-                except Exception:
-                    return False
-        if before_date:
-            ts = entry.get("timestamp")
-            if ts:
-                try:
-                    dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-                    if dt > datetime.strptime(before_date, "%Y-%m-%d"):
-                        return False
-                except Exception:
-                    return False
-        return True
-
-    data = [d for d in data if match_filters(d)]
-
-    from ..config import FONT_PATH
-
-    font_path = FONT_PATH
-    pdf = FPDF()
-    pdf.add_page()
-    if os.path.exists(font_path):
-        pdf.add_font("Arial", "", font_path, uni=True)
-        pdf.set_font("Arial", "", 10)
-    else:
-        print(
-            f"⚠️ Шрифт не найден: {font_path}. Используется стандартный Arial"
-        )
-        pdf.set_font("Arial", size=10)
-    pdf.set_auto_page_break(auto=True, margin=15)
-
-    pdf.cell(200, 10, "📄 Отчёт по выплатам", ln=True, align="C")
-
-    for idx, r in enumerate(data, 1):
-        try:
-            timestamp = str(r.get("timestamp", "—"))
-            name_val = str(r.get("name", "—"))
-            amount = str(r.get("amount", 0))
-            method = str(r.get("method", "—"))
-            payout_type = str(r.get("payout_type", "—"))
-            status_val = str(r.get("status", "—"))
-
-            line = f"{idx}) {timestamp} | {name_val} | {amount} ₽ | {method} | {payout_type} | {status_val}"
-            line = clean_line(line)
-
-            if len(line) > 1000:
-                line = line[:1000] + "..."
-
-            for chunk in textwrap.wrap(line, width=110):
-                pdf.cell(0, 8, txt=chunk, ln=True)
-        except Exception as e:
-            print(f"❌ Ошибка в строке {idx}: {e}")
-            continue
-
-    try:
-        pdf.output(filename)
-        print(f"✅ PDF отчёт сохранён: {filename}")
-        return filename
-    except Exception as e:
-        print(f"❌ Ошибка сохранения PDF: {e}")
-        return None
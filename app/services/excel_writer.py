@@ -0,0 +1,155 @@
+"""Batched write-back of cell updates to the salary workbook.
+
+Loading and saving the macro-enabled workbook takes seconds, and two
+concurrent load-modify-save cycles silently lose one of the edits. Updates
+are therefore queued and applied together: every flush loads the workbook
+once, sets all queued cells, and saves once. Macros are kept with
+``keep_vba`` and the file is replaced atomically, so readers never see a
+half-written workbook.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, List, Tuple
+
+from openpyxl import load_workbook
+from openpyxl.utils.cell import coordinate_from_string
+
+from ..config import EXCEL_FILE
+from ..utils.logger import log
+from .workbook_cache import workbook_cache
+
+# seconds during which cell updates are collected into one save
+WRITE_DELAY = 0.5
+
+
+@dataclass
+class CellUpdate:
+    sheet: str
+    cell: str
+    value: Any
+    result: "Future[bool]" = field(default_factory=Future)
+
+
+class ExcelWriteQueue:
+    """Collects cell updates and saves them in one transaction per flush.
+
+    :meth:`submit` returns a future that resolves to ``True`` once the
+    cell was written, or ``False`` if the sheet or cell does not exist or
+    the save failed. Updates arriving within ``delay`` seconds share one
+    save; :meth:`flush` applies the queue immediately.
+    """
+
+    def __init__(self, path: str | Path, delay: float = WRITE_DELAY) -> None:
+        self.path = Path(path)
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: List[CellUpdate] = []
+        self._timer: threading.Timer | None = None
+
+    def submit(self, sheet: str, cell: str, value: Any,
+               eager: bool = False) -> "Future[bool]":
+        """Queue one update.
+
+        With ``eager`` an update that finds the queue empty and no save
+        running is saved right away instead of after ``delay``, for callers
+        that block on the result; otherwise it joins the pending batch.
+        """
+        update = CellUpdate(sheet, cell, value)
+        with self._lock:
+            self._pending.append(update)
+            immediate = self._delay <= 0 or (
+                eager and len(self._pending) == 1
+                and not self._io_lock.locked())
+            if not immediate and self._timer is None:
+                self._timer = threading.Timer(self._delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+        return update.result
+
+    def update_many(
+        self, updates: Iterable[Tuple[str, str, Any]]
+    ) -> List[bool]:
+        """Apply ``(sheet, cell, value)`` updates with a single save."""
+        futures = [self.submit(*update) for update in updates]
+        self.flush()
+        return [future.result() for future in futures]
+
+    def flush(self) -> None:
+        """Write all queued updates now, if there are any."""
+        with self._io_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._pending = self._pending, []
+            if batch:
+                self._apply(batch)
+
+    def _apply(self, batch: List[CellUpdate]) -> None:
+        try:
+            workbook = load_workbook(
+                self.path, keep_vba=self.path.suffix.lower() == ".xlsm")
+        except Exception as exc:
+            log(f"❌ Failed to open {self.path} for writing: {exc}")
+            for update in batch:
+                update.result.set_result(False)
+            return
+
+        applied: List[CellUpdate] = []
+        for update in batch:
+            if update.sheet not in workbook.sheetnames:
+                update.result.set_result(False)
+                continue
+            try:
+                coordinate_from_string(update.cell)
+                workbook[update.sheet][update.cell] = update.value
+            except Exception as exc:
+                log(f"⚠️ Skipping {update.sheet}!{update.cell}: {exc}")
+                update.result.set_result(False)
+                continue
+            applied.append(update)
+
+        saved = False
+        if applied:
+            try:
+                self._save(workbook)
+                saved = True
+            except Exception as exc:
+                log(f"❌ Failed saving {self.path}: {exc}")
+        workbook.close()
+        if saved:
+            workbook_cache.invalidate(self.path)
+            log(f"💾 {len(applied)} cell update(s) saved to {self.path.name}")
+        for update in applied:
+            update.result.set_result(saved)
+
+    def _save(self, workbook) -> None:
+        fd, tmp = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.",
+            suffix=self.path.suffix,
+        )
+        os.close(fd)
+        try:
+            workbook.save(tmp)
+            with open(tmp, "rb") as f:
+                os.fsync(f.fileno())
+            os.chmod(tmp, os.stat(self.path).st_mode & 0o777)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+
+excel_writer = ExcelWriteQueue(EXCEL_FILE)
+atexit.register(excel_writer.flush)
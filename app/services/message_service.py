@@ -4,6 +4,11 @@ from typing import List, Optional
 from app.schemas.message import MessageRequest, MessageOut
 from app.data.message_repository import MessageRepository
 from app.data.employee_repository import EmployeeRepository
+from app.data.registry import (
+    get_async,
+    get_employee_repository,
+    get_message_repository,
+)
 from .telegram_service import TelegramService
 
 
@@ -12,12 +17,13 @@ class MessageService:
             self,
             repo: Optional[MessageRepository] = None,
             employee_repo: Optional[EmployeeRepository] = None) -> None:
-        self._repo = repo or MessageRepository()
-        self._employees = employee_repo or EmployeeRepository()
-        self._telegram = TelegramService(self._employees)
+        self._repo = get_async(repo or get_message_repository())
+        self._employees = get_async(
+            employee_repo or get_employee_repository())
+        self._telegram = TelegramService(self._employees.repo)
 
     async def list_messages(self) -> List[MessageOut]:
-        return [MessageOut(**m) for m in self._repo.list()]
+        return [MessageOut(**m) for m in await self._repo.list()]
 
     async def send_message(self, data: MessageRequest) -> MessageOut:
         message_id = await self._telegram.send_message_to_user(
@@ -27,8 +33,7 @@ class MessageService:
             photo_url=None,
             require_ack=data.require_ack,
         )
-        emp = next((e for e in self._employees.list_employees()
-                   if e.id == data.user_id), None)
+        emp = await self._employees.get_by_id(data.user_id)
         record = {
             "user_id": data.user_id,
             "name": emp.full_name if emp else data.user_id,
@@ -39,11 +44,11 @@ class MessageService:
             "timestamp": datetime.utcnow().isoformat(),
             "message_id": message_id,
         }
-        created = self._repo.create(record)
+        created = await self._repo.create(record)
         return MessageOut(**created)
 
     async def accept_message(self, msg_id: str) -> Optional[MessageOut]:
-        updated = self._repo.accept(msg_id)
+        updated = await self._repo.accept(msg_id)
         if updated:
             self._telegram.update_sent_message_status(
                 updated["user_id"], updated["message_id"], "принято"
@@ -53,8 +58,8 @@ class MessageService:
 
     @staticmethod
     def accept_by_details(user_id: str, message_id: int) -> None:
-        MessageRepository().accept_by_details(user_id, message_id)
+        get_message_repository().accept_by_details(user_id, message_id)
 
     @staticmethod
     def mark_message_as_accepted(msg_id: str) -> None:
-        MessageRepository().accept(msg_id)
+        get_message_repository().accept(msg_id)
@@ -0,0 +1,251 @@
+"""Streaming export of payouts as PDF, CSV or XLSX.
+
+The payout repository's indexed query gives the ordered ids once, then
+the records are fetched by id ``PAGE_SIZE`` at a time and written out as
+they arrive: CSV rows in chunks and the XLSX as a zip stream, so memory
+holds the ids and about one page. The PDF is not streamed: FPDF only
+outputs a finished document, so its pages are laid out as the rows
+arrive and the whole document is sent in chunks once complete. Nothing
+is written to disk.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import math
+import os
+import re
+import zipfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set
+from xml.sax.saxutils import escape
+
+from fpdf import FPDF
+from openpyxl.utils import get_column_letter
+
+from ..config import FONT_PATH
+from ..utils.logger import log
+
+# records per repository query
+PAGE_SIZE = 500
+# bytes buffered before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+# shown instead of characters the PDF font has no glyph for
+MISSING_GLYPH = "?"
+
+COLUMNS = [
+    ("timestamp", "Дата"),
+    ("name", "Сотрудник"),
+    ("amount", "Сумма"),
+    ("method", "Способ"),
+    ("payout_type", "Тип"),
+    ("status", "Статус"),
+]
+TITLE = "Отчёт по выплатам"
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+# Latin spelling for the built-in PDF font, which has no Cyrillic
+TRANSLIT = str.maketrans({
+    **dict(zip(
+        "абвгдезийклмнопрстуфыэАБВГДЕЗИЙКЛМНОПРСТУФЫЭ",
+        "abvgdeziyklmnoprstufyeABVGDEZIYKLMNOPRSTUFYE")),
+    "ё": "e", "ж": "zh", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh",
+    "щ": "shch", "ъ": "", "ь": "", "ю": "yu", "я": "ya",
+    "Ё": "E", "Ж": "Zh", "Х": "Kh", "Ц": "Ts", "Ч": "Ch", "Ш": "Sh",
+    "Щ": "Shch", "Ъ": "", "Ь": "", "Ю": "Yu", "Я": "Ya",
+    "₽": "RUB", "—": "-",
+})
+
+
+def iter_payouts(repo, page_size: int = PAGE_SIZE,
+                 **filters: Any) -> Iterator[Dict[str, Any]]:
+    """Yield the payouts matching ``filters``, newest first, page by page.
+
+    The ordered ids are taken once up front and the records are fetched
+    by id ``page_size`` at a time, so the export is one consistent
+    listing: a payout created meanwhile is left out and one deleted
+    meanwhile is skipped without shifting the others.
+    """
+    ids = repo.list_ids(**filters)
+    for start in range(0, len(ids), page_size):
+        yield from repo.get_many(ids[start:start + page_size])
+
+
+def _value(record: Dict[str, Any], field: str) -> Any:
+    value = record.get(field)
+    return "—" if value is None or value == "" else value
+
+
+def _unicode_font(font: Any) -> bool:
+    # fpdf 1.7 describes fonts with dicts, fpdf2 with font objects
+    if isinstance(font, dict):
+        return font.get("type") == "TTF"
+    return hasattr(font, "cmap")
+
+
+def _has_glyph(font: Any, ch: str) -> bool:
+    code = ord(ch)
+    if not _unicode_font(font):
+        # core font: Latin-1 only
+        return code < 256
+    if isinstance(font, dict):
+        widths = font["cw"]
+        return code < len(widths) and bool(widths[code])
+    return code in font.cmap
+
+
+def _pdf_text(pdf: FPDF, text: str, missing: Set[str]) -> str:
+    """``text`` with the characters the current font lacks substituted."""
+    font = pdf.current_font
+    if not _unicode_font(font):
+        text = text.translate(TRANSLIT)
+    out = []
+    for ch in text:
+        if not _has_glyph(font, ch):
+            missing.add(ch)
+            ch = MISSING_GLYPH
+        out.append(ch)
+    return "".join(out)
+
+
+def stream_pdf(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    if os.path.exists(FONT_PATH):
+        pdf.add_font("DejaVu", "", FONT_PATH, uni=True)
+        pdf.set_font("DejaVu", "", 14)
+    else:
+        log(f"⚠️ Шрифт не найден: {FONT_PATH}. Кириллица будет латиницей")
+        pdf.set_font("Arial", "", 14)
+    missing: Set[str] = set()
+    pdf.cell(0, 10, _pdf_text(pdf, TITLE, missing), ln=1, align="C")
+    pdf.set_font_size(10)
+    for idx, record in enumerate(rows, 1):
+        timestamp, name, amount, method, payout_type, status = (
+            _value(record, field) for field, _ in COLUMNS)
+        line = (f"{idx}) {timestamp} | {name} | {amount} ₽ | {method} | "
+                f"{payout_type} | {status}")
+        pdf.multi_cell(0, 8, _pdf_text(pdf, line, missing))
+        # fpdf2 leaves the cursor right of the cell, fpdf 1.7 on a new line
+        pdf.set_x(pdf.l_margin)
+    if missing:
+        log(f"⚠️ PDF: нет глифов для {''.join(sorted(missing))!r}, "
+            f"заменены на {MISSING_GLYPH!r}")
+    data = pdf.output(dest="S")
+    if isinstance(data, str):
+        # fpdf 1.7 returns the document as a Latin-1 string
+        data = data.encode("latin-1")
+    data = bytes(data)
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start:start + CHUNK_SIZE]
+
+
+def stream_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    # the BOM makes Excel read the file as UTF-8
+    buffer.write("\ufeff")
+    out = csv.writer(buffer)
+    out.writerow([title for _, title in COLUMNS])
+    for record in rows:
+        out.writerow([record.get(field, "") for field, _ in COLUMNS])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+class _Sink:
+    """Unseekable zip target handing out what was written so far."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+_XML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_RELS = ("http://schemas.openxmlformats.org/officeDocument/2006/"
+             "relationships")
+_PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType='
+        '"application/vnd.openxmlformats-officedocument.spreadsheetml.'
+        'worksheet+xml"/></Types>'),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{_RELS}"><Relationship Id="rId1" '
+        f'Type="{_DOC_RELS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    "xl/workbook.xml": (
+        f'<workbook xmlns="{_MAIN}" xmlns:r="{_DOC_RELS}"><sheets>'
+        '<sheet name="Выплаты" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+    "xl/_rels/workbook.xml.rels": (
+        f'<Relationships xmlns="{_RELS}"><Relationship Id="rId1" '
+        f'Type="{_DOC_RELS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'),
+}
+# characters XML 1.0 does not allow
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _cell(ref: str, value: Any) -> str:
+    if (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    text = _INVALID_XML.sub("", "" if value is None else str(value))
+    return (f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">'
+            f'{escape(text)}</t></is></c>')
+
+
+def _row(number: int, values: List[Any]) -> str:
+    cells = "".join(_cell(f"{get_column_letter(col)}{number}", value)
+                    for col, value in enumerate(values, 1))
+    return f'<row r="{number}">{cells}</row>'
+
+
+def stream_xlsx(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as book:
+        for name, xml in _PARTS.items():
+            book.writestr(name, _XML + xml)
+        with book.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(f'{_XML}<worksheet xmlns="{_MAIN}"><sheetData>'
+                        .encode("utf-8"))
+            sheet.write(_row(1, [title for _, title in COLUMNS])
+                        .encode("utf-8"))
+            for number, record in enumerate(rows, 2):
+                values = [record.get(field) for field, _ in COLUMNS]
+                sheet.write(_row(number, values).encode("utf-8"))
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+WRITERS: Dict[str, Callable[[Iterable[Dict[str, Any]]], Iterator[bytes]]] = {
+    "pdf": stream_pdf,
+    "csv": stream_csv,
+    "xlsx": stream_xlsx,
+}
@@ -1,8 +1,12 @@
+import asyncio
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from itertools import chain
+from typing import Iterator, List, Optional, Dict, Any
 
 from app.schemas.payout import Payout, PayoutCreate, PayoutUpdate
 from app.data.payout_repository import PayoutRepository
+from app.data.registry import get_async, get_payout_repository
+from .payout_export import WRITERS, iter_payouts
 from .telegram_service import TelegramService
 
 import logging
@@ -24,7 +28,7 @@ class PayoutService:
         repo: Optional[PayoutRepository] = None,
         telegram_service: Optional["TelegramService"] = None,
     ) -> None:
-        self._repo = repo or PayoutRepository()
+        self._repo = get_async(repo or get_payout_repository())
         self._telegram = telegram_service
 
     async def list_payouts(
@@ -35,14 +39,18 @@ class PayoutService:
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[Payout]:
-        rows = self._repo.list(
+        rows = await self._repo.list(
             employee_id,
             payout_type,
             status,
             method,
             from_date,
-            to_date)
+            to_date,
+            limit=limit,
+            offset=offset)
         return [Payout(**r) for r in rows]
 
     async def create_payout(self, data: PayoutCreate) -> Payout:
@@ -57,7 +65,7 @@ class PayoutService:
             "status": "Ожидает",
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
-        created = self._repo.create(payout_dict)
+        created = await self._repo.create(payout_dict)
         logger.info(
             f"🆕 Выплата '{
                 created['payout_type']}' на {
@@ -77,7 +85,7 @@ class PayoutService:
             update: PayoutUpdate) -> Optional[Payout]:
         if update.status is not None:
             return await self.update_status(payout_id, update.status)
-        updated = self._repo.update(
+        updated = await self._repo.update(
             payout_id, update.model_dump(
                 exclude_none=True))
         if updated:
@@ -87,7 +95,7 @@ class PayoutService:
         return None
 
     async def update_status(self, payout_id: str, status: str) -> Optional[Payout]:
-        updated = self._repo.update(payout_id, {"status": status})
+        updated = await self._repo.update(payout_id, {"status": status})
         if not updated:
             return None
         logger.info(
@@ -111,18 +119,18 @@ class PayoutService:
     async def delete_payouts(self, ids: List[str]) -> None:
         if not ids:
             return
-        self._repo.delete_many(ids)
+        await self._repo.delete_many(ids)
         logger.info(f"🗑 Удалены выплаты: {', '.join(ids)}")
 
     async def delete_payout(self, payout_id: str) -> bool:
-        deleted = self._repo.delete(payout_id)
+        deleted = await self._repo.delete(payout_id)
         if deleted:
             logger.info(f"🗑 Удалена выплата {payout_id}")
         return deleted
 
     async def list_active_payouts(self) -> List[Payout]:
         """Return payouts that are pending approval or already approved."""
-        rows = self._repo.load_all()
+        rows = await self._repo.load_all()
         active = [
             r for r in rows if r.get("status") in (
                 "В ожидании",
@@ -131,30 +139,32 @@ class PayoutService:
                 "pending")]
         return [Payout(**r) for r in active]
 
-    async def export_to_pdf(
+    async def export(
         self,
+        fmt: str,
         employee_id: Optional[str] = None,
         payout_type: Optional[str] = None,
         status: Optional[str] = None,
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
-    ) -> Optional[str]:
-        from app.services.excel import export_advances_to_pdf
+    ) -> Optional[Iterator[bytes]]:
+        """Chunks of the ``fmt`` export of the matching payouts.
 
-        name = None
-        if employee_id:
-            rows = self._repo.list(employee_id=employee_id)
-            if rows:
-                name = rows[0].get("name")
-
-        filename = f"payouts_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        return export_advances_to_pdf(
-            filter_type=payout_type,
+        Returns ``None`` when nothing matches. The chunks are produced
+        lazily from repository pages; iterate them off the event loop.
+        Invalid dates raise ``ValueError``.
+        """
+        rows = iter_payouts(
+            self._repo.repo,
+            employee_id=employee_id,
+            payout_type=payout_type,
             status=status,
-            name=name,
             method=method,
-            after_date=from_date,
-            before_date=to_date,
-            filename=filename,
+            from_date=from_date,
+            to_date=to_date,
         )
+        first = await asyncio.to_thread(next, rows, None)
+        if first is None:
+            return None
+        return WRITERS[fmt](chain([first], rows))
@@ -2,7 +2,8 @@
 
 from typing import TYPE_CHECKING
 
-from .employee_report import EmployeeReportService
+from .employee_report import EmployeeReportService, render_profile_pdf
+from .render_executor import render_executor
 
 if TYPE_CHECKING:  # pragma: no cover - for type hints only
     from app.data.employee_repository import EmployeeRepository
@@ -20,3 +21,14 @@ def generate_employee_pdf(
     service = EmployeeReportService(employee_repo, payout_repo, vacation_repo)
     return service.generate_profile_pdf(str(user_id))
 
+
+async def render_employee_pdf(
+    user_id: int,
+    employee_repo: "EmployeeRepository",
+    payout_repo: "PayoutRepository",
+    vacation_repo: "VacationRepository",
+) -> bytes:
+    """Like :func:`generate_employee_pdf`, drawing in a render worker."""
+    service = EmployeeReportService(employee_repo, payout_repo, vacation_repo)
+    data = service.profile_data(str(user_id))
+    return await render_executor.run(render_profile_pdf, *data)
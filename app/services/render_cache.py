@@ -0,0 +1,106 @@
+"""Cache of rendered report images and their Telegram ``file_id``.
+
+A salary image only depends on the employee, the month and the workbook
+contents, so it is rendered once per workbook version. After the first
+upload Telegram returns a ``file_id`` for the photo; repeat views send
+that id, which needs neither a render nor an upload. Entries are kept in
+an LRU bounded by the total size of the PNG data.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple
+
+from ..config import EXCEL_FILE
+from ..utils.logger import log
+from .workbook_cache import fingerprint
+
+# total PNG bytes kept in memory
+MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass
+class RenderedImage:
+    png: bytes
+    file_id: Optional[str] = None
+
+
+class RenderCache:
+    """LRU of rendered images bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes: int = MAX_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, RenderedImage]" = OrderedDict()
+
+    @staticmethod
+    def key(kind: str, employee: str, month: str) -> Optional[Tuple]:
+        """Key of an image rendered from the current workbook version."""
+        version = fingerprint(EXCEL_FILE)
+        if version is None:
+            return None
+        return (kind, employee.strip(), month.upper(), version)
+
+    def get(self, key: Optional[Hashable]) -> Optional[RenderedImage]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Optional[Hashable], png: bytes) -> RenderedImage:
+        entry = RenderedImage(png)
+        if key is None or len(png) > self._max_bytes:
+            return entry
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.png)
+            self._entries[key] = entry
+            self._size += len(png)
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.png)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    async def reply(self, message, key: Optional[Hashable],
+                    **kwargs: Any) -> bool:
+        """Send the cached image of ``key`` as a reply; ``False`` on a miss."""
+        entry = self.get(key)
+        if entry is None:
+            return False
+        if entry.file_id:
+            try:
+                await message.reply_photo(photo=entry.file_id, **kwargs)
+                return True
+            except Exception as e:
+                log(f"⚠️ Не удалось отправить по file_id, загружаю заново: {e}")
+                entry.file_id = None
+        await self._upload(message, entry, **kwargs)
+        return True
+
+    async def send(self, message, key: Optional[Hashable], png: bytes,
+                   **kwargs: Any) -> None:
+        """Upload a freshly rendered ``png`` and cache it under ``key``."""
+        await self._upload(message, self.put(key, png), **kwargs)
+
+    async def _upload(self, message, entry: RenderedImage,
+                      **kwargs: Any) -> None:
+        sent = await message.reply_photo(photo=entry.png, **kwargs)
+        photos = getattr(sent, "photo", None)
+        if photos:
+            # the largest size is the one we uploaded
+            entry.file_id = photos[-1].file_id
+
+
+render_cache = RenderCache()
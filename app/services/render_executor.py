@@ -0,0 +1,292 @@
+"""Worker processes for CPU-bound image and PDF rendering.
+
+PIL and the PDF libraries hold the GIL while they draw, so a report
+rendered inside a handler stalls every other update of the bot and every
+request of the API. Renders are awaited through :data:`render_executor`
+instead: a pool of ``RENDER_WORKERS`` processes runs them, at most
+``RENDER_QUEUE_SIZE`` more wait for a worker and a render that does not
+finish within ``RENDER_TIMEOUT`` seconds is abandoned, its worker process
+replaced. Results come back as bytes; :meth:`RenderExecutor.stats` reports the queue depth and the
+render latency.
+
+Render functions and their arguments are pickled, so they must be module
+level functions taking plain data (rows, frames, models), not
+repositories.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from io import BytesIO
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from ..config import RENDER_QUEUE_SIZE, RENDER_TIMEOUT, RENDER_WORKERS
+from ..utils.logger import log
+
+# render durations kept per job for the latency percentiles
+LATENCY_WINDOW = 256
+
+
+class RenderQueueFull(RuntimeError):
+    """All workers are busy and the queue is full."""
+
+
+class RenderTimeout(TimeoutError):
+    """A render did not finish within its timeout."""
+
+
+def _render(fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+    result = fn(*args, **kwargs)
+    if isinstance(result, BytesIO):
+        return result.getvalue()
+    return result
+
+
+def _terminate(pool: ProcessPoolExecutor) -> None:
+    """Shut ``pool`` down, killing its worker even mid-render.
+
+    ``shutdown`` leaves a busy worker running, and before Python 3.14
+    (``terminate_workers``) the executor has no public way to stop one,
+    so the processes are taken from its private ``_processes`` map.
+    """
+    terminate_workers = getattr(pool, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class _Lane:
+    """One worker process, or the fallback thread, running one job at a time."""
+
+    def __init__(self, pool: Executor) -> None:
+        self.pool = pool
+        self.job: Optional[Future] = None
+
+
+class RenderExecutor:
+    """Bounded pool that runs render functions away from the event loop.
+
+    Each worker is a single-process pool of its own and jobs are handed to
+    idle workers here, so a render that times out costs only its worker:
+    that process is killed and replaced while the other renders go on.
+    ``workers`` <= 0 renders in a single background thread instead of
+    processes, which keeps the event loop free but not the GIL; a stuck
+    thread cannot be killed and keeps its slot until it returns.
+    """
+
+    def __init__(
+        self,
+        workers: int = RENDER_WORKERS,
+        queue_size: int = RENDER_QUEUE_SIZE,
+        timeout: float = RENDER_TIMEOUT,
+    ) -> None:
+        self._workers = workers
+        self._queue_size = queue_size
+        self._timeout = timeout
+        # reentrant: a job finishing right away reports back under the lock
+        self._lock = threading.RLock()
+        self._lanes: List[_Lane] = []
+        self._idle: List[_Lane] = []
+        self._waiting: Deque[Tuple[Future, tuple]] = deque()
+        self._inflight: Set[Future] = set()
+        self._latency: Dict[str, Deque[float]] = {}
+        self._counts = {"completed": 0, "failed": 0, "timeouts": 0,
+                        "rejected": 0, "restarts": 0}
+
+    @property
+    def capacity(self) -> int:
+        return max(self._workers, 1) + self._queue_size
+
+    def _new_pool(self) -> Executor:
+        if self._workers > 0:
+            try:
+                # the bot and the API run threads, which fork does not
+                # copy safely into long-lived workers
+                return ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"))
+            except Exception as exc:
+                log(f"⚠️ Render processes unavailable, using a thread: {exc}")
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+
+    def _start_lanes(self) -> None:
+        while len(self._lanes) < max(self._workers, 1):
+            lane = _Lane(self._new_pool())
+            self._lanes.append(lane)
+            self._idle.append(lane)
+            if isinstance(lane.pool, ThreadPoolExecutor):
+                break
+
+    def _submit(self, fn: Callable[..., Any], args: tuple,
+                kwargs: dict) -> Future:
+        job: Future = Future()
+        with self._lock:
+            if len(self._inflight) >= self.capacity:
+                self._counts["rejected"] += 1
+                raise RenderQueueFull(
+                    f"{len(self._inflight)} renders already queued")
+            self._inflight.add(job)
+            job.add_done_callback(self._discard)
+            self._start_lanes()
+            self._waiting.append((job, (fn, args, kwargs)))
+            self._dispatch()
+        return job
+
+    def _dispatch(self) -> None:
+        """Start waiting jobs on idle workers; called with the lock held."""
+        while self._waiting and self._idle:
+            job, call = self._waiting.popleft()
+            if not job.set_running_or_notify_cancel():
+                continue
+            lane = self._idle.pop()
+            try:
+                task = lane.pool.submit(_render, *call)
+            except Exception as exc:
+                self._idle.append(lane)
+                job.set_exception(exc)
+                continue
+            lane.job = job
+            task.add_done_callback(partial(self._finished, lane, job))
+
+    def _finished(self, lane: _Lane, job: Future, task: Future) -> None:
+        with self._lock:
+            if lane.job is not job:
+                # abandoned after a timeout, the lane has a new worker
+                return
+            lane.job = None
+            try:
+                job.set_result(task.result())
+            except BrokenExecutor as exc:
+                log(f"⚠️ Render worker died, restarting it: {exc}")
+                self._counts["restarts"] += 1
+                lane.pool.shutdown(wait=False)
+                lane.pool = self._new_pool()
+                job.set_exception(exc)
+            except BaseException as exc:
+                job.set_exception(exc)
+            if lane in self._lanes:
+                self._idle.append(lane)
+                self._dispatch()
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._inflight.discard(future)
+
+    async def run(self, fn: Callable[..., Any], *args: Any,
+                  timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Render ``fn(*args, **kwargs)`` in a worker and return the result.
+
+        A ``BytesIO`` result is returned as its bytes. Raises
+        :class:`RenderQueueFull` when the queue is full and
+        :class:`RenderTimeout` after ``timeout`` seconds (``RENDER_TIMEOUT``
+        by default), counted from submission.
+        """
+        name = getattr(fn, "__qualname__", repr(fn))
+        timeout = self._timeout if timeout is None else timeout
+        started = time.perf_counter()
+        future = self._submit(fn, args, kwargs)
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout if timeout > 0 else None)
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            self._abandon(future, name)
+            log(f"⏱ Render {name} timed out after {timeout}s")
+            raise RenderTimeout(f"{name} took longer than {timeout}s")
+        except Exception:
+            self._count("failed")
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._counts["completed"] += 1
+            self._latency.setdefault(
+                name, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+        return result
+
+    async def try_run(self, fn: Callable[..., Any], *args: Any,
+                      **kwargs: Any) -> Any:
+        """Like :meth:`run`, but logs a failed render and returns ``None``."""
+        try:
+            return await self.run(fn, *args, **kwargs)
+        except Exception as exc:
+            log(f"❌ Render {getattr(fn, '__name__', fn)} failed: {exc}")
+            return None
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def _abandon(self, job: Future, name: str) -> None:
+        with self._lock:
+            if job.cancel():
+                # still waiting for a worker
+                return
+            lane = next(
+                (lane for lane in self._lanes if lane.job is job), None)
+            if lane is None or isinstance(lane.pool, ThreadPoolExecutor):
+                # finished meanwhile, or a thread that cannot be stopped
+                return
+            # replace only the stuck worker, the others keep rendering
+            stuck, lane.pool, lane.job = lane.pool, self._new_pool(), None
+            self._counts["restarts"] += 1
+            self._idle.append(lane)
+            self._dispatch()
+        _terminate(stuck)
+        job.set_exception(RenderTimeout(f"{name} was abandoned"))
+        log(f"🔁 Render worker stuck on {name} restarted")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, job counters and latency (ms) per render function."""
+        with self._lock:
+            running = sum(1 for f in self._inflight if f.running())
+            latency = {
+                name: {
+                    "count": len(values),
+                    "mean_ms": round(sum(values) / len(values) * 1000, 1),
+                    "p50_ms": round(_percentile(list(values), 0.5) * 1000, 1),
+                    "p90_ms": round(_percentile(list(values), 0.9) * 1000, 1),
+                    "max_ms": round(max(values) * 1000, 1),
+                }
+                for name, values in self._latency.items() if values
+            }
+            return {
+                "workers": self._workers,
+                "capacity": self.capacity,
+                "running": running,
+                "queued": len(self._inflight) - running,
+                **self._counts,
+                "latency": latency,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            lanes, self._lanes, self._idle = self._lanes, [], []
+            waiting = [job for job, _ in self._waiting]
+            self._waiting.clear()
+        for job in waiting:
+            job.cancel()
+        for lane in lanes:
+            lane.pool.shutdown(wait=wait, cancel_futures=True)
+
+
+render_executor = RenderExecutor()
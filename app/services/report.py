@@ -1,6 +1,6 @@
 import pandas as pd
 from pandas import DataFrame
-from .excel import get_cell_comment
+from .excel import get_row_comments
 
 
 def generate_employee_report(
@@ -45,6 +45,9 @@ def generate_employee_report(
             return f"{int(percent_value)}%, {text2}"
         return f"{int(percent_value)}%"
 
+    # one lookup in the cached comment index instead of a workbook per cell
+    comments = get_row_comments(month, row_index)
+
     return [
         [
             ("ЗАГОЛОВОК ОТЧЁТА", ""),
@@ -97,8 +100,8 @@ def generate_employee_report(
         ],
         [
             ("ПОЯСНЕНИЕ НАЧИСЛЕНИЙ", ""),
-            ("Аванс", get_cell_comment(month, row_index, "CM")),
-            ("Удержание", get_cell_comment(month, row_index, "CI")),
-            ("Бонус", get_cell_comment(month, row_index, "CA")),
+            ("Аванс", comments.get("CM", "No comment")),
+            ("Удержание", comments.get("CI", "No comment")),
+            ("Бонус", comments.get("CA", "No comment")),
         ],
     ]
@@ -1,30 +1,21 @@
 from __future__ import annotations
 
-from typing import List, Optional
-
-import pandas as pd
+import asyncio
+from typing import Dict, List, Optional
 
 from .excel import load_data
+from .salary_snapshot import SalarySnapshot, get_snapshot, get_year_snapshots
+from ..config import SALARY_YEAR_WORKERS
 from ..data.employee_repository import EmployeeRepository
-from ..schemas.salary import SalaryRow
+from ..data.registry import get_employee_repository
+from ..schemas.salary import SalaryRow, SalarySeries
 
 
 class SalaryService:
     """Service to load salary data from Excel."""
 
     def __init__(self, repo: EmployeeRepository | None = None) -> None:
-        self._repo = repo or EmployeeRepository()
-        self._cache: dict[str, pd.DataFrame] = {}
-
-    def _load_month(self, month: str) -> pd.DataFrame | None:
-        month = month.upper()
-        if month in self._cache:
-            return self._cache[month]
-        df = load_data(sheet_name=month)
-        if df is not None:
-            df.columns = [str(c).strip() for c in df.columns]
-            self._cache[month] = df
-        return df
+        self._repo = repo or get_employee_repository()
 
     async def list_months(self) -> List[str]:
         months = load_data(None)
@@ -35,91 +26,67 @@ class SalaryService:
     ) -> List[SalaryRow]:
         if not month:
             return []
-        df = self._load_month(month)
-        if df is None or "ИМЯ" not in df.columns:
+        snapshot = get_snapshot(month)
+        if snapshot is None:
             return []
-        name_map = {e.name: e.id for e in self._repo.list_employees()}
-        result: List[SalaryRow] = []
-        cols = {str(c).strip().lower(): c for c in df.columns}
-
-        def pick(*names: str) -> Optional[str]:
-            for n in names:
-                key = str(n).strip().lower()
-                if key in cols:
-                    return cols[key]
-            return None
-
-        colmap = {
-            "shifts_main": pick("осн.", "основные", "shifts_main"),
-            "shifts_extra": pick("доп.", "дополнительные", "shifts_extra"),
-            "shifts_total": pick("общ", "итого смен", "shifts_total"),
-            "salary_fixed": pick("оклад", "salary_fixed"),
-            "salary_repair": pick("ремонт", "salary_repair"),
-            "salary_cosmetics": pick("косметика", "salary_cosmetics"),
-            "salary_shoes": pick("обувь", "salary_shoes"),
-            "salary_accessories": pick("аксессуары", "salary_accessories"),
-            "salary_keys": pick("ключи", "salary_keys"),
-            "salary_slippers": pick("тапки", "salary_slippers"),
-            "salary_workshop": pick("цех", "workshop", "salary_workshop"),
-            "salary_bonus": pick("бонус", "salary_bonus"),
-            "salary_total": pick("итого", "salary_total"),
-            "deduction": pick("удержание", "deduction"),
-            "advance": pick("аванс", "advance"),
-            "final_amount": pick("к выплате", "final_amount"),
-            "comment": pick("комментарий", "comment"),
-        }
-        for _, row in df.iterrows():
-            name = str(row.get("ИМЯ", "")).strip()
-            if not name:
-                continue
-            emp_id = name_map.get(name, "")
-            if employee_id and emp_id != employee_id:
-                continue
-
-            def to_float(val: object) -> float:
-                try:
-                    if pd.isna(val):
-                        return 0.0
-                    return float(val)
-                except Exception:
-                    return 0.0
-
-            def to_int(val: object) -> int:
-                try:
-                    if pd.isna(val):
-                        return 0
-                    return int(float(val))
-                except Exception:
-                    return 0
+        return self._rows(snapshot, employee_id, month)
 
-            values = {}
-            for field, col in colmap.items():
-                if col is None:
-                    if field == "comment":
-                        values[field] = ""
-                    else:
-                        values[field] = 0
-                    continue
-                if field.startswith("shifts_"):
-                    values[field] = to_int(row.get(col))
-                elif field in {"comment"}:
-                    values[field] = str(row.get(col, "")).strip()
-                else:
-                    values[field] = to_float(row.get(col))
-
-            if values.get("shifts_total") == 0:
-                values["shifts_total"] = values.get(
-                    "shifts_main", 0) + values.get("shifts_extra", 0)
-
-            comment_raw = values.pop("comment", "")
-            comment = str(comment_raw).strip() or None
-            result.append(
-                SalaryRow(
-                    employee_id=emp_id,
-                    name=name,
-                    month=month,
-                    comment=comment,
-                    **values,
-                )
-            )
+    def _rows(
+        self,
+        snapshot: SalarySnapshot,
+        employee_id: Optional[str] = None,
+        month: Optional[str] = None,
+    ) -> List[SalaryRow]:
+        if employee_id:
+            emp = self._repo.get_by_id(employee_id)
+            if emp is None:
+                return []
+            owner = self._repo.get_by_name(emp.name)
+            if owner is None or owner.id != emp.id:
+                return []
+            return [
+                snapshot.row(pos, emp.id, month)
+                for pos in snapshot.rows_for(emp.name)
+            ]
+        result: List[SalaryRow] = []
+        for pos, name in enumerate(snapshot.names):
+            emp = self._repo.get_by_name(name)
+            result.append(snapshot.row(pos, emp.id if emp else "", month))
         return result
+
+    async def get_year(
+        self,
+        employee_id: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> List[SalaryRow]:
+        """Return salary rows of every month sheet, in calendar order.
+
+        All months come from one open of the workbook; ``workers`` (default
+        ``SALARY_YEAR_WORKERS``) parses uncached sheets in that many
+        processes instead.
+        """
+        workers = SALARY_YEAR_WORKERS if workers is None else workers
+        snapshots = await asyncio.to_thread(get_year_snapshots, workers)
+        rows: List[SalaryRow] = []
+        for snapshot in snapshots:
+            rows.extend(self._rows(snapshot, employee_id))
+        return rows
+
+    async def get_year_series(
+        self,
+        employee_id: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> List[SalarySeries]:
+        """Group :meth:`get_year` rows into one time series per employee."""
+        series: Dict[tuple, SalarySeries] = {}
+        for row in await self.get_year(employee_id, workers):
+            key = (row.employee_id, row.name)
+            item = series.get(key)
+            if item is None:
+                item = series[key] = SalarySeries(
+                    employee_id=row.employee_id, name=row.name)
+            item.rows.append(row)
+            for field, value in row.model_dump().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    item.totals[field] = item.totals.get(field, 0) + value
+        return list(series.values())
@@ -0,0 +1,271 @@
+"""Normalized, columnar view of a month's salary sheet.
+
+A month sheet is converted once per workbook version: every mapped column
+is coerced with one vectorized ``pd.to_numeric`` call and stored as a
+typed numpy array. Rows are then addressed by position through a name
+index, so per-employee and per-month queries are lookups instead of
+``iterrows`` loops. Snapshots are also written to the on-disk
+:mod:`sheet_store`, so other processes and restarts map them instead of
+parsing the sheet again.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import EXCEL_FILE
+from ..core.constants import MONTHS_RU
+from ..schemas.salary import SalaryRow
+from . import sheet_store
+from .excel import load_data
+from .workbook_cache import workbook_cache
+from .workbook_reader import read_sheets
+
+NAME_COLUMN = "ИМЯ"
+
+# SalaryRow field -> accepted sheet headers (case-insensitive)
+COLUMN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "shifts_main": ("осн.", "основные", "shifts_main"),
+    "shifts_extra": ("доп.", "дополнительные", "shifts_extra"),
+    "shifts_total": ("общ", "итого смен", "shifts_total"),
+    "salary_fixed": ("оклад", "salary_fixed"),
+    "salary_repair": ("ремонт", "salary_repair"),
+    "salary_cosmetics": ("косметика", "salary_cosmetics"),
+    "salary_shoes": ("обувь", "salary_shoes"),
+    "salary_accessories": ("аксессуары", "salary_accessories"),
+    "salary_keys": ("ключи", "salary_keys"),
+    "salary_slippers": ("тапки", "salary_slippers"),
+    "salary_workshop": ("цех", "workshop", "salary_workshop"),
+    "salary_bonus": ("бонус", "salary_bonus"),
+    "salary_total": ("итого", "salary_total"),
+    "deduction": ("удержание", "deduction"),
+    "advance": ("аванс", "advance"),
+    "final_amount": ("к выплате", "final_amount"),
+}
+COMMENT_ALIASES = ("комментарий", "comment")
+INT_FIELDS = ("shifts_main", "shifts_extra", "shifts_total")
+MONTH_ORDER = {m.upper(): i for i, m in enumerate(MONTHS_RU)}
+
+
+def _pick(columns: Dict[str, str], aliases: Tuple[str, ...]) -> Optional[str]:
+    for alias in aliases:
+        if alias in columns:
+            return columns[alias]
+    return None
+
+
+def _numeric(series: pd.Series) -> np.ndarray:
+    values = np.array(pd.to_numeric(series, errors="coerce"), dtype="float64")
+    values[~np.isfinite(values)] = 0.0
+    return values
+
+
+@dataclass(frozen=True)
+class SalarySnapshot:
+    """Typed columns of one month sheet, one entry per named row."""
+
+    month: str
+    names: Tuple[str, ...]
+    comments: Tuple[Optional[str], ...]
+    columns: Dict[str, np.ndarray]
+    positions: Dict[str, Tuple[int, ...]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row(self, pos: int, employee_id: str = "",
+            month: Optional[str] = None) -> SalaryRow:
+        values = {
+            field: (int(col[pos]) if field in INT_FIELDS else float(col[pos]))
+            for field, col in self.columns.items()
+        }
+        return SalaryRow(
+            employee_id=employee_id,
+            name=self.names[pos],
+            month=month or self.month,
+            comment=self.comments[pos],
+            **values,
+        )
+
+    def rows_for(self, name: str) -> List[int]:
+        """Positions of the rows of employee ``name`` in sheet order."""
+        return list(self.positions.get(name, ()))
+
+    def total(self, field: str) -> float:
+        return float(self.columns[field].sum())
+
+
+def build_snapshot(month: str, df: pd.DataFrame) -> Optional[SalarySnapshot]:
+    """Normalize a sheet as returned by :func:`excel.load_data`."""
+    df = df.rename(columns=lambda c: str(c).strip())
+    if NAME_COLUMN not in df.columns:
+        return None
+    names = df[NAME_COLUMN].where(df[NAME_COLUMN].notna(), "")
+    names = names.astype(str).str.strip()
+    df = df[names != ""]
+    names = names[names != ""]
+
+    lowered = {str(c).strip().lower(): c for c in df.columns}
+    columns: Dict[str, np.ndarray] = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        col = _pick(lowered, aliases)
+        if col is None:
+            values = np.zeros(len(df), dtype="float64")
+        else:
+            values = _numeric(df[col])
+        if field in INT_FIELDS:
+            values = np.trunc(values).astype("int64")
+        columns[field] = values
+    missing_total = columns["shifts_total"] == 0
+    columns["shifts_total"] = np.where(
+        missing_total,
+        columns["shifts_main"] + columns["shifts_extra"],
+        columns["shifts_total"],
+    )
+    # snapshots are shared between callers
+    for values in columns.values():
+        values.setflags(write=False)
+
+    comment_col = _pick(lowered, COMMENT_ALIASES)
+    if comment_col is None:
+        comments: Tuple[Optional[str], ...] = (None,) * len(df)
+    else:
+        raw = df[comment_col].where(df[comment_col].notna(), "")
+        comments = tuple(
+            text or None for text in raw.astype(str).str.strip())
+
+    positions: Dict[str, List[int]] = {}
+    for pos, name in enumerate(names):
+        positions.setdefault(name, []).append(pos)
+    return SalarySnapshot(
+        month=month,
+        names=tuple(names),
+        comments=comments,
+        columns=columns,
+        positions={k: tuple(v) for k, v in positions.items()},
+    )
+
+
+def save_snapshot(snapshot: SalarySnapshot, directory: Path) -> None:
+    """Write ``snapshot`` as one ``.npy`` file per column plus JSON."""
+    for field, values in snapshot.columns.items():
+        np.save(directory / f"{field}.npy", values)
+    meta = {
+        "month": snapshot.month,
+        "names": list(snapshot.names),
+        "comments": list(snapshot.comments),
+        "columns": list(snapshot.columns),
+    }
+    (directory / "meta.json").write_text(
+        json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+
+def load_snapshot(directory: Path) -> SalarySnapshot:
+    """Read a snapshot written by :func:`save_snapshot`, memory-mapped."""
+    meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+    columns = {
+        field: np.load(directory / f"{field}.npy", mmap_mode="r")
+        for field in meta["columns"]
+    }
+    positions: Dict[str, List[int]] = {}
+    for pos, name in enumerate(meta["names"]):
+        positions.setdefault(name, []).append(pos)
+    return SalarySnapshot(
+        month=meta["month"],
+        names=tuple(meta["names"]),
+        comments=tuple(meta["comments"]),
+        columns=columns,
+        positions={k: tuple(v) for k, v in positions.items()},
+    )
+
+
+def _stored(sheet: str, build) -> Optional[SalarySnapshot]:
+    return sheet_store.cached(
+        EXCEL_FILE, "salary", sheet, build, save_snapshot, load_snapshot)
+
+
+def get_snapshot(month: str) -> Optional[SalarySnapshot]:
+    """Return the snapshot of ``month`` for the current workbook version."""
+    month = month.upper()
+
+    def build() -> Optional[SalarySnapshot]:
+        df = load_data(sheet_name=month)
+        return build_snapshot(month, df) if df is not None else None
+
+    return workbook_cache.derived(
+        EXCEL_FILE, f"salary:{month}", lambda _path: _stored(month, build))
+
+
+def month_index(sheet_name: str) -> Optional[int]:
+    """Return 0-11 for month sheets such as "МАЙ" or "МАЙ 2025"."""
+    parts = str(sheet_name).split()
+    return MONTH_ORDER.get(parts[0].upper()) if parts else None
+
+
+def _read_sheets(path: str, sheets: List[str]) -> Dict[str, pd.DataFrame]:
+    """Worker entry point: parse several sheets with one workbook open."""
+    return read_sheets(path, sheets, header=1)
+
+
+def get_year_snapshots(workers: int = 0) -> List[SalarySnapshot]:
+    """Return snapshots of every month sheet in calendar order.
+
+    Sheets are read through the shared workbook cache, so the workbook is
+    opened once. With ``workers`` > 1 the sheets not cached yet are split
+    between that many processes, each opening the file once.
+    """
+    sheet_names = workbook_cache.sheet_names(EXCEL_FILE) or []
+    months = sorted(
+        (s for s in sheet_names if month_index(s) is not None),
+        key=month_index,
+    )
+    if workers > 1 and len(months) > 1:
+        _prefetch(months, workers)
+    result = []
+    for sheet in months:
+        snapshot = workbook_cache.derived(
+            EXCEL_FILE, f"salary:{sheet.upper()}",
+            lambda _path, sheet=sheet: _build_from_sheet(sheet))
+        if snapshot is not None:
+            result.append(snapshot)
+    return result
+
+
+def _build_from_sheet(sheet: str) -> Optional[SalarySnapshot]:
+    def build() -> Optional[SalarySnapshot]:
+        df = workbook_cache.sheet(EXCEL_FILE, sheet, header=1)
+        return build_snapshot(sheet.upper(), df) if df is not None else None
+
+    return _stored(sheet, build)
+
+
+def _prefetch(months: List[str], workers: int) -> None:
+    missing = [
+        m for m in months
+        if not workbook_cache.has_derived(EXCEL_FILE, f"salary:{m.upper()}")
+        and not sheet_store.contains(EXCEL_FILE, "salary", m)
+    ]
+    if len(missing) < 2:
+        return
+    workers = min(workers, len(missing))
+    chunks = [missing[i::workers] for i in range(workers)]
+    # fork would copy the threads of the bot and the API into the workers
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        parts = list(pool.map(_read_sheets, [EXCEL_FILE] * workers, chunks))
+    for frames in parts:
+        for sheet, df in frames.items():
+            snapshot = build_snapshot(sheet.upper(), df)
+            workbook_cache.derived(
+                EXCEL_FILE, f"salary:{sheet.upper()}",
+                lambda _path, sheet=sheet, snapshot=snapshot: _stored(
+                    sheet, lambda: snapshot))
@@ -0,0 +1,153 @@
+"""Lookup tables of the work schedule stored in the month sheets.
+
+A month sheet has the day numbers in its first two rows and one employee
+per row below, with the point code of each working day in the day's
+column. The sheet is scanned once per workbook version into three
+dictionaries (by day, by employee and by point), so schedule queries are
+plain dictionary lookups. The index is kept in the on-disk
+:mod:`sheet_store` as well.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ..config import EXCEL_FILE
+from ..core.constants import MONTHS_RU
+from . import sheet_store
+from .workbook_cache import workbook_cache
+
+POINTS = {
+    "Ц": "Цех",
+    "Ох": "Охта",
+    "М": "Меркурий",
+    "А": "Академка",
+    "Оз": "Озерки",
+    "П": "Пассаж",
+    "Р": "Рио",
+}
+HEADER_ROWS = 2
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+@dataclass(frozen=True)
+class ScheduleIndex:
+    """Assignments of one month sheet.
+
+    ``by_day`` maps day -> point code -> employee (the first employee of a
+    point wins, as in the sheet order), ``by_employee`` maps the lower-cased
+    employee name -> day -> point code and ``by_point`` maps point code ->
+    day -> employee.
+    """
+
+    sheet: str
+    by_day: Dict[int, Dict[str, str]] = field(default_factory=dict)
+    by_employee: Dict[str, Dict[int, str]] = field(default_factory=dict)
+    by_point: Dict[str, Dict[int, str]] = field(default_factory=dict)
+
+    def day(self, day: int) -> Dict[str, str]:
+        return self.by_day.get(day, {})
+
+    def employee(self, name: str) -> Dict[int, str]:
+        return self.by_employee.get(name.strip().lower(), {})
+
+    def point(self, code: str) -> Dict[int, str]:
+        return self.by_point.get(code, {})
+
+
+def build_index(sheet: str, df: pd.DataFrame) -> ScheduleIndex:
+    """Index a sheet read with ``header=None``."""
+    index = ScheduleIndex(sheet)
+    if df.shape[0] <= HEADER_ROWS or df.shape[1] < 2:
+        return index
+    days: Dict[int, int] = {}
+    for col in range(1, df.shape[1]):
+        for row in range(HEADER_ROWS):
+            text = _text(df.iat[row, col])
+            if text.isdigit() and 1 <= int(text) <= 31:
+                # the leftmost column of a day wins
+                days.setdefault(int(text), col)
+                break
+    names = [_text(v) for v in df.iloc[HEADER_ROWS:, 0]]
+    for day, col in sorted(days.items()):
+        codes = [_text(v) for v in df.iloc[HEADER_ROWS:, col]]
+        assigned = index.by_day.setdefault(day, {})
+        for name, code in zip(names, codes):
+            if code not in POINTS:
+                continue
+            if name:
+                index.by_employee.setdefault(name.lower(), {})[day] = code
+            if code not in assigned:
+                assigned[code] = name
+                index.by_point.setdefault(code, {})[day] = name
+    return index
+
+
+def save_index(index: ScheduleIndex, directory: Path) -> None:
+    data = {
+        "sheet": index.sheet,
+        "by_day": index.by_day,
+        "by_employee": index.by_employee,
+        "by_point": index.by_point,
+    }
+    (directory / "index.json").write_text(
+        json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def load_index(directory: Path) -> ScheduleIndex:
+    data = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+
+    def days(mapping: Dict[str, Dict[str, str]]) -> Dict[str, Dict[int, str]]:
+        # JSON object keys are strings, days are ints
+        return {key: {int(d): v for d, v in value.items()}
+                for key, value in mapping.items()}
+
+    return ScheduleIndex(
+        sheet=data["sheet"],
+        by_day={int(day): codes for day, codes in data["by_day"].items()},
+        by_employee=days(data["by_employee"]),
+        by_point=days(data["by_point"]),
+    )
+
+
+def find_month_sheet(sheet_names: List[str], month: int) -> Optional[str]:
+    """Return the sheet of ``month`` (1-12): exact name first, then prefix."""
+    name = MONTHS_RU[month - 1]
+    for candidate in (name, name.upper()):
+        if candidate in sheet_names:
+            return candidate
+    for title in sheet_names:
+        if title.startswith(name) or title.startswith(name.upper()):
+            return title
+    return None
+
+
+def get_schedule_index(month: int) -> Optional[ScheduleIndex]:
+    """Return the index of ``month`` for the current workbook version."""
+    try:
+        sheet_names = workbook_cache.sheet_names(EXCEL_FILE)
+    except Exception:
+        return None
+    sheet = find_month_sheet(sheet_names or [], month)
+    if sheet is None:
+        return None
+
+    def build() -> ScheduleIndex:
+        df = workbook_cache.sheet(EXCEL_FILE, sheet, header=None)
+        return build_index(sheet, df)
+
+    return workbook_cache.derived(
+        EXCEL_FILE, f"schedule:{sheet}",
+        lambda _path: sheet_store.cached(
+            EXCEL_FILE, "schedule", sheet, build, save_index, load_index))
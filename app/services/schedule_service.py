@@ -1,24 +1,12 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Dict, List
+from datetime import date, timedelta
+from typing import List
 
-import os
-from openpyxl import load_workbook
+from ..schemas.schedule import ScheduleAssignmentOut, SchedulePointOut
+from .schedule_index import POINTS, get_schedule_index
 
-from ..config import EXCEL_FILE
-from ..schemas.schedule import SchedulePointOut
-from ..core.constants import MONTHS_RU
-
-POINTS = {
-    "Ц": "Цех",
-    "Ох": "Охта",
-    "М": "Меркурий",
-    "А": "Академка",
-    "Оз": "Озерки",
-    "П": "Пассаж",
-    "Р": "Рио",
-}
+POINT_CODES = {name: code for code, name in POINTS.items()}
 
 
 class ScheduleService:
@@ -36,66 +24,8 @@ class ScheduleService:
         except Exception:
             return []
 
-        month_name = MONTHS_RU[day_date.month - 1]
-
-        if not os.path.exists(EXCEL_FILE):
-            return [
-                SchedulePointOut(point=name, short=code, employee="")
-                for code, name in POINTS.items()
-            ]
-
-        try:
-            wb = load_workbook(EXCEL_FILE, data_only=True)
-        except Exception:
-            return [
-                SchedulePointOut(point=name, short=code, employee="")
-                for code, name in POINTS.items()
-            ]
-
-        sheet = None
-        if month_name in wb.sheetnames:
-            sheet = wb[month_name]
-        elif month_name.upper() in wb.sheetnames:
-            sheet = wb[month_name.upper()]
-        else:
-            for title in wb.sheetnames:
-                if title.startswith(month_name) or title.startswith(
-                        month_name.upper()):
-                    sheet = wb[title]
-                    break
-
-        if sheet is None:
-            return [
-                SchedulePointOut(point=name, short=code, employee="")
-                for code, name in POINTS.items()
-            ]
-
-        day_col = None
-        target = str(day_date.day)
-        for col in range(1, sheet.max_column + 1):
-            v1 = str(sheet.cell(row=1, column=col).value or "").strip()
-            v2 = str(sheet.cell(row=2, column=col).value or "").strip()
-            if v1 == target or v2 == target:
-                day_col = col
-                break
-
-        if day_col is None:
-            return [
-                SchedulePointOut(point=name, short=code, employee="")
-                for code, name in POINTS.items()
-            ]
-
-        assignments: Dict[str, str] = {}
-        for row in range(3, sheet.max_row + 1):
-            code = str(sheet.cell(row=row, column=day_col).value or "").strip()
-            if code not in POINTS or code in assignments:
-                continue
-            employee_cell = sheet.cell(row=row, column=1).value
-            employee_name = str(employee_cell).strip() if employee_cell else ""
-            assignments[code] = employee_name
-            if len(assignments) == len(POINTS):
-                break
-
+        index = get_schedule_index(day_date.month)
+        assignments = index.day(day_date.day) if index else {}
         return [
             SchedulePointOut(
                 point=name,
@@ -104,3 +34,57 @@ class ScheduleService:
             )
             for code, name in POINTS.items()
         ]
+
+    async def get_employee_schedule(
+            self, name: str, year: int, month: int
+    ) -> List[ScheduleAssignmentOut]:
+        """Return the working days of ``name`` in the given month."""
+        index = get_schedule_index(month)
+        if index is None:
+            return []
+        return [
+            ScheduleAssignmentOut(
+                date=date(year, month, day).isoformat(),
+                point=POINTS[code],
+                short=code,
+                employee=name,
+            )
+            for day, code in sorted(index.employee(name).items())
+            if _valid_day(year, month, day)
+        ]
+
+    async def get_point_schedule(
+            self, code: str, start_str: str, days: int = 7
+    ) -> List[ScheduleAssignmentOut]:
+        """Return who works at point ``code`` on each of ``days`` days.
+
+        ``code`` may also be the point name, e.g. "Охта".
+        """
+        try:
+            start = date.fromisoformat(start_str)
+        except Exception:
+            return []
+        code = POINT_CODES.get(code, code)
+        if code not in POINTS:
+            return []
+        result = []
+        for offset in range(days):
+            day_date = start + timedelta(days=offset)
+            index = get_schedule_index(day_date.month)
+            employee = index.point(code).get(day_date.day) if index else None
+            if employee is not None:
+                result.append(ScheduleAssignmentOut(
+                    date=day_date.isoformat(),
+                    point=POINTS[code],
+                    short=code,
+                    employee=employee,
+                ))
+        return result
+
+
+def _valid_day(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
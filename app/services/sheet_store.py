@@ -0,0 +1,156 @@
+"""On-disk columnar store of data derived from the workbook sheets.
+
+Parsing a month sheet of the .xlsm takes seconds, and the bot and the API
+run as separate processes that would each parse it again after every
+restart. Normalized data (salary columns, the schedule index, comments)
+is therefore written once per sheet version next to the workbook:
+
+    .<workbook name>.store/v1/<kind>/<sheet>/<version>/
+
+Numeric columns are plain ``.npy`` files opened with ``mmap_mode="r"``,
+so loading a snapshot maps the file instead of reading or parsing it;
+the rest is small JSON. A sheet's version is the content fingerprint from
+:func:`workbook_cache.sheet_fingerprints`, so saving the workbook keeps
+the entries of sheets that did not change. Populate the store ahead of
+time with::
+
+    python -m app.services.sheet_store
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ..config import EXCEL_FILE, SHEET_STORE, SHEET_STORE_DIR
+from ..utils.logger import log
+from .workbook_cache import fingerprint, sheet_fingerprints, workbook_cache
+
+# bump when the layout of stored entries changes
+STORE_VERSION = 1
+
+
+def store_root(path: str | os.PathLike) -> Optional[Path]:
+    """Directory holding the entries of workbook ``path``, if enabled."""
+    if not SHEET_STORE:
+        return None
+    path = Path(path)
+    if SHEET_STORE_DIR:
+        root = Path(SHEET_STORE_DIR) / path.name
+    else:
+        root = path.parent / f".{path.name}.store"
+    return root / f"v{STORE_VERSION}"
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+def sheet_version(path: str | os.PathLike, sheet: Optional[str]) -> Any:
+    """Content fingerprint of ``sheet``, or of the whole file for ``None``.
+
+    Falls back to the file fingerprint for formats without per-sheet parts.
+    """
+    if sheet is not None:
+        parts = workbook_cache.derived(path, "sheet_fingerprints",
+                                       sheet_fingerprints) or {}
+        if sheet in parts:
+            return parts[sheet]
+    key = fingerprint(path)
+    return key[1:] if key else None
+
+
+def _entry(path: str | os.PathLike, kind: str,
+           sheet: Optional[str]) -> Optional[Path]:
+    root = store_root(path)
+    version = sheet_version(path, sheet)
+    if root is None or version is None:
+        return None
+    return root / kind / _digest(sheet) / _digest(version)
+
+
+def contains(path: str | os.PathLike, kind: str,
+             sheet: Optional[str] = None) -> bool:
+    entry = _entry(path, kind, sheet)
+    return entry is not None and entry.is_dir()
+
+
+def cached(
+    path: str | os.PathLike,
+    kind: str,
+    sheet: Optional[str],
+    build: Callable[[], Any],
+    save: Callable[[Any, Path], None],
+    load: Callable[[Path], Any],
+) -> Any:
+    """Return the stored ``kind`` data of ``sheet`` or build and store it.
+
+    ``sheet=None`` stores data derived from the whole workbook. ``save``
+    writes a value into an empty directory and ``load`` reads it back.
+    ``None`` values are not stored.
+    """
+    entry = _entry(path, kind, sheet)
+    if entry is None:
+        return build()
+    if entry.is_dir():
+        try:
+            return load(entry)
+        except Exception as exc:
+            log(f"⚠️ Discarding unreadable store entry {entry}: {exc}")
+            shutil.rmtree(entry, ignore_errors=True)
+    value = build()
+    if value is not None:
+        try:
+            _write(entry, save, value)
+        except Exception as exc:
+            log(f"⚠️ Failed to store {kind} of {sheet}: {exc}")
+    return value
+
+
+def _write(entry: Path, save: Callable[[Any, Path], None], value: Any) -> None:
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-"))
+    try:
+        save(value, tmp)
+        os.replace(tmp, entry)
+    except OSError:
+        # another process stored the same version first
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not entry.is_dir():
+            raise
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # older versions of the sheet are no longer reachable
+    for sibling in entry.parent.iterdir():
+        if sibling != entry and not sibling.name.startswith(".tmp-"):
+            shutil.rmtree(sibling, ignore_errors=True)
+
+
+def ingest_workbook() -> int:
+    """Store every month sheet of ``EXCEL_FILE``; returns the sheet count."""
+    from .excel import get_workbook_comments
+    from .salary_snapshot import get_year_snapshots, month_index
+    from .schedule_index import get_schedule_index
+
+    snapshots = get_year_snapshots()
+    for sheet in workbook_cache.sheet_names(EXCEL_FILE) or []:
+        index = month_index(sheet)
+        if index is not None:
+            get_schedule_index(index + 1)
+    get_workbook_comments()
+    log(f"📦 Workbook sheets stored: {len(snapshots)}")
+    return len(snapshots)
+
+
+def main(argv: list[str]) -> None:
+    count = ingest_workbook()
+    print(f"Stored {count} month sheets in {store_root(EXCEL_FILE)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,16 +1,16 @@
 """Employee helper functions using the local repository."""
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 
 from app.core.types import Employee, EmployeeStatus
-from app.data.employee_repository import EmployeeRepository
+from app.data.registry import get_employee_repository
 from ..utils.logger import log
 
-_repo = EmployeeRepository()
+_repo = get_employee_repository()
 
 
 def load_users() -> List[Dict[str, Any]]:
     """Return users as a list of objects suitable for frontend."""
-    path = getattr(_repo, "_storage").path
+    path = _repo.location
     log(f"📂 Загрузка сотрудников из: {path}")
     result: List[Dict[str, Any]] = []
     for emp in _repo.list_employees():
@@ -35,31 +35,22 @@ def load_users() -> List[Dict[str, Any]]:
 
 
 def load_users_map() -> Dict[str, Any]:
-    """Return users keyed by id for legacy handlers."""
-    return {str(u["id"]): {k: v for k, v in u.items() if k != "id"} for u in load_users()}
+    """Return copies of the stored user records keyed by id.
+
+    The records are taken as stored, so keys such as ``pending_change``
+    survive a later :func:`save_users`.
+    """
+    return _repo.records()
+
+
+def get_user(user_id: Any) -> Optional[Dict[str, Any]]:
+    """Return a copy of one stored user record, or ``None``."""
+    return _repo.get_record(str(user_id))
 
 
 def save_users(users: Dict[str, Any]) -> None:
     """Persist provided user dict via the repository."""
-    employees = []
-    for uid, data in users.items():
-        employees.append(
-            Employee(
-                id=str(uid),
-                name=data.get("name", ""),
-                full_name=data.get("full_name", ""),
-                phone=data.get("phone", ""),
-                position=data.get("position", ""),
-                is_admin=data.get("is_admin", False),
-                card_number=data.get("card_number", ""),
-                bank=data.get("bank", ""),
-                birthdate=data.get("birthdate"),
-                note=data.get("note", ""),
-                photo_url=data.get("photo_url", ""),
-                status=EmployeeStatus(data.get("status", "active")),
-            )
-        )
-    _repo.save_employees(employees)
+    _repo.replace_all(users)
 
 
 def load_users_dataclass() -> Dict[str, Employee]:
@@ -88,27 +79,17 @@ def add_user(user_id: str, user_data: Dict[str, Any]) -> None:
     _repo.add_employee(employee)
 
 
-def update_user(user_id: str, fields: Dict[str, Any]) -> None:
-    emp_dict = load_users_map().get(str(user_id))
-    if not emp_dict:
+def update_user(user_id: str, fields: Dict[str, Any],
+                remove: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+    """Patch a single user record in place of rewriting every user.
+
+    ``fields`` are merged into the record and ``remove`` keys dropped from
+    it. Returns the updated record, or ``None`` if the user is unknown.
+    """
+    updated = _repo.patch_record(str(user_id), fields, remove)
+    if updated is None:
         log(f"⚠️ update_user: user {user_id} not found")
-        return
-    emp_dict.update(fields)
-    employee = Employee(
-        id=str(user_id),
-        name=emp_dict.get("name", ""),
-        full_name=emp_dict.get("full_name", ""),
-        phone=emp_dict.get("phone", ""),
-        position=emp_dict.get("position", ""),
-        is_admin=emp_dict.get("is_admin", False),
-        card_number=emp_dict.get("card_number", ""),
-        bank=emp_dict.get("bank", ""),
-        birthdate=emp_dict.get("birthdate"),
-        note=emp_dict.get("note", ""),
-        photo_url=emp_dict.get("photo_url", ""),
-        status=EmployeeStatus(emp_dict.get("status", "active")),
-    )
-    _repo.update_employee(employee)
+    return updated
 
 
 def delete_user(user_id: str) -> None:
@@ -0,0 +1,211 @@
+"""In-memory cache of parsed Excel workbooks.
+
+Parsing the salary workbook takes seconds, while the bot and the admin API
+read the same sheets over and over. Parsed sheets are cached per workbook
+version, identified by the file's path, modification time and size, so an
+edit on disk is picked up on the next read without explicit invalidation.
+"""
+from __future__ import annotations
+
+import os
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.etree import ElementTree
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from openpyxl.workbook.workbook import Workbook
+
+from ..utils.logger import log
+from .workbook_reader import open_workbook, read_sheet
+
+# parsed sheets kept across all workbook versions, least recently used first
+MAX_SHEETS = 24
+
+Fingerprint = Tuple[str, int, int]
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def fingerprint(path: str | os.PathLike) -> Optional[Fingerprint]:
+    """Return ``(path, mtime_ns, size)`` of ``path`` or ``None`` if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def sheet_fingerprints(path: str | os.PathLike) -> Dict[str, Tuple[int, int]]:
+    """Return a content fingerprint for every sheet of an ``.xlsx``/``.xlsm``.
+
+    The fingerprint is the CRC of the sheet's XML part together with the CRC
+    of the shared strings it refers to, both read from the zip directory
+    without decompressing anything. Saving the workbook leaves untouched
+    sheets with the same fingerprint. Other formats yield an empty dict.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            crcs = {info.filename: info.CRC for info in archive.infolist()}
+            book = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+            rels = ElementTree.fromstring(
+                archive.read("xl/_rels/workbook.xml.rels"))
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        return {}
+    targets = {rel.get("Id"): rel.get("Target", "") for rel in rels}
+    shared = crcs.get("xl/sharedStrings.xml", 0)
+    result: Dict[str, Tuple[int, int]] = {}
+    for sheet in book.iter(f"{_NS_MAIN}sheet"):
+        target = targets.get(sheet.get(f"{_NS_REL}id"), "")
+        if target.startswith("/"):
+            member = target.lstrip("/")
+        else:
+            member = posixpath.normpath(posixpath.join("xl", target))
+        if member in crcs:
+            result[sheet.get("name")] = (crcs[member], shared)
+    return result
+
+
+class _Workbook:
+    """One version of a workbook with its lazily opened read-only book."""
+
+    def __init__(self, key: Fingerprint) -> None:
+        self.key = key
+        self.lock = threading.RLock()
+        self.derived: Dict[str, Any] = {}
+        self._book: Optional[Workbook] = None
+
+    @property
+    def book(self) -> Workbook:
+        if self._book is None:
+            self._book = open_workbook(self.key[0])
+        return self._book
+
+    def close(self) -> None:
+        # a reader still parsing keeps the file; it is released with it
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            if self._book is not None:
+                self._book.close()
+                self._book = None
+        finally:
+            self.lock.release()
+
+
+class WorkbookCache:
+    """LRU cache of parsed sheets keyed by workbook fingerprint.
+
+    Only the newest version of each path is kept open; older versions and
+    their sheets are dropped as soon as a change is detected. Callers get
+    copies of the cached DataFrames and may modify them freely.
+    """
+
+    def __init__(self, max_sheets: int = MAX_SHEETS) -> None:
+        self._max_sheets = max_sheets
+        self._lock = threading.RLock()
+        self._workbooks: Dict[str, _Workbook] = {}
+        self._sheet_names: Dict[Fingerprint, List[str]] = {}
+        self._sheets: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+    def _workbook(self, path: str | os.PathLike) -> Optional[_Workbook]:
+        key = fingerprint(path)
+        if key is None:
+            return None
+        with self._lock:
+            current = self._workbooks.get(key[0])
+            if current is None or current.key != key:
+                if current is not None:
+                    log(f"🔄 Workbook changed on disk: {key[0]}")
+                    self._drop(current)
+                current = _Workbook(key)
+                self._workbooks[key[0]] = current
+            return current
+
+    def _drop(self, workbook: _Workbook) -> None:
+        self._sheet_names.pop(workbook.key, None)
+        for cache_key in [k for k in self._sheets if k[0] == workbook.key]:
+            del self._sheets[cache_key]
+        workbook.close()
+
+    def sheet_names(self, path: str | os.PathLike) -> Optional[List[str]]:
+        """Return the sheet names of the current version of ``path``."""
+        workbook = self._workbook(path)
+        if workbook is None:
+            return None
+        with workbook.lock:
+            names = self._sheet_names.get(workbook.key)
+            if names is None:
+                names = list(workbook.book.sheetnames)
+                with self._lock:
+                    self._sheet_names[workbook.key] = names
+        return list(names)
+
+    def sheet(
+        self, path: str | os.PathLike, sheet_name: str, **read_kwargs: Any
+    ) -> Optional[pd.DataFrame]:
+        """Return a copy of ``sheet_name`` parsed with ``read_kwargs``."""
+        workbook = self._workbook(path)
+        if workbook is None:
+            return None
+        cache_key = (workbook.key, sheet_name,
+                     tuple(sorted(read_kwargs.items())))
+        with self._lock:
+            frame = self._sheets.get(cache_key)
+            if frame is not None:
+                self._sheets.move_to_end(cache_key)
+                return frame.copy()
+        with workbook.lock:
+            with self._lock:
+                frame = self._sheets.get(cache_key)
+            if frame is None:
+                frame = read_sheet(workbook.book, sheet_name, **read_kwargs)
+                with self._lock:
+                    # the file may have changed while parsing
+                    if self._workbooks.get(workbook.key[0]) is workbook:
+                        self._sheets[cache_key] = frame
+                        while len(self._sheets) > self._max_sheets:
+                            self._sheets.popitem(last=False)
+        return frame.copy()
+
+    def derived(
+        self,
+        path: str | os.PathLike,
+        name: str,
+        build: Callable[[str], Any],
+    ) -> Any:
+        """Return ``build(path)`` computed once per workbook version.
+
+        Used for indexes derived from the whole workbook (comments,
+        schedules, ...). The value is shared between callers and must be
+        treated as read-only.
+        """
+        workbook = self._workbook(path)
+        if workbook is None:
+            return None
+        with workbook.lock:
+            if name not in workbook.derived:
+                workbook.derived[name] = build(workbook.key[0])
+            return workbook.derived[name]
+
+    def has_derived(self, path: str | os.PathLike, name: str) -> bool:
+        workbook = self._workbook(path)
+        return workbook is not None and name in workbook.derived
+
+    def invalidate(self, path: str | os.PathLike | None = None) -> None:
+        """Forget ``path`` (or everything) regardless of its fingerprint."""
+        with self._lock:
+            if path is None:
+                targets = list(self._workbooks.values())
+            else:
+                workbook = self._workbooks.get(os.path.abspath(path))
+                targets = [workbook] if workbook else []
+            for workbook in targets:
+                self._workbooks.pop(workbook.key[0], None)
+                self._drop(workbook)
+
+
+workbook_cache = WorkbookCache()
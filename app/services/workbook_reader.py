@@ -0,0 +1,76 @@
+"""Streaming, read-only access to workbook sheets.
+
+Workbooks are opened with ``read_only=True`` so only the requested sheet
+is parsed, and rows are pulled with ``iter_rows(values_only=True)``
+without creating a cell object per value. The resulting DataFrames are
+identical to ``pd.read_excel`` output for the same ``header``.
+
+Comments and writes need the full workbook and keep using
+``load_workbook`` in normal mode (see :mod:`excel`).
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.workbook.workbook import Workbook
+from pandas.io.parsers import TextParser
+
+
+def open_workbook(path: str | os.PathLike) -> Workbook:
+    """Open ``path`` read-only with cached formula values.
+
+    The file stays open until ``close()`` is called on the workbook.
+    """
+    return load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def sheet_rows(book: Workbook, sheet_name: str) -> List[List[Any]]:
+    """Cell values of a sheet without trailing empty rows and columns.
+
+    Empty cells are returned as ``""``, as pandas does.
+    """
+    sheet = book[sheet_name]
+    # the stored dimensions are often wrong, let the rows decide
+    sheet.reset_dimensions()
+    data: List[List[Any]] = []
+    width = last = 0
+    for values in sheet.iter_rows(values_only=True):
+        row = ["" if v is None else v for v in values]
+        end = len(row)
+        while end and row[end - 1] == "":
+            end -= 1
+        del row[end:]
+        data.append(row)
+        if end:
+            last = len(data)
+            width = max(width, end)
+    del data[last:]
+    for row in data:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+    return data
+
+
+def read_sheet(
+    book: Workbook, sheet_name: str, header: Optional[int] = 0
+) -> pd.DataFrame:
+    """Return ``sheet_name`` of an open workbook as a DataFrame."""
+    data = sheet_rows(book, sheet_name)
+    if not data:
+        return pd.DataFrame()
+    return TextParser(data, header=header, skip_blank_lines=False).read()
+
+
+def read_sheets(
+    path: str | os.PathLike, sheet_names: Sequence[str],
+    header: Optional[int] = 0,
+) -> Dict[str, pd.DataFrame]:
+    """Read several sheets of ``path`` with a single open of the file."""
+    book = open_workbook(path)
+    try:
+        return {name: read_sheet(book, name, header) for name in sheet_names}
+    finally:
+        book.close()
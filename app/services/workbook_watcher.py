@@ -0,0 +1,154 @@
+"""Background watcher that prepares caches when the workbook is replaced.
+
+The caches already notice a changed workbook on the next read, but that
+read then pays for parsing. The watcher polls the workbook fingerprint,
+and once a new version has stopped changing (an upload in progress is not
+picked up half-written) it drops the old version and prewarms the current
+and previous month. Parsing runs in a spawned worker process that fills
+the on-disk :mod:`sheet_store`; this process then only maps the stored
+data. A worker still busy after ``WORKBOOK_PREWARM_TIMEOUT`` seconds is
+killed and the prewarm runs in-process instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import multiprocessing
+from datetime import date
+from typing import Any, Callable, List, Optional, Sequence
+
+from ..config import (
+    EXCEL_FILE,
+    SHEET_STORE,
+    WORKBOOK_PREWARM_TIMEOUT,
+    WORKBOOK_WATCH_INTERVAL,
+)
+from ..utils.logger import log
+from .salary_snapshot import get_snapshot
+from .schedule_index import find_month_sheet, get_schedule_index
+from .workbook_cache import Fingerprint, fingerprint, workbook_cache
+
+
+def recent_months(today: Optional[date] = None) -> List[int]:
+    """Return the current and the previous month numbers."""
+    today = today or date.today()
+    return [today.month, (today.month - 2) % 12 + 1]
+
+
+def prewarm(months: Sequence[int]) -> List[str]:
+    """Build the salary snapshot and schedule index of ``months``.
+
+    Returns the names of the sheets found. Safe to run in a worker
+    process: the results reach the caller through the sheet store.
+    """
+    sheets = workbook_cache.sheet_names(EXCEL_FILE) or []
+    warmed = []
+    for month in months:
+        sheet = find_month_sheet(sheets, month)
+        if sheet is None:
+            continue
+        get_snapshot(sheet)
+        get_schedule_index(month)
+        warmed.append(sheet)
+    return warmed
+
+
+class WorkbookWatcher:
+    """Polls ``EXCEL_FILE`` every ``interval`` seconds.
+
+    Callbacks registered with :meth:`on_change` (plain or async) run after
+    each prewarm, e.g. to refresh analytics.
+    """
+
+    def __init__(
+        self,
+        interval: float = WORKBOOK_WATCH_INTERVAL,
+        use_process: bool = SHEET_STORE,
+        timeout: float = WORKBOOK_PREWARM_TIMEOUT,
+    ) -> None:
+        self._interval = interval
+        self._use_process = use_process
+        self._timeout = timeout
+        self._callbacks: List[Callable[[], Any]] = []
+        self._seen: Optional[Fingerprint] = None
+        self._pending: Optional[Fingerprint] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def on_change(self, callback: Callable[[], Any]) -> None:
+        self._callbacks.append(callback)
+
+    def start(self) -> Optional[asyncio.Task]:
+        if self._interval <= 0 or self._task is not None:
+            return self._task
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        log(f"👀 Watching {EXCEL_FILE} every {self._interval}s")
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log(f"❌ Workbook watcher failed: {exc}")
+
+    async def check(self) -> bool:
+        """Handle a change seen on two polls in a row; True if handled."""
+        current = fingerprint(EXCEL_FILE)
+        if current is None or current == self._seen:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # still being written, wait for the next poll
+            self._pending = current
+            return False
+        self._seen, self._pending = current, None
+        await self._changed()
+        return True
+
+    async def _changed(self) -> None:
+        log(f"🔄 Workbook updated, prewarming: {EXCEL_FILE}")
+        workbook_cache.invalidate(EXCEL_FILE)
+        months = recent_months()
+        if self._use_process:
+            await self._prewarm_in_worker(months)
+        warmed = await asyncio.to_thread(prewarm, months)
+        log(f"✅ Prewarmed: {', '.join(warmed) or '-'}")
+        for callback in self._callbacks:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+    async def _prewarm_in_worker(self, months: List[int]) -> None:
+        # spawn: the bot and the API run threads, which fork does not copy
+        # safely. The worker imports only this module and the workbook
+        # caches, never the repositories, whose files this process owns.
+        process = multiprocessing.get_context("spawn").Process(
+            target=prewarm, args=(list(months),), name="prewarm", daemon=True)
+        try:
+            process.start()
+            await asyncio.to_thread(
+                process.join, self._timeout if self._timeout > 0 else None)
+            if process.is_alive():
+                log(f"⏱ Prewarm worker timed out after {self._timeout}s, "
+                    "parsing in-process")
+            elif process.exitcode:
+                log(f"⚠️ Prewarm worker exited with {process.exitcode}, "
+                    "parsing in-process")
+        except Exception as exc:
+            log(f"⚠️ Prewarm worker failed, parsing in-process: {exc}")
+        finally:
+            if process.is_alive():
+                process.terminate()
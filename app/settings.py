@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -7,12 +9,26 @@ class Settings(BaseSettings):
 
     telegram_bot_token: str = Field("dummy", env="TELEGRAM_BOT_TOKEN")
     excel_file: str = Field("data.xlsx", env="EXCEL_FILE")
+    salary_year_workers: int = Field(0, env="SALARY_YEAR_WORKERS")
+    sheet_store: bool = Field(True, env="SHEET_STORE")
+    sheet_store_dir: str | None = Field(None, env="SHEET_STORE_DIR")
+    workbook_watch_interval: float = Field(5.0, env="WORKBOOK_WATCH_INTERVAL")
+    workbook_prewarm_timeout: float = Field(
+        300.0, env="WORKBOOK_PREWARM_TIMEOUT")
+    render_workers: int = Field(2, env="RENDER_WORKERS")
+    render_queue_size: int = Field(16, env="RENDER_QUEUE_SIZE")
+    render_timeout: float = Field(60.0, env="RENDER_TIMEOUT")
     users_file: str = Field("user.json", env="USERS_FILE")
     advance_requests_file: str = Field(
         "advance_requests.json", env="ADVANCE_REQUESTS_FILE"
     )
+    payouts_journal: bool = Field(True, env="PAYOUTS_JOURNAL")
     adjustments_file: str = Field("adjustments.json", env="ADJUSTMENTS_FILE")
     vacations_file: str = Field("vacations.json", env="VACATIONS_FILE")
+    messages_file: str = Field("messages.json", env="MESSAGES_FILE")
+    storage_backend: Literal["json", "sqlite"] = Field(
+        "json", env="STORAGE_BACKEND")
+    database_file: str = Field("bot.sqlite3", env="DATABASE_FILE")
     admin_id: int = Field(0, env="ADMIN_ID")
     admin_chat_id: int = Field(5495663985, env="ADMIN_CHAT_ID")
     admin_login: str = Field("admin", env="ADMIN_LOGIN")
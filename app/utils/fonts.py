@@ -0,0 +1,57 @@
+"""Общие шрифты, замеры текста и плитки ячеек для PIL-отрисовки.
+
+Каждый шрифт загружается один раз на процесс, размеры повторяющихся
+подписей (числа дней, дни недели, коды точек, ключи отчёта) считаются
+один раз, а ячейки сетки расписания рисуются заранее и на картинку
+только копируются.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ..config import FONT_PATH
+
+FONT_FACES = ("arial.ttf", FONT_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    """Шрифт нужного размера: Arial, затем FONT_PATH, затем встроенный."""
+    for face in FONT_FACES:
+        try:
+            return ImageFont.truetype(face, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=4096)
+def text_length(text, size):
+    """Ширина строки для выравнивания, как у ``draw.textlength``."""
+    return get_font(size).getlength(text)
+
+
+@lru_cache(maxsize=4096)
+def text_size(text, size):
+    """Ширина и высота рамки текста, как у ``draw.textbbox``."""
+    left, top, right, bottom = get_font(size).getbbox(text)
+    return right - left, bottom - top
+
+
+@lru_cache(maxsize=1024)
+def cell_tile(text, width, height, fill, text_color="black", size=16):
+    """Готовая ячейка сетки: заливка, чёрная рамка и текст по центру.
+
+    Плитка на пиксель шире и выше ячейки, как прямоугольник
+    ``draw.rectangle([x0, y0, x0 + width, y0 + height])``, поэтому соседние
+    плитки делят рамку так же, как при рисовании по одной. Возвращаемое
+    изображение общее для всех вызовов — его нельзя изменять.
+    """
+    tile = Image.new("RGB", (width + 1, height + 1), "white")
+    draw = ImageDraw.Draw(tile)
+    draw.rectangle([0, 0, width, height], fill=fill, outline="black")
+    if text:
+        w, h = text_size(text, size)
+        draw.text(((width - w) / 2, (height - h) / 2), text,
+                  font=get_font(size), fill=text_color)
+    return tile
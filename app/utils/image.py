@@ -1,8 +1,14 @@
-from PIL import Image, ImageDraw, ImageFont
+from io import BytesIO
+
+from PIL import Image, ImageDraw
 import pandas as pd
-import os
+from .fonts import cell_tile, get_font, text_length, text_size
 from .logger import log
 
+# zlib level for rendered PNGs: the images are flat colours and text, so
+# fast levels compress almost as well as 9 at a fraction of the CPU time
+PNG_COMPRESS_LEVEL = 3
+
 COLORS = {
     "П": "#ADD8E6",  # голубой
     "Ц": "#8A2BE2",  # фиолетовый
@@ -17,15 +23,22 @@ COLORS = {
 }
 
 
-def create_combined_table_image(tables, filename="salary_report.png"):
+def to_png(img, compress_level=PNG_COMPRESS_LEVEL, optimize=False):
+    """Кодирует изображение в PNG в памяти и возвращает BytesIO с начала."""
+    buffer = BytesIO()
+    img.save(buffer, format="PNG", compress_level=compress_level,
+             optimize=optimize)
+    buffer.seek(0)
+    return buffer
+
+
+def create_combined_table_image(tables, compress_level=PNG_COMPRESS_LEVEL):
     """
-    Генерирует изображение с таблицами отчёта.
+    Генерирует изображение с таблицами отчёта и возвращает PNG в BytesIO.
     Заголовки таблиц центрируются, ключи выравниваются вправо, значения — влево.
     """
-    try:
-        font = ImageFont.truetype("arial.ttf", 18)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 18
+    font = get_font(font_size)
 
     padding = 40
     column_spacing = 20
@@ -85,7 +98,7 @@ def create_combined_table_image(tables, filename="salary_report.png"):
             fill="lightgray",
             outline="black",
         )
-        text_width = draw.textlength(table[0][0], font=font)
+        text_width = text_length(table[0][0], font_size)
         draw.text(
             ((img_width - text_width) / 2, y_offset + 15),
             table[0][0],
@@ -102,7 +115,7 @@ def create_combined_table_image(tables, filename="salary_report.png"):
                 continue
             key, value = row
             value_lines = value.split("\n")
-            key_x = padding + max_key_width - draw.textlength(key, font=font)
+            key_x = padding + max_key_width - text_length(key, font_size)
             value_x = padding + max_key_width + column_spacing
             draw.line(
                 [(padding, y_offset), (img_width - padding, y_offset)],
@@ -127,12 +140,12 @@ def create_combined_table_image(tables, filename="salary_report.png"):
         )
         y_offset += 15
 
-    img.save(filename)
-    return filename
+    return to_png(img, compress_level)
 
 
-def create_schedule_image(data, employee_name, sheet_name, weekdays):
-    """Создаёт изображение расписания для выбранного сотрудника и месяца."""
+def create_schedule_image(data, employee_name, sheet_name, weekdays,
+                          compress_level=PNG_COMPRESS_LEVEL):
+    """Создаёт изображение расписания сотрудника за месяц (PNG в BytesIO)."""
     compare_name = employee_name.lower()
     employee_rows = data[data["ИМЯ"].astype(str).str.lower() == compare_name]
     if employee_rows.empty:
@@ -196,17 +209,15 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
     img = Image.new("RGB", (img_width, img_height), "white")
     draw = ImageDraw.Draw(img)
 
-    try:
-        font = ImageFont.truetype("arial.ttf", 16)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 16
+    font = get_font(font_size)
+    weekend = [wd.lower() in ["сб", "вс"] for wd in day_weekdays]
 
     draw.rectangle(
         [0, 0, img_width, month_header_height], fill="#E0E0E0", outline="black"
     )
     month_text = sheet_name.upper()
-    bbox = draw.textbbox((0, 0), month_text, font=font)
-    w_text, h_text = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w_text, h_text = text_size(month_text, font_size)
     draw.text(
         ((img_width - w_text) / 2, (month_header_height - h_text) / 2),
         month_text,
@@ -214,6 +225,8 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
         fill="black",
     )
 
+    # Ячейки сетки повторяются из месяца в месяц, поэтому они берутся
+    # готовыми плитками и только копируются на картинку.
     y_daynum_top = month_header_height
     y_daynum_bottom = y_daynum_top + daynum_header_height
     draw.rectangle(
@@ -223,28 +236,13 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
     )
     for i, day in enumerate(day_numbers):
         x0 = left_width + i * cell_width
-        x1 = x0 + cell_width
-        fill_color = (
-            "#FF0000" if day_weekdays[i].lower() in ["сб", "вс"] else "#D3D3D3"
-        )
-        text_color = (
-            "white" if day_weekdays[i].lower() in ["сб", "вс"] else "black"
-        )
-        draw.rectangle(
-            [x0, y_daynum_top, x1, y_daynum_bottom],
-            fill=fill_color,
-            outline="black",
+        fill_color, text_color = (
+            ("#FF0000", "white") if weekend[i] else ("#D3D3D3", "black")
         )
-        bbox = draw.textbbox((0, 0), day, font=font)
-        w_day, h_day = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (
-                x0 + (cell_width - w_day) / 2,
-                y_daynum_top + (daynum_header_height - h_day) / 2,
-            ),
-            day,
-            font=font,
-            fill=text_color,
+        img.paste(
+            cell_tile(day, cell_width, daynum_header_height,
+                      fill_color, text_color, font_size),
+            (x0, y_daynum_top),
         )
 
     y_weekday_top = y_daynum_bottom
@@ -256,24 +254,13 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
     )
     for i, wd in enumerate(day_weekdays):
         x0 = left_width + i * cell_width
-        x1 = x0 + cell_width
-        fill_color = "#FF0000" if wd.lower() in ["сб", "вс"] else "#A9A9A9"
-        text_color = "white" if wd.lower() in ["сб", "вс"] else "black"
-        draw.rectangle(
-            [x0, y_weekday_top, x1, y_weekday_bottom],
-            fill=fill_color,
-            outline="black",
+        fill_color, text_color = (
+            ("#FF0000", "white") if weekend[i] else ("#A9A9A9", "black")
         )
-        bbox = draw.textbbox((0, 0), wd, font=font)
-        w_wd, h_wd = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (
-                x0 + (cell_width - w_wd) / 2,
-                y_weekday_top + (weekday_header_height - h_wd) / 2,
-            ),
-            wd,
-            font=font,
-            fill=text_color,
+        img.paste(
+            cell_tile(wd, cell_width, weekday_header_height,
+                      fill_color, text_color, font_size),
+            (x0, y_weekday_top),
         )
 
     y_data_top = y_weekday_bottom
@@ -283,8 +270,7 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
         fill="#D3D3D3",
         outline="black",
     )
-    bbox = draw.textbbox((0, 0), employee_name, font=font)
-    w_emp, h_emp = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w_emp, h_emp = text_size(employee_name, font_size)
     draw.text(
         ((left_width - w_emp) / 2, y_data_top + (data_row_height - h_emp) / 2),
         employee_name,
@@ -293,31 +279,14 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
     )
     for i, val_str in enumerate(schedule_values):
         x0 = left_width + i * cell_width
-        y0 = y_data_top
-        cell_bg = (
-            "#FF0000" if day_weekdays[i].lower() in ["сб", "вс"] else "#FFFFFF"
-        )
-        text_color = (
-            "white" if day_weekdays[i].lower() in ["сб", "вс"] else "black"
+        cell_bg, text_color = (
+            ("#FF0000", "white") if weekend[i] else ("#FFFFFF", "black")
         )
-        draw.rectangle(
-            [x0, y0, x0 + cell_width, y0 + data_row_height],
-            fill=cell_bg,
-            outline="black",
-        )
-        bbox = draw.textbbox((0, 0), val_str, font=font)
-        w_val, h_val = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (
-                x0 + (cell_width - w_val) / 2,
-                y0 + (data_row_height - h_val) / 2,
-            ),
-            val_str,
-            font=font,
-            fill=text_color,
+        img.paste(
+            cell_tile(val_str, cell_width, data_row_height,
+                      cell_bg, text_color, font_size),
+            (x0, y_data_top),
         )
 
-    filename = f"schedule_{employee_name}.png"
-    img.save(filename)
-    log(f"✅ [create_schedule_image] Файл создан: {filename}")
-    return filename
+    log(f"✅ [create_schedule_image] Изображение создано: {employee_name}")
+    return to_png(img, compress_level)
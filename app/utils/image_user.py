@@ -1,6 +1,9 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import pandas as pd
 
+from .fonts import cell_tile, get_font, text_length, text_size
+from .image import PNG_COMPRESS_LEVEL, to_png
+
 COLORS = {
     "П": "#ADD8E6",  # голубой
     "Ц": "#8A2BE2",  # фиолетовый
@@ -13,15 +16,13 @@ COLORS = {
 }
 
 
-def create_schedule_image(tables, filename="salary_report.png"):
+def create_schedule_image(tables, compress_level=PNG_COMPRESS_LEVEL):
     """
-    Генерирует изображение с таблицами отчёта.
+    Генерирует изображение с таблицами отчёта и возвращает PNG в BytesIO.
     Заголовки таблиц центрируются, ключи выравниваются вправо, значения — влево.
     """
-    try:
-        font = ImageFont.truetype("arial.ttf", 18)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 18
+    font = get_font(font_size)
 
     padding = 40
     column_spacing = 20
@@ -81,7 +82,7 @@ def create_schedule_image(tables, filename="salary_report.png"):
             fill="lightgray",
             outline="black",
         )
-        text_width = draw.textlength(table[0][0], font=font)
+        text_width = text_length(table[0][0], font_size)
         draw.text(
             ((img_width - text_width) / 2, y_offset + 15),
             table[0][0],
@@ -98,7 +99,7 @@ def create_schedule_image(tables, filename="salary_report.png"):
                 continue
             key, value = row
             value_lines = value.split("\n")
-            key_x = padding + max_key_width - draw.textlength(key, font=font)
+            key_x = padding + max_key_width - text_length(key, font_size)
             value_x = padding + max_key_width + column_spacing
             draw.line(
                 [(padding, y_offset), (img_width - padding, y_offset)],
@@ -123,11 +124,11 @@ def create_schedule_image(tables, filename="salary_report.png"):
         )
         y_offset += 15
 
-    img.save(filename)
-    return filename
+    return to_png(img, compress_level)
 
 
-def create_schedule_image_user(data, employee_name, sheet_name):
+def create_schedule_image_user(data, employee_name, sheet_name,
+                               compress_level=PNG_COMPRESS_LEVEL):
     employee_row = data[data["ИМЯ"] == employee_name]
 
     if employee_row.empty:
@@ -163,17 +164,14 @@ def create_schedule_image_user(data, employee_name, sheet_name):
     img = Image.new("RGB", (img_width, img_height), "white")
     draw = ImageDraw.Draw(img)
 
-    try:
-        font = ImageFont.truetype("arial.ttf", 16)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 16
+    font = get_font(font_size)
 
     # Название месяца сверху
     draw.rectangle(
         [0, 0, img_width, month_header_height], fill="#E0E0E0", outline="black"
     )
-    bbox = draw.textbbox((0, 0), sheet_name, font=font)
-    w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w, h = text_size(sheet_name, font_size)
     draw.text(
         ((img_width - w) / 2, (month_header_height - h) / 2),
         sheet_name,
@@ -184,26 +182,10 @@ def create_schedule_image_user(data, employee_name, sheet_name):
     # Заголовки дней
     for i, day in enumerate(days):
         x0 = left_width + i * cell_width
-        draw.rectangle(
-            [
-                x0,
-                month_header_height,
-                x0 + cell_width,
-                month_header_height + header_height,
-            ],
-            fill="#D3D3D3",
-            outline="black",
-        )
-        bbox = draw.textbbox((0, 0), day, font=font)
-        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (
-                x0 + (cell_width - w) / 2,
-                month_header_height + (header_height - h) / 2,
-            ),
-            day,
-            font=font,
-            fill="black",
+        img.paste(
+            cell_tile(day, cell_width, header_height, "#D3D3D3",
+                      size=font_size),
+            (x0, month_header_height),
         )
 
     # Дни недели
@@ -211,26 +193,10 @@ def create_schedule_image_user(data, employee_name, sheet_name):
     weekdays = weekdays[: len(days)]
     for i, weekday in enumerate(weekdays):
         x0 = left_width + i * cell_width
-        draw.rectangle(
-            [
-                x0,
-                month_header_height + header_height,
-                x0 + cell_width,
-                month_header_height + header_height * 2,
-            ],
-            fill="#A9A9A9",
-            outline="black",
-        )
-        bbox = draw.textbbox((0, 0), weekday, font=font)
-        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (
-                x0 + (cell_width - w) / 2,
-                month_header_height + header_height + (header_height - h) / 2,
-            ),
-            weekday,
-            font=font,
-            fill="black",
+        img.paste(
+            cell_tile(weekday, cell_width, header_height, "#A9A9A9",
+                      size=font_size),
+            (x0, month_header_height + header_height),
         )
 
     # Имя сотрудника
@@ -239,8 +205,7 @@ def create_schedule_image_user(data, employee_name, sheet_name):
         fill="#D3D3D3",
         outline="black",
     )
-    bbox = draw.textbbox((0, 0), employee_name, font=font)
-    w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w, h = text_size(employee_name, font_size)
     draw.text(
         (
             (left_width - w) / 2,
@@ -252,30 +217,18 @@ def create_schedule_image_user(data, employee_name, sheet_name):
     )
 
     # Заполнение таблицы расписания
+    y0 = month_header_height + header_height * 2
     for i, day in enumerate(days):
         x0 = left_width + i * cell_width
-        y0 = month_header_height + header_height * 2
         val_str = (
             ""
             if pd.isna(employee_row.iloc[0][day])
             else str(employee_row.iloc[0][day])
         )
         color = COLORS.get(val_str, COLORS["default"])
-        draw.rectangle(
-            [x0, y0, x0 + cell_width, y0 + cell_height],
-            fill=color,
-            outline="black",
-        )
-        bbox = draw.textbbox((0, 0), val_str, font=font)
-        w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-        draw.text(
-            (x0 + (cell_width - w) / 2, y0 + (cell_height - h) / 2),
-            val_str,
-            font=font,
-            fill="black",
+        img.paste(
+            cell_tile(val_str, cell_width, cell_height, color, size=font_size),
+            (x0, y0),
         )
 
-    filename = f"schedule_{employee_name}.png"
-    img.save(filename)
-
-    return filename
+    return to_png(img, compress_level)
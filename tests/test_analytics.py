@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import analytics, analytics_cube, salary_snapshot
+from app.services import workbook_cache as wc
+
+
+def _workbook(path, may_repair=100):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for month, repair in (("МАЙ", may_repair), ("ИЮНЬ", 50), ("Итоги", 999)):
+        ws = wb.create_sheet(month)
+        ws.append(["Продажи"])
+        ws.append(["ИМЯ", "Ремонт", "Косметика"])
+        ws.append(["Анна", repair, 10])
+        ws.append(["Олег", 0, "n/a"])
+    wb.save(path)
+
+
+def test_only_changed_sheets_are_aggregated(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    monkeypatch.setattr(analytics, "workbook_cache", wc.WorkbookCache())
+    seen = []
+    original = analytics.aggregate_sheet
+
+    def aggregate(df):
+        seen.append(df.iloc[0]["Ремонт"])
+        return original(df)
+
+    monkeypatch.setattr(analytics, "aggregate_sheet", aggregate)
+    service = analytics.AnalyticsService(str(path))
+
+    data = asyncio.run(service.get_sales())
+    assert (data["repair_sum"], data["repair_count"]) == (150, 2)
+    assert (data["cosmetics_sum"], data["cosmetics_count"]) == (20, 2)
+    assert sorted(seen) == [50, 100]
+    assert asyncio.run(service.get_sales()) is data
+
+    _workbook(path, may_repair=300)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert service.is_stale()
+    data = asyncio.run(service.get_sales())
+    assert data["repair_sum"] == 350
+    assert sorted(seen) == [50, 100, 300]
+
+    asyncio.run(service.refresh_sales())
+    assert len(seen) == 3
+
+
+def test_sheet_fingerprints_follow_sheet_content(tmp_path):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    before = wc.sheet_fingerprints(path)
+    _workbook(path, may_repair=300)
+    after = wc.sheet_fingerprints(path)
+    assert set(before) == {"МАЙ", "ИЮНЬ", "Итоги"}
+    assert before["ИЮНЬ"] == after["ИЮНЬ"]
+    assert before["МАЙ"] != after["МАЙ"]
+    assert wc.sheet_fingerprints(tmp_path / "missing.xlsx") == {}
+
+
+def test_cube_slices_and_rolls_up(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    wb = Workbook()
+    wb.remove(wb.active)
+    for month, rows in (
+        ("ИЮНЬ", [("Анна", 300, 0, 0), ("Олег", 100, 40, 0)]),
+        ("МАЙ", [("Анна", 100, 20, 5), ("Анна", 200, 0, 0)]),
+    ):
+        ws = wb.create_sheet(month)
+        ws.append(["Зарплата"])
+        ws.append(["ИМЯ", "Ремонт", "Косметика", "Бонус"])
+        for row in rows:
+            ws.append(list(row))
+    wb.save(path)
+    cache = wc.WorkbookCache()
+    for module in (salary_snapshot, analytics_cube):
+        monkeypatch.setattr(module, "EXCEL_FILE", str(path))
+        monkeypatch.setattr(module, "workbook_cache", cache)
+
+    service = analytics.AnalyticsService(str(path))
+    data = asyncio.run(service.get_cube(group_by=["category"]))
+    assert data["members"]["month"] == ["МАЙ", "ИЮНЬ"]
+    repair = data["rows"][0]
+    assert repair["category"] == "Ремонт"
+    assert (repair["sum"], repair["count"], repair["mean"]) == (700, 4, 175)
+    assert repair["p50"] == 150
+    assert [r["category"] for r in data["rows"]] == ["Ремонт", "Косметика", "Бонус"]
+
+    rows = asyncio.run(service.get_cube(
+        employee=["Анна"], category=["salary_repair"],
+        group_by=["month", "employee"]))["rows"]
+    assert [(r["month"], r["employee"], r["sum"], r["count"]) for r in rows] == [
+        ("МАЙ", "Анна", 300, 2), ("ИЮНЬ", "Анна", 300, 1)]
+
+    cells = asyncio.run(service.get_cube(month=["май"]))["rows"]
+    assert [(r["category"], r["sum"]) for r in cells] == [
+        ("Ремонт", 300), ("Косметика", 20), ("Бонус", 5)]
+    assert analytics_cube.get_cube() is analytics_cube.get_cube()
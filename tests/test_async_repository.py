@@ -0,0 +1,25 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.data.async_repository import AsyncRepository
+from app.data.vacation_repository import VacationRepository
+
+
+def test_concurrent_writes_are_serialized(tmp_path):
+    path = tmp_path / "vacations.json"
+    path.write_text("[]", encoding="utf-8")
+    repo = AsyncRepository(VacationRepository(str(path)))
+
+    async def run():
+        await asyncio.gather(
+            *(repo.create({"employee_id": str(i)}) for i in range(20)))
+        return await repo.list()
+
+    rows = asyncio.run(run())
+    assert sorted(r["id"] for r in rows) == list(range(1, 21))
+    # the wrapped repository is still usable synchronously
+    assert len(repo.repo.list()) == 20
@@ -1,3 +1,4 @@
+from datetime import datetime
 from types import SimpleNamespace
 from io import BytesIO
 from PyPDF2 import PdfReader
@@ -9,10 +10,22 @@ class DummyEmpRepo:
     def list_employees(self):
         return [SimpleNamespace(id="1", full_name="Test", name="Tester", birthdate=None)]
 
+    def get_by_id(self, employee_id):
+        return next((e for e in self.list_employees() if e.id == employee_id), None)
+
 
 class DummyPayoutRepo:
     def list(self, employee_id=None, *args, **kwargs):
-        return [{"timestamp": "2025-05-01 12:00:00", "amount": 100, "status": "Pending"}]
+        return [
+            {"timestamp": "2025-05-01 12:00:00", "amount": 100, "status": "Pending"},
+            {"timestamp": "вчера", "amount": 999, "status": "Pending"},
+        ]
+
+    def timestamp_of(self, record):
+        try:
+            return datetime.strptime(record.get("timestamp"), "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return None
 
 
 class DummyVacRepo:
@@ -32,3 +45,4 @@ def test_generate_employee_profile_pdf():
     assert "Telegram ID: 1" in text
     assert "2025-05-01" in text
     assert "PAYOUT HISTORY" in text
+    assert "999" not in text
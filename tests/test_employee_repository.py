@@ -0,0 +1,65 @@
+import json
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.core.types import Employee
+from app.data.employee_repository import EmployeeRepository
+from app.data.json_storage import JsonStorage
+
+
+def _repo(tmp_path):
+    path = tmp_path / "user.json"
+    path.write_text(json.dumps({
+        "1": {"name": "Анна", "full_name": "Анна А.", "phone": "1",
+              "birthdate": "1990-01-02", "status": "active"},
+        "2": {"name": "Олег", "full_name": "Олег О.", "phone": "2",
+              "status": "inactive"},
+    }), encoding="utf-8")
+    return EmployeeRepository(JsonStorage(path, delay=0))
+
+
+def test_parsed_employees_are_cached_until_mutation(tmp_path):
+    repo = _repo(tmp_path)
+    first = repo.list_employees()
+    assert [e.id for e in first] == ["1", "2"]
+    assert repo.list_employees()[0] is first[0]
+    assert repo.get_by_id(1) is first[0]
+    assert repo.get_by_name("Олег") is first[1]
+    assert repo.get_by_name("nobody") is None
+
+    version = repo.version
+    repo.update_employee(replace(first[0], note="new"))
+    assert repo.version == version + 1
+    assert repo.get_by_id("1").note == "new"
+    assert first[0].note == ""
+
+    repo.delete_employee_by_id("2")
+    assert repo.get_by_name("Олег") is None
+    repo.add_employee(Employee(id="3", name="Олег", full_name="", phone=""))
+    assert repo.get_by_name("Олег").id == "3"
+    # a shared name resolves to the last employee with it
+    repo.add_employee(Employee(id="4", name="Олег", full_name="", phone=""))
+    assert repo.get_by_name("Олег").id == "4"
+
+
+def test_patch_record_keeps_extra_keys(tmp_path):
+    repo = _repo(tmp_path)
+    repo.patch_record("1", {"pending_change": {"field": "bank", "value": "Т"}})
+    record = repo.get_record("1")
+    assert record["pending_change"] == {"field": "bank", "value": "Т"}
+    assert record["birthdate"] == "1990-01-02"
+
+    version = repo.version
+    updated = repo.patch_record("1", {"bank": "Т"}, remove=("pending_change",))
+    assert "pending_change" not in updated
+    assert repo.version == version + 1
+    assert repo.get_by_id("1").bank == "Т"
+    assert repo.patch_record("404", {"bank": "x"}) is None
+
+    records = repo.records()
+    records["2"]["name"] = "changed"
+    assert repo.get_record("2")["name"] == "Олег"
@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import excel
+from app.services.excel_writer import ExcelWriteQueue
+
+
+def _workbook(path):
+    wb = Workbook()
+    wb.active.title = "МАЙ"
+    wb.active["A1"] = "ИМЯ"
+    wb.save(path)
+    os.chmod(path, 0o664)
+
+
+def test_concurrent_updates_share_one_save(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    saves = []
+    original = ExcelWriteQueue._save
+
+    def save(self, workbook):
+        saves.append(1)
+        original(self, workbook)
+
+    monkeypatch.setattr(ExcelWriteQueue, "_save", save)
+    queue = ExcelWriteQueue(path, delay=0.2)
+
+    futures = []
+    threads = [
+        threading.Thread(
+            target=lambda i=i: futures.append(queue.submit("МАЙ", f"B{i}", i)))
+        for i in range(1, 6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(f.result(timeout=5) for f in futures)
+    assert len(saves) == 1
+
+    results = queue.update_many([
+        ("МАЙ", "C1", "ok"), ("ИЮНЬ", "A1", 1), ("МАЙ", "not a cell", 1)])
+    assert results == [True, False, False]
+    assert len(saves) == 2
+
+    sheet = load_workbook(path)["МАЙ"]
+    assert [sheet[f"B{i}"].value for i in range(1, 6)] == [1, 2, 3, 4, 5]
+    assert sheet["C1"].value == "ok"
+    assert os.stat(path).st_mode & 0o777 == 0o664
+    assert os.listdir(tmp_path) == ["data.xlsx"]
+
+
+def test_update_cell_waits_for_its_result(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    monkeypatch.setattr(excel, "excel_writer", ExcelWriteQueue(path, delay=0))
+
+    assert excel.update_cell("МАЙ", "B2", 7) is True
+    assert excel.update_cell("МАРТ", "B2", 7) is False
+    assert load_workbook(path)["МАЙ"]["B2"].value == 7
+
+
+def test_lone_update_cell_skips_the_batching_delay(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    queue = ExcelWriteQueue(path, delay=30)
+    monkeypatch.setattr(excel, "excel_writer", queue)
+
+    started = time.monotonic()
+    assert excel.update_cell("МАЙ", "B2", 7) is True
+    assert time.monotonic() - started < 10
+
+    # an update already waiting is saved together with the eager one
+    queued = queue.submit("МАЙ", "B3", 8)
+    eager = queue.submit("МАЙ", "B4", 9, eager=True)
+    assert not eager.done()
+    queue.flush()
+    assert queued.result() and eager.result()
+    sheet = load_workbook(path)["МАЙ"]
+    assert [sheet[f"B{i}"].value for i in (2, 3, 4)] == [7, 8, 9]
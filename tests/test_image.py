@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.utils.image import create_combined_table_image, create_schedule_image
+
+
+def test_renderers_return_png_without_touching_disk(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tables = [[["Зарплата"], ["Смены", "10"], ["Итого", "1000 ₽\nаванс"]]]
+    report = create_combined_table_image(tables)
+    assert Image.open(report).format == "PNG"
+    fast = create_combined_table_image(tables, compress_level=1)
+    assert fast.getvalue() != report.getvalue()
+
+    data = pd.DataFrame({
+        "ИМЯ": ["анна"], "Смен": [2], "1": ["Ох"], "2": ["М"],
+    })
+    schedule = create_schedule_image(data, "Анна", "МАЙ", ["чт", "пт"])
+    assert Image.open(schedule).size[0] > 0
+    assert create_combined_table_image([]) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_schedule_grid_reuses_fonts_and_tiles():
+    from app.utils import fonts
+
+    assert fonts.get_font(16) is fonts.get_font(16)
+    data = pd.DataFrame({
+        "ИМЯ": ["анна"], "Смен": [2], "1": ["Ох"], "2": ["Ох"],
+    })
+    first = create_schedule_image(data, "Анна", "МАЙ", ["пн", "пн"])
+    misses = fonts.cell_tile.cache_info().misses
+    second = create_schedule_image(data, "Анна", "МАЙ", ["пн", "пн"])
+    assert fonts.cell_tile.cache_info().misses == misses
+    assert second.getvalue() == first.getvalue()
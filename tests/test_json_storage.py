@@ -0,0 +1,58 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.data.json_storage import JsonStorage, flush_all
+
+
+def test_saves_are_coalesced_until_flush(tmp_path):
+    path = tmp_path / "users.json"
+    storage = JsonStorage(path, delay=60)
+    writes = []
+    original = storage._write
+    storage._write = lambda data: (writes.append(data), original(data))
+
+    for i in range(5):
+        storage.save({"n": i})
+    assert not path.exists()
+
+    storage.flush()
+    assert writes == [{"n": 4}]
+    assert json.loads(path.read_text(encoding="utf-8")) == {"n": 4}
+    # nothing pending, a second flush is a no-op
+    storage.flush()
+    assert len(writes) == 1
+
+
+def test_debounced_save_is_written_in_background(tmp_path):
+    path = tmp_path / "users.json"
+    storage = JsonStorage(path, delay=0.05)
+    storage.save({"a": 1})
+    storage.save({"a": 2})
+    deadline = time.time() + 2
+    while not path.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    assert json.loads(path.read_text(encoding="utf-8")) == {"a": 2}
+
+
+def test_write_is_atomic_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text('{"old": true}', encoding="utf-8")
+    storage = JsonStorage(path, delay=60)
+    storage.save({"new": True})
+    flush_all()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"new": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["users.json"]
+
+
+def test_write_keeps_file_mode(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text("{}", encoding="utf-8")
+    path.chmod(0o644)
+    storage = JsonStorage(path, delay=0)
+    storage.save({"a": 1})
+    assert path.stat().st_mode & 0o777 == 0o644
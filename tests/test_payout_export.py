@@ -0,0 +1,95 @@
+import asyncio
+import csv
+import io
+import sys
+from pathlib import Path
+
+from openpyxl import load_workbook
+from PyPDF2 import PdfReader
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.data.payout_repository import PayoutRepository
+from app.services import payout_export
+from app.services.payout_export import (
+    iter_payouts,
+    stream_csv,
+    stream_pdf,
+    stream_xlsx,
+)
+from app.services.payout_service import PayoutService
+
+
+def _repo(tmp_path, count):
+    path = tmp_path / "payouts.json"
+    path.write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(str(path), journal=True)
+    for i in range(count):
+        repo.create({
+            "user_id": str(i % 2),
+            "name": f"Сотрудник {i}",
+            "amount": 100 + i,
+            "method": "💳 На карту",
+            "payout_type": "Аванс",
+            "status": "Ожидает",
+            "timestamp": f"2025-05-01 {i // 60:02d}:{i % 60:02d}:00",
+        })
+    return repo
+
+
+def test_rows_are_read_page_by_page(tmp_path):
+    repo = _repo(tmp_path, 7)
+    calls = []
+    get_many = repo.get_many
+
+    def tracked(ids):
+        calls.append(len(ids))
+        return get_many(ids)
+
+    repo.get_many = tracked
+    rows = iter_payouts(repo, page_size=3, employee_id="0")
+    first = next(rows)
+    # deleted mid-export: skipped without shifting the next page
+    doomed = repo.list(employee_id="0")[3]
+    repo.delete(doomed["id"])
+    rows = [first, *rows]
+    assert [r["amount"] for r in rows] == [106, 104, 102]
+    assert calls == [3, 1]
+
+
+def test_formats_stream_without_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    repo = _repo(tmp_path, 120)
+    rows = list(iter_payouts(repo))
+
+    reader = PdfReader(io.BytesIO(b"".join(stream_pdf(rows))))
+    text = "".join(page.extract_text() for page in reader.pages)
+    assert len(reader.pages) > 1
+    assert "Отчёт по выплатам" in text and "Сотрудник 119" in text
+    # the font has no emoji: substituted, not dropped
+    assert "? На карту" in text
+
+    table = list(csv.reader(io.StringIO(
+        b"".join(stream_csv(rows)).decode("utf-8-sig"))))
+    assert table[0][:2] == ["Дата", "Сотрудник"] and len(table) == 121
+
+    book = load_workbook(io.BytesIO(b"".join(stream_xlsx(rows))))
+    sheet = book.active
+    assert sheet.max_row == 121
+    assert sheet["B2"].value == "Сотрудник 119" and sheet["C2"].value == 219
+
+    service = PayoutService(repo=repo)
+    assert asyncio.run(service.export("csv", employee_id="nobody")) is None
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "payouts.json", "payouts.json.wal"]
+
+
+def test_pdf_without_font_file_transliterates(tmp_path, monkeypatch):
+    monkeypatch.setattr(payout_export, "FONT_PATH", str(tmp_path / "none.ttf"))
+    rows = [{"timestamp": "2025-05-01 10:00:00", "name": "Щукин Юрий",
+             "amount": 100, "method": "💳 На карту", "status": "Ожидает"}]
+    reader = PdfReader(io.BytesIO(b"".join(stream_pdf(rows))))
+    text = reader.pages[0].extract_text()
+    assert "Otchet po vyplatam" in text
+    assert "Shchukin Yuriy | 100 RUB | ? Na kartu" in text
@@ -0,0 +1,134 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.data.payout_repository import PayoutRepository
+
+
+def _payout(user_id="1", status="Ожидает", ts="2025-05-01 12:00:00"):
+    return {
+        "user_id": user_id,
+        "name": "Tester",
+        "phone": "89000000000",
+        "bank": "Сбер",
+        "amount": 100,
+        "method": "💳 На карту",
+        "payout_type": "Аванс",
+        "status": status,
+        "timestamp": ts,
+    }
+
+
+def _snapshot(path):
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def test_mutations_are_journaled_and_replayed(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    Path(path).write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(path, journal=True)
+    created = repo.create(_payout())
+    repo.create(_payout(user_id="2"))
+    repo.update(created["id"], {"status": "Одобрено"})
+    repo.delete_many(["2"])
+
+    # snapshot untouched, every mutation is one journal line
+    assert _snapshot(path) == []
+    lines = Path(path + ".wal").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 4
+
+    reopened = PayoutRepository(path, journal=True)
+    rows = reopened.load_all()
+    assert [r["id"] for r in rows] == ["1"]
+    assert rows[0]["status"] == "Одобрено"
+    # startup folds the journal into the snapshot
+    assert not Path(path + ".wal").exists()
+    assert _snapshot(path)[0]["status"] == "Одобрено"
+
+
+def test_compaction_after_threshold(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    Path(path).write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(path, journal=True, compact_every=3)
+    for _ in range(3):
+        repo.create(_payout())
+    assert not Path(path + ".wal").exists()
+    assert len(_snapshot(path)) == 3
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    Path(path).write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(path, journal=True)
+    repo.create(_payout())
+    with open(path + ".wal", "a", encoding="utf-8") as f:
+        f.write('{"op": "create", "rec')
+    reopened = PayoutRepository(path, journal=True)
+    assert len(reopened.load_all()) == 1
+
+
+def test_mutations_after_torn_journal_line_survive_restarts(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    Path(path).write_text("[]", encoding="utf-8")
+    Path(path + ".wal").write_text('{"op": "create", "rec', encoding="utf-8")
+    repo = PayoutRepository(path, journal=True)
+    # the damaged journal was folded away on startup
+    assert not Path(path + ".wal").exists()
+    for _ in range(3):
+        repo.create(_payout())
+    # a failed append in a running process leaves a torn line mid-journal
+    with open(path + ".wal", "a", encoding="utf-8") as f:
+        f.write('{"op": "create", "rec')
+    repo.create(_payout())
+    assert len(PayoutRepository(path, journal=True).load_all()) == 4
+    assert len(PayoutRepository(path, journal=True).load_all()) == 4
+
+
+def test_replayed_records_get_legacy_statuses_normalized(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    Path(path).write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(path, journal=True)
+    repo.create(_payout(status="Ожидает"))
+    repo.create(_payout(status="В ожидании"))
+    repo.create(_payout(status="Ожидает"))
+    repo.update("3", {"status": "Разрешено"})
+    reopened = PayoutRepository(path, journal=True)
+    assert [r["id"] for r in reopened.list(status="Ожидает")] == ["2", "1"]
+    assert [r["id"] for r in reopened.list(status="Одобрено")] == ["3"]
+
+
+def test_indexed_list_matches_filters(tmp_path):
+    path = str(tmp_path / "payouts.json")
+    rows = [
+        _payout("1", "Ожидает", "2025-05-01 10:00:00"),
+        _payout("1", "Одобрено", "2025-05-03 10:00:00"),
+        _payout("2", "Ожидает", "2025-05-02 10:00:00"),
+        _payout("2", "Ожидает", ""),
+    ]
+    Path(path).write_text(json.dumps(rows), encoding="utf-8")
+    repo = PayoutRepository(path, journal=True)
+
+    assert [r["timestamp"] for r in repo.list()] == [
+        "2025-05-03 10:00:00",
+        "2025-05-02 10:00:00",
+        "2025-05-01 10:00:00",
+        "",
+    ]
+    assert len(repo.list(employee_id="1")) == 2
+    assert len(repo.list(employee_id="2", status="Ожидает")) == 2
+    in_range = repo.list(from_date="2025-05-02", to_date="2025-05-03")
+    assert [r["timestamp"] for r in in_range] == ["2025-05-02 10:00:00", ""]
+    assert repo.list(payout_type="Зарплата") == []
+
+    first = repo.list(employee_id="1", status="Ожидает")[0]
+    repo.update(first["id"], {"status": "Одобрено"})
+    assert repo.list(employee_id="1", status="Ожидает") == []
+    assert len(repo.list(status="Одобрено")) == 2
+    assert repo.get(first["id"])["status"] == "Одобрено"
+
+    repo.delete(first["id"])
+    assert repo.get(first["id"]) is None
+    assert len(repo.list(employee_id="1")) == 1
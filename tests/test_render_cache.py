@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import render_cache as rc
+
+
+class _Message:
+    def __init__(self, fail_file_id=False):
+        self.sent = []
+        self.fail_file_id = fail_file_id
+
+    async def reply_photo(self, photo, **kwargs):
+        if isinstance(photo, str) and self.fail_file_id:
+            raise RuntimeError("file id expired")
+        self.sent.append(photo)
+        return SimpleNamespace(photo=[SimpleNamespace(file_id="small"),
+                                      SimpleNamespace(file_id=f"id{len(self.sent)}")])
+
+
+def test_repeat_views_use_the_file_id(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    path.write_bytes(b"v1")
+    monkeypatch.setattr(rc, "EXCEL_FILE", str(path))
+    cache = rc.RenderCache()
+    key = cache.key("salary", " Анна ", "май")
+    assert key[:3] == ("salary", "Анна", "МАЙ")
+
+    message = _Message()
+    assert asyncio.run(cache.reply(message, key)) is False
+    asyncio.run(cache.send(message, key, b"png"))
+    assert asyncio.run(cache.reply(message, key)) is True
+    assert message.sent == [b"png", "id1"]
+
+    expired = _Message(fail_file_id=True)
+    assert asyncio.run(cache.reply(expired, key)) is True
+    assert expired.sent == [b"png"]
+
+    path.write_bytes(b"version 2")
+    os.utime(path, ns=(0, 10**9))
+    assert cache.get(cache.key("salary", "Анна", "май")) is None
+
+
+def test_cache_is_bounded_by_size():
+    cache = rc.RenderCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
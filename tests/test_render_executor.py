@@ -0,0 +1,81 @@
+import asyncio
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services.render_executor import (
+    RenderExecutor,
+    RenderQueueFull,
+    RenderTimeout,
+)
+from app.utils.image import create_combined_table_image
+
+
+def test_renders_in_worker_process_and_recovers_from_timeout():
+    executor = RenderExecutor(workers=1, queue_size=2, timeout=30)
+    tables = [[["Зарплата"], ["Смены", "10"]]]
+
+    async def scenario():
+        png = await executor.run(create_combined_table_image, tables)
+        with pytest.raises(RenderTimeout):
+            await executor.run(time.sleep, 30, timeout=0.5)
+        # the stuck worker was replaced
+        return png, await executor.run(create_combined_table_image, tables)
+
+    try:
+        png, again = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert isinstance(png, bytes) and again == png
+    assert Image.open(BytesIO(png)).format == "PNG"
+    stats = executor.stats()
+    assert stats["completed"] == 2 and stats["timeouts"] == 1
+    assert stats["latency"]["create_combined_table_image"]["count"] == 2
+
+
+def test_queue_is_bounded():
+    executor = RenderExecutor(workers=0, queue_size=0, timeout=5)
+
+    async def scenario():
+        slow = asyncio.create_task(executor.run(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        assert executor.stats()["running"] == 1
+        with pytest.raises(RenderQueueFull):
+            await executor.run(time.sleep, 0)
+        await slow
+        assert await executor.try_run(int, "x") is None
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    stats = executor.stats()
+    assert stats["rejected"] == 1 and stats["failed"] == 1
+    assert stats["queued"] == 0 and stats["running"] == 0
+
+
+def test_timeout_restarts_only_the_stuck_worker():
+    executor = RenderExecutor(workers=2, queue_size=2, timeout=30)
+
+    async def scenario():
+        slow = asyncio.create_task(executor.run(time.sleep, 2))
+        with pytest.raises(RenderTimeout):
+            await executor.run(time.sleep, 30, timeout=1)
+        # the other worker kept its render
+        await slow
+        return await executor.run(int, "7")
+
+    try:
+        assert asyncio.run(scenario()) == 7
+    finally:
+        executor.shutdown()
+    stats = executor.stats()
+    assert stats["completed"] == 2 and stats["failed"] == 0
+    assert stats["timeouts"] == 1 and stats["restarts"] == 1
@@ -0,0 +1,112 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import excel, salary_snapshot
+from app.services.salary_service import SalaryService
+from app.services.salary_snapshot import build_snapshot
+from app.services.workbook_cache import WorkbookCache
+
+
+def _frame():
+    return pd.DataFrame({
+        " ИМЯ ": ["Анна", None, "Олег", "Анна"],
+        "ОСН.": [10, 1, "x", 2.9],
+        "ДОП.": [2, None, 3, 0],
+        "ОБЩ": [0, None, 7, None],
+        "Ремонт": ["1500.5", 1, None, 10],
+        "К выплате": [1000, 1, float("inf"), 20],
+        "Комментарий": [" премия ", None, "", None],
+    })
+
+
+def test_snapshot_normalizes_columns_once():
+    snap = build_snapshot("МАЙ", _frame())
+    assert snap.names == ("Анна", "Олег", "Анна")
+    assert snap.columns["shifts_main"].dtype == np.int64
+    assert list(snap.columns["shifts_main"]) == [10, 0, 2]
+    # total falls back to main + extra when the sheet has none
+    assert list(snap.columns["shifts_total"]) == [12, 7, 2]
+    assert list(snap.columns["salary_repair"]) == [1500.5, 0.0, 10.0]
+    assert list(snap.columns["final_amount"]) == [1000.0, 0.0, 20.0]
+    assert snap.comments == ("премия", None, None)
+    assert snap.rows_for("Анна") == [0, 2]
+    assert snap.total("final_amount") == 1020.0
+
+    row = snap.row(0, "7", "май")
+    assert (row.employee_id, row.month, row.comment) == ("7", "май", "премия")
+    assert row.salary_keys == 0.0
+
+
+class _Repo:
+    employees = {
+        "1": SimpleNamespace(id="1", name="Анна"),
+        "2": SimpleNamespace(id="2", name="Олег"),
+    }
+
+    def get_by_id(self, employee_id):
+        return self.employees.get(employee_id)
+
+    def get_by_name(self, name):
+        return next((e for e in self.employees.values() if e.name == name), None)
+
+
+def test_salary_service_reads_snapshot(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        _frame().to_excel(writer, sheet_name="МАЙ", startrow=1, index=False)
+    monkeypatch.setattr(excel, "EXCEL_FILE", str(path))
+    monkeypatch.setattr(salary_snapshot, "EXCEL_FILE", str(path))
+    cache = WorkbookCache()
+    monkeypatch.setattr(excel, "workbook_cache", cache)
+    monkeypatch.setattr(salary_snapshot, "workbook_cache", cache)
+
+    service = SalaryService(_Repo())
+    rows = asyncio.run(service.get_salary("май"))
+    assert [(r.name, r.employee_id) for r in rows] == [
+        ("Анна", "1"), ("Олег", "2"), ("Анна", "1")]
+    only = asyncio.run(service.get_salary("май", employee_id="2"))
+    assert [(r.name, r.shifts_total) for r in only] == [("Олег", 7)]
+    assert asyncio.run(service.get_salary("май", employee_id="404")) == []
+    assert salary_snapshot.get_snapshot("май") is salary_snapshot.get_snapshot("МАЙ")
+
+
+def test_salary_year_reads_every_month(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        _frame().to_excel(writer, sheet_name="ИЮНЬ", startrow=1, index=False)
+        _frame().to_excel(writer, sheet_name="Справка", index=False)
+        _frame().to_excel(writer, sheet_name="МАЙ", startrow=1, index=False)
+    monkeypatch.setattr(salary_snapshot, "EXCEL_FILE", str(path))
+    cache = WorkbookCache()
+    monkeypatch.setattr(salary_snapshot, "workbook_cache", cache)
+
+    service = SalaryService(_Repo())
+    rows = asyncio.run(service.get_year(workers=0))
+    assert [r.month for r in rows] == ["МАЙ"] * 3 + ["ИЮНЬ"] * 3
+
+    series = asyncio.run(service.get_year_series(employee_id="1", workers=2))
+    assert [(s.employee_id, len(s.rows)) for s in series] == [("1", 4)]
+    assert series[0].totals["final_amount"] == 2040.0
+
+
+def test_prefetch_reads_sheets_in_spawned_workers(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    months = ["ИЮНЬ", "МАЙ", "АПРЕЛЬ"]
+    with pd.ExcelWriter(path) as writer:
+        for month in months:
+            _frame().to_excel(writer, sheet_name=month, startrow=1, index=False)
+    monkeypatch.setattr(salary_snapshot, "EXCEL_FILE", str(path))
+    cache = WorkbookCache()
+    monkeypatch.setattr(salary_snapshot, "workbook_cache", cache)
+
+    salary_snapshot._prefetch(months, workers=2)
+    assert all(cache.has_derived(str(path), f"salary:{m}") for m in months)
+    assert salary_snapshot.get_snapshot("май").names == ("Анна", "Олег", "Анна")
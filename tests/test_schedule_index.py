@@ -0,0 +1,54 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import schedule_index
+from app.services.schedule_service import ScheduleService
+from app.services.workbook_cache import WorkbookCache
+
+
+def _workbook(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Май"
+    ws.append(["ИМЯ", "Смен", 1, 2, 3])
+    ws.append([None, None, "чт", "пт", "сб"])
+    ws.append(["Анна", 2, "Ох", "М", None])
+    ws.append(["Олег", 2, "Ох", None, "Ох"])
+    ws.append(["Ира", 1, "в", "Ц", None])
+    other = wb.create_sheet("Июнь")
+    other.append(["ИМЯ", "Смен", 1])
+    other.append([None, None, "вс"])
+    other.append(["Ира", 1, "Ох"])
+    wb.save(path)
+
+
+def test_schedule_index_lookups(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    monkeypatch.setattr(schedule_index, "EXCEL_FILE", str(path))
+    monkeypatch.setattr(schedule_index, "workbook_cache", WorkbookCache())
+
+    index = schedule_index.get_schedule_index(5)
+    assert index is schedule_index.get_schedule_index(5)
+    assert index.day(1) == {"Ох": "Анна"}
+    assert index.day(2) == {"М": "Анна", "Ц": "Ира"}
+    assert index.employee(" олег ") == {1: "Ох", 3: "Ох"}
+    assert index.point("Ох") == {1: "Анна", 3: "Олег"}
+    assert schedule_index.get_schedule_index(7) is None
+
+    service = ScheduleService()
+    points = asyncio.run(service.get_schedule_by_day("2025-05-02"))
+    assert {p.short: p.employee for p in points}["Ц"] == "Ира"
+    assert len(points) == len(schedule_index.POINTS)
+
+    week = asyncio.run(service.get_point_schedule("Охта", "2025-05-30", 7))
+    assert [(a.date, a.employee) for a in week] == [("2025-06-01", "Ира")]
+    days = asyncio.run(service.get_employee_schedule("Анна", 2025, 5))
+    assert [(a.date, a.point) for a in days] == [
+        ("2025-05-01", "Охта"), ("2025-05-02", "Меркурий")]
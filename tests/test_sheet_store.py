@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+from openpyxl import Workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import excel, salary_snapshot, schedule_index, sheet_store
+from app.services import workbook_cache as wc
+
+
+def _workbook(path, june_total=20):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for month, total in (("МАЙ", 10), ("ИЮНЬ", june_total)):
+        ws = wb.create_sheet(month)
+        ws.append(["Зарплата", None, 1, 2])
+        ws.append(["ИМЯ", "К выплате", "чт", "пт"])
+        ws.append(["Анна", total, "Ох", "М"])
+    wb.save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _use(monkeypatch, path):
+    cache = wc.WorkbookCache()
+    for module in (excel, salary_snapshot, schedule_index):
+        monkeypatch.setattr(module, "EXCEL_FILE", str(path))
+        monkeypatch.setattr(module, "workbook_cache", cache)
+    monkeypatch.setattr(sheet_store, "workbook_cache", cache)
+    return cache
+
+
+def test_snapshots_are_mapped_from_the_store(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    _use(monkeypatch, path)
+    built = salary_snapshot.get_snapshot("май")
+    index = schedule_index.get_schedule_index(5)
+    assert (tmp_path / ".data.xlsx.store").is_dir()
+
+    # a new process: nothing is parsed, the columns are memory-mapped
+    _use(monkeypatch, path)
+    monkeypatch.setattr(wc, "read_sheet", None)
+    loaded = salary_snapshot.get_snapshot("май")
+    assert isinstance(loaded.columns["final_amount"], np.memmap)
+    assert loaded.names == built.names
+    assert loaded.total("final_amount") == 10.0
+    assert schedule_index.get_schedule_index(5) == index
+
+    # only the edited sheet is converted again
+    monkeypatch.undo()
+    _workbook(path, june_total=30)
+    _use(monkeypatch, path)
+    assert sheet_store.contains(str(path), "salary", "МАЙ")
+    assert not sheet_store.contains(str(path), "salary", "ИЮНЬ")
+    assert salary_snapshot.get_snapshot("июнь").total("final_amount") == 30.0
+
+
+def test_store_can_be_disabled(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    _use(monkeypatch, path)
+    monkeypatch.setattr(sheet_store, "SHEET_STORE", False)
+    assert salary_snapshot.get_snapshot("май").total("final_amount") == 10.0
+    assert not (tmp_path / ".data.xlsx.store").exists()
+
+
+def test_store_is_populated_from_the_command_line(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    env = {**os.environ, "EXCEL_FILE": str(path), "SHEET_STORE": "true"}
+    env.pop("SHEET_STORE_DIR", None)
+    # a fresh interpreter, nothing of the app imported beforehand
+    done = subprocess.run(
+        [sys.executable, "-m", "app.services.sheet_store"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert done.returncode == 0, done.stderr
+    assert "Stored 2 month sheets" in done.stdout
+    monkeypatch.setattr(sheet_store, "SHEET_STORE", True)
+    monkeypatch.setattr(sheet_store, "SHEET_STORE_DIR", None)
+    assert sheet_store.contains(path, "salary", "МАЙ")
+    assert sheet_store.contains(path, "salary", "ИЮНЬ")
@@ -0,0 +1,123 @@
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.core.types import Employee
+from app.data.payout_repository import PayoutRepository
+from app.data.sql_repository import (
+    SqlEmployeeRepository,
+    SqlMessageRepository,
+    SqlPayoutRepository,
+    SqlVacationRepository,
+)
+from app.db.migrate import is_migrated, migrate_json
+from app.db.session import create_sqlite_engine
+
+
+def _migrated(tmp_path):
+    files = {}
+    for name in ("user", "advance_requests", "vacations", "adjustments",
+                 "messages"):
+        files[name] = tmp_path / f"{name}.json"
+        shutil.copy(ROOT / f"{name}.json", files[name])
+    engine = create_sqlite_engine(tmp_path / "bot.sqlite3")
+    counts = migrate_json(
+        engine,
+        users_file=files["user"],
+        payouts_file=str(files["advance_requests"]),
+        vacations_file=str(files["vacations"]),
+        adjustments_file=str(files["adjustments"]),
+        messages_file=files["messages"],
+    )
+    return engine, files, counts
+
+
+def test_migration_runs_once_in_wal_mode(tmp_path):
+    engine, files, counts = _migrated(tmp_path)
+    users = json.loads(files["user"].read_text(encoding="utf-8"))
+    assert counts["employees"] == len(users)
+    assert is_migrated(engine)
+    assert migrate_json(engine, users_file=files["user"]) == {}
+
+    with sqlite3.connect(tmp_path / "bot.sqlite3") as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute(
+            "SELECT * FROM sqlite_master WHERE type='index'"
+            " AND tbl_name='payouts'")}
+    assert {"ix_payouts_user_id", "ix_payouts_status",
+            "ix_payouts_timestamp"} <= indexes
+
+
+def test_payout_queries_match_json_backend(tmp_path):
+    engine, files, _ = _migrated(tmp_path)
+    json_repo = PayoutRepository(str(files["advance_requests"]), journal=False)
+    sql_repo = SqlPayoutRepository(engine)
+    rows = json_repo.load_all()
+    user_id = rows[0]["user_id"]
+
+    def ids(repo, **filters):
+        return sorted(r["id"] for r in repo.list(**filters))
+
+    for filters in (
+        {},
+        {"employee_id": user_id},
+        {"status": "Одобрено", "payout_type": "Аванс"},
+        {"from_date": "2025-05-01", "to_date": "2025-06-01"},
+    ):
+        assert ids(sql_repo, **filters) == ids(json_repo, **filters)
+
+    page = sql_repo.list(limit=5, offset=5)
+    assert [r["id"] for r in page] == [
+        r["id"] for r in sql_repo.list()[5:10]]
+
+    ordered = sql_repo.list_ids(employee_id=user_id)
+    assert ordered == [r["id"] for r in sql_repo.list(employee_id=user_id)]
+    assert ordered == json_repo.list_ids(employee_id=user_id)
+    picked = ordered[::-1][:3] + ["missing"]
+    assert [r["id"] for r in sql_repo.get_many(picked)] == picked[:-1]
+
+
+def test_sql_repositories_crud(tmp_path):
+    engine, _, _ = _migrated(tmp_path)
+    payouts = SqlPayoutRepository(engine)
+    created = payouts.create({"user_id": "1", "status": "Ожидает",
+                              "amount": 10, "timestamp": "2030-01-01 10:00:00"})
+    assert payouts.list(limit=1)[0]["id"] == created["id"]
+    payouts.update(created["id"], {"status": "Одобрено"})
+    assert payouts.get(created["id"])["status"] == "Одобрено"
+    assert payouts.delete(created["id"])
+    assert payouts.get(created["id"]) is None
+
+    vacations = SqlVacationRepository(engine)
+    vac = vacations.create({"employee_id": "1", "start_date": "2030-01-01"})
+    assert isinstance(vac["id"], int)
+    assert vacations.update(vac["id"], {"comment": "x"})["comment"] == "x"
+
+    messages = SqlMessageRepository(engine)
+    msg = messages.create({"user_id": "7", "message_id": 42, "text": "hi",
+                           "timestamp": "2030-01-01T00:00:00"})
+    assert messages.accept_by_details("7", 42)["accepted"] is True
+    assert messages.list()[0]["id"] == msg["id"]
+
+    employees = SqlEmployeeRepository(engine)
+    emp = employees.list_employees()[0]
+    emp.note = "updated"
+    employees.update_employee(emp)
+    again = next(e for e in employees.list_employees() if e.id == emp.id)
+    assert again.note == "updated"
+    assert employees.get_by_id(emp.id).note == "updated"
+    assert employees.get_by_name(emp.name).id == emp.id
+    patched = employees.patch_record(emp.id, {"pending_change": {"field": "bank"}})
+    assert employees.get_record(emp.id)["pending_change"] == {"field": "bank"}
+    employees.patch_record(emp.id, {}, remove=("pending_change",))
+    assert "pending_change" not in employees.records()[emp.id]
+    assert patched["note"] == "updated"
+
+    twin = Employee(id="999001", name=emp.name, full_name="", phone="")
+    employees.add_employee(twin)
+    assert employees.get_by_name(emp.name).id == twin.id
@@ -0,0 +1,123 @@
+import os
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.comments import Comment
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import excel
+from app.services import workbook_cache as wc
+from app.services.workbook_reader import read_sheets
+
+
+def _workbook(path, months=("ЯНВАРЬ", "ФЕВРАЛЬ"), amount=100):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for month in months:
+        ws = wb.create_sheet(month)
+        ws.append(["Зарплата"])
+        ws.append(["ИМЯ", "ИТОГО"])
+        ws.append(["Анна", amount])
+    wb.save(path)
+
+
+def _counting(monkeypatch):
+    calls = []
+    original = wc.read_sheet
+
+    def read_sheet(book, sheet_name, **kwargs):
+        calls.append(sheet_name)
+        return original(book, sheet_name, **kwargs)
+
+    monkeypatch.setattr(wc, "read_sheet", read_sheet)
+    return calls
+
+
+def test_sheets_are_parsed_once_and_copied(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    calls = _counting(monkeypatch)
+    cache = wc.WorkbookCache()
+
+    assert cache.sheet_names(path) == ["ЯНВАРЬ", "ФЕВРАЛЬ"]
+    first = cache.sheet(path, "ЯНВАРЬ", header=1)
+    first.loc[0, "ИТОГО"] = 0
+    second = cache.sheet(path, "ЯНВАРЬ", header=1)
+    assert second.loc[0, "ИТОГО"] == 100
+    assert calls == ["ЯНВАРЬ"]
+
+
+def test_change_on_disk_invalidates(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    calls = _counting(monkeypatch)
+    cache = wc.WorkbookCache()
+    cache.sheet(path, "ЯНВАРЬ", header=1)
+
+    _workbook(path, months=("ЯНВАРЬ", "МАРТ"), amount=250)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.sheet_names(path) == ["ЯНВАРЬ", "МАРТ"]
+    assert cache.sheet(path, "ЯНВАРЬ", header=1).loc[0, "ИТОГО"] == 250
+    assert calls == ["ЯНВАРЬ", "ЯНВАРЬ"]
+
+
+def test_lru_bound(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    calls = _counting(monkeypatch)
+    cache = wc.WorkbookCache(max_sheets=1)
+    cache.sheet(path, "ЯНВАРЬ", header=1)
+    cache.sheet(path, "ФЕВРАЛЬ", header=1)
+    cache.sheet(path, "ЯНВАРЬ", header=1)
+    assert calls == ["ЯНВАРЬ", "ФЕВРАЛЬ", "ЯНВАРЬ"]
+    assert cache.sheet(tmp_path / "missing.xlsx", "ЯНВАРЬ") is None
+
+
+def test_comment_index_is_built_once(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path)
+    wb = load_workbook(path)
+    wb["ЯНВАРЬ"]["B3"].comment = Comment(" аванс 5000 ", "admin")
+    wb["ФЕВРАЛЬ"]["A3"].comment = Comment("note", "admin")
+    wb.save(path)
+
+    cache = wc.WorkbookCache()
+    monkeypatch.setattr(excel, "EXCEL_FILE", str(path))
+    monkeypatch.setattr(excel, "workbook_cache", cache)
+    builds = []
+    original = excel._build_comment_index
+    monkeypatch.setattr(
+        excel, "_build_comment_index",
+        lambda p: builds.append(p) or original(p))
+
+    assert excel.get_row_comments("ЯНВАРЬ", 0) == {"B": "аванс 5000"}
+    assert excel.get_cell_comment("ЯНВАРЬ", 0, "B") == "аванс 5000"
+    assert excel.get_cell_comment("ЯНВАРЬ", 0, "C") == "No comment"
+    assert excel.get_cell_comment("МАЙ", 0, "B") == "Sheet error"
+    assert excel.get_sheet_comments("ФЕВРАЛЬ") == {3: {"A": "note"}}
+    assert excel.get_workbook_comments() == {
+        ("ЯНВАРЬ", 3, "B"): "аванс 5000", ("ФЕВРАЛЬ", 3, "A"): "note"}
+    assert len(builds) == 1
+
+
+def test_reader_matches_read_excel(tmp_path):
+    path = tmp_path / "data.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "МАЙ"
+    ws.append(["ИМЯ", None, 1, 2, "ИМЯ"])
+    ws.append([None, "смен", "чт", "пт"])
+    ws.append(["Анна", 2, "Ох", "1500.5", 3.5])
+    ws.append([None, None, None, None])
+    ws.append(["Олег", None, 5, None])
+    ws["H10"].font = ws["H10"].font.copy(bold=True)  # styled empty cell
+    wb.save(path)
+
+    for header in (None, 0, 1):
+        expected = wc.pd.read_excel(path, sheet_name="МАЙ", header=header)
+        actual = read_sheets(path, ["МАЙ"], header=header)["МАЙ"]
+        wc.pd.testing.assert_frame_equal(actual, expected)
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from openpyxl import Workbook
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.services import (
+    excel, salary_snapshot, schedule_index, sheet_store, workbook_watcher,
+)
+from app.services.workbook_cache import WorkbookCache
+
+
+def _workbook(path, total):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for month in ("ЯНВАРЬ", "ФЕВРАЛЬ", "ДЕКАБРЬ"):
+        ws = wb.create_sheet(month)
+        ws.append(["Зарплата", None, 1])
+        ws.append(["ИМЯ", "К выплате", "пн"])
+        ws.append(["Анна", total, "Ох"])
+    wb.save(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + total * 10**9))
+
+
+def test_recent_months_wrap_the_year():
+    assert workbook_watcher.recent_months(date(2025, 1, 15)) == [1, 12]
+    assert workbook_watcher.recent_months(date(2025, 6, 1)) == [6, 5]
+
+
+def test_change_is_handled_once_the_file_is_stable(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path, 1)
+    cache = WorkbookCache()
+    for module in (excel, salary_snapshot, schedule_index, workbook_watcher):
+        monkeypatch.setattr(module, "EXCEL_FILE", str(path))
+        monkeypatch.setattr(module, "workbook_cache", cache)
+    monkeypatch.setattr(sheet_store, "workbook_cache", cache)
+    monkeypatch.setattr(
+        workbook_watcher, "recent_months", lambda today=None: [1, 12])
+
+    calls = []
+
+    async def refreshed():
+        calls.append(1)
+
+    watcher = workbook_watcher.WorkbookWatcher(interval=1, use_process=False)
+    watcher.on_change(refreshed)
+
+    async def scenario():
+        assert await watcher.check() is False  # first sight, may be partial
+        assert await watcher.check() is True
+        assert await watcher.check() is False
+        _workbook(path, 2)
+        assert await watcher.check() is False
+        assert await watcher.check() is True
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert cache.has_derived(str(path), "salary:ЯНВАРЬ")
+    assert cache.has_derived(str(path), "schedule:ДЕКАБРЬ")
+    assert not cache.has_derived(str(path), "salary:ФЕВРАЛЬ")
+    assert salary_snapshot.get_snapshot("январь").total("final_amount") == 2.0
+
+
+def test_prewarm_runs_in_spawned_worker(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path, 4)
+    # the spawned worker reads the settings from the environment
+    monkeypatch.setenv("EXCEL_FILE", str(path))
+    monkeypatch.setenv("SHEET_STORE", "true")
+    monkeypatch.delenv("SHEET_STORE_DIR", raising=False)
+    monkeypatch.setattr(sheet_store, "SHEET_STORE", True)
+    monkeypatch.setattr(sheet_store, "SHEET_STORE_DIR", None)
+    # the journal of this process: a worker building the repositories
+    # would replay and compact it away
+    payouts = tmp_path / "advance_requests.json"
+    payouts.write_text("[]", encoding="utf-8")
+    journal = tmp_path / "advance_requests.json.wal"
+    journal.write_text('{"op": "create", "record": {"id": "1"}}\n',
+                       encoding="utf-8")
+    monkeypatch.setenv("ADVANCE_REQUESTS_FILE", str(payouts))
+    watcher = workbook_watcher.WorkbookWatcher(interval=1, use_process=True)
+
+    asyncio.run(watcher._prewarm_in_worker([1, 12]))
+    assert sheet_store.contains(path, "salary", "ЯНВАРЬ")
+    assert not sheet_store.contains(path, "salary", "ФЕВРАЛЬ")
+    assert journal.exists() and payouts.read_text(encoding="utf-8") == "[]"
+
+
+def test_stuck_prewarm_worker_is_killed(tmp_path, monkeypatch):
+    path = tmp_path / "data.xlsx"
+    _workbook(path, 3)
+    cache = WorkbookCache()
+    for module in (excel, salary_snapshot, schedule_index, workbook_watcher):
+        monkeypatch.setattr(module, "EXCEL_FILE", str(path))
+        monkeypatch.setattr(module, "workbook_cache", cache)
+    monkeypatch.setattr(sheet_store, "workbook_cache", cache)
+    monkeypatch.setattr(
+        workbook_watcher, "recent_months", lambda today=None: [1, 12])
+    # a spawned worker cannot even import the app this fast
+    watcher = workbook_watcher.WorkbookWatcher(
+        interval=1, use_process=True, timeout=0.01)
+
+    started = time.monotonic()
+    asyncio.run(watcher._changed())
+    assert time.monotonic() - started < 30
+    assert salary_snapshot.get_snapshot("январь").total("final_amount") == 3.0